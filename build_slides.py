@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Incremental, parallel LaTeX build driver for the course slides.
+
+Scans every root document (any .tex file with a \\begin{document}) for
+\\input, \\include and \\includegraphics dependencies -- including the shared
+template_beamer.tex -- and hashes the document together with everything it
+pulls in. Only targets whose hash changed since the last successful build
+(or whose PDF is missing) are recompiled, on a worker pool. The .log files of
+the rebuilt decks are then fed to detect_overflows.
+
+The compiler is pluggable: pdflatex, tectonic, or a stub that writes
+placeholder output so the whole pipeline runs offline.
+
+Usage:
+    # Rebuild whatever changed, 4 jobs in parallel
+    python build_slides.py --compiler tectonic -j 4
+
+    # Show what would be rebuilt without compiling
+    python build_slides.py --dry-run
+
+    # Force a full rebuild of one day and copy PDFs/logs to an artifact dir
+    python build_slides.py day_03 --force --collect-dir compiled-pdfs
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import detect_overflows
+
+
+MANIFEST_NAME = '.build_manifest.json'
+MANIFEST_VERSION = 1
+GRAPHICS_EXTENSIONS = ['', '.pdf', '.png', '.jpg', '.jpeg', '.eps']
+
+# Regex patterns for dependency scanning
+COMMENT_PATTERN = re.compile(r'(?<!\\)%.*')
+INPUT_PATTERN = re.compile(r'\\(?:input|include)\{([^}]+)\}')
+GRAPHICS_PATTERN = re.compile(r'\\includegraphics(?:\[[^\]]*\])?\{([^}]+)\}')
+BEGIN_DOCUMENT_PATTERN = re.compile(r'^[^%]*\\begin\{document\}', re.MULTILINE)
+
+
+# =============================================================================
+# Dependency Scanning
+# =============================================================================
+
+def _strip_comments(text: str) -> str:
+    """Remove LaTeX line comments (unescaped %) from text."""
+    return '\n'.join(COMMENT_PATTERN.sub('', line) for line in text.splitlines())
+
+
+def _resolve_input(name: str, base_dir: Path) -> Path:
+    """Resolve an \\input/\\include argument the way TeX does (.tex is implied)."""
+    path = (base_dir / name.strip()).resolve()
+    if path.suffix != '.tex' and not path.exists():
+        path = path.with_name(path.name + '.tex')
+    return path
+
+
+def _resolve_graphic(name: str, base_dir: Path) -> Path:
+    """Resolve an \\includegraphics argument, trying the usual extensions."""
+    stem = (base_dir / name.strip()).resolve()
+    for ext in GRAPHICS_EXTENSIONS:
+        candidate = stem.with_name(stem.name + ext)
+        if candidate.is_file():
+            return candidate
+    return stem
+
+
+def scan_dependencies(tex_path: Path, base_dir: Optional[Path] = None,
+                      _seen: Optional[Set[Path]] = None) -> Set[Path]:
+    """Return every file tex_path transitively depends on.
+
+    Paths are resolved relative to base_dir, which defaults to the directory
+    of the root document (TeX resolves nested inputs against the working
+    directory, not the including file). Missing files are still returned so
+    that their later appearance invalidates the target.
+    """
+    tex_path = tex_path.resolve()
+    base_dir = base_dir or tex_path.parent
+    seen = _seen if _seen is not None else set()
+    deps: Set[Path] = set()
+
+    try:
+        text = _strip_comments(tex_path.read_text(encoding='utf-8', errors='ignore'))
+    except OSError:
+        return deps
+
+    for match in INPUT_PATTERN.finditer(text):
+        dep = _resolve_input(match.group(1), base_dir)
+        deps.add(dep)
+        if dep not in seen and dep.is_file():
+            seen.add(dep)
+            deps |= scan_dependencies(dep, base_dir, seen)
+
+    for match in GRAPHICS_PATTERN.finditer(text):
+        deps.add(_resolve_graphic(match.group(1), base_dir))
+
+    deps.discard(tex_path)
+    return deps
+
+
+def find_root_documents(root: Path) -> List[Path]:
+    """Find compilable .tex files (those containing \\begin{document})."""
+    documents = []
+    for tex_path in sorted(root.rglob('*.tex')):
+        if any(part.startswith('.') for part in tex_path.relative_to(root).parts):
+            continue
+        text = tex_path.read_text(encoding='utf-8', errors='ignore')
+        if BEGIN_DOCUMENT_PATTERN.search(text):
+            documents.append(tex_path.resolve())
+    return documents
+
+
+def build_dependency_graph(documents: List[Path]) -> Dict[Path, Set[Path]]:
+    """Map each root document to its transitive dependencies."""
+    return {doc: scan_dependencies(doc) for doc in documents}
+
+
+# =============================================================================
+# Content Hashing and Manifest
+# =============================================================================
+
+class ContentHasher:
+    """Hash file contents, reading each file at most once per build."""
+
+    def __init__(self):
+        self._digests: Dict[Path, str] = {}
+
+    def file_digest(self, path: Path) -> str:
+        if path not in self._digests:
+            try:
+                self._digests[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                self._digests[path] = 'missing'
+        return self._digests[path]
+
+    def target_digest(self, document: Path, deps: Set[Path], root: Path,
+                      compiler_name: str) -> str:
+        """Hash a document, its dependencies and the compiler used."""
+        h = hashlib.sha256(compiler_name.encode())
+        for path in [document] + sorted(deps):
+            h.update(_relative_key(path, root).encode())
+            h.update(self.file_digest(path).encode())
+        return h.hexdigest()
+
+
+def _relative_key(path: Path, root: Path) -> str:
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+class BuildManifest:
+    """Content hashes of the last successful build of each target."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.hashes: Dict[str, str] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding='utf-8'))
+                if data.get('version') == MANIFEST_VERSION:
+                    self.hashes = data.get('targets', {})
+            except (OSError, ValueError):
+                print(f"Warning: Ignoring unreadable manifest {path}")
+
+    def is_current(self, key: str, digest: str) -> bool:
+        return self.hashes.get(key) == digest
+
+    def record(self, key: str, digest: str) -> None:
+        self.hashes[key] = digest
+
+    def save(self) -> None:
+        data = {'version': MANIFEST_VERSION, 'targets': dict(sorted(self.hashes.items()))}
+        self.path.write_text(json.dumps(data, indent=2) + '\n', encoding='utf-8')
+
+
+# =============================================================================
+# Compilers
+# =============================================================================
+
+@dataclass
+class CompileResult:
+    """Outcome of compiling one document."""
+    tex_path: Path
+    success: bool
+    duration: float
+    output: str = ''
+
+    @property
+    def pdf_path(self) -> Path:
+        return self.tex_path.with_suffix('.pdf')
+
+    @property
+    def log_path(self) -> Path:
+        return self.tex_path.with_suffix('.log')
+
+
+class Compiler:
+    """Base class for LaTeX compilers. Subclasses implement compile()."""
+    name = 'base'
+
+    def compile(self, tex_path: Path) -> CompileResult:
+        raise NotImplementedError
+
+
+class SubprocessCompiler(Compiler):
+    """Run an external LaTeX engine in the document's directory."""
+    runs = 1
+
+    def __init__(self, timeout: int = 600):
+        self.timeout = timeout
+
+    def command(self, tex_path: Path) -> List[str]:
+        raise NotImplementedError
+
+    def compile(self, tex_path: Path) -> CompileResult:
+        start = time.perf_counter()
+        output = []
+        success = True
+        for _ in range(self.runs):
+            try:
+                proc = subprocess.run(
+                    self.command(tex_path), cwd=tex_path.parent,
+                    capture_output=True, text=True, errors='replace',
+                    timeout=self.timeout
+                )
+            except (OSError, subprocess.TimeoutExpired) as e:
+                output.append(str(e))
+                success = False
+                break
+            output.append(proc.stdout + proc.stderr)
+            if proc.returncode != 0:
+                success = False
+                break
+        success = success and tex_path.with_suffix('.pdf').exists()
+        return CompileResult(tex_path, success, time.perf_counter() - start, ''.join(output))
+
+
+class PdflatexCompiler(SubprocessCompiler):
+    """pdflatex, run twice so beamer navigation and references settle."""
+    name = 'pdflatex'
+    runs = 2
+
+    def command(self, tex_path: Path) -> List[str]:
+        return ['pdflatex', '-interaction=nonstopmode', tex_path.name]
+
+
+class TectonicCompiler(SubprocessCompiler):
+    """tectonic, keeping the .log (and .aux/.nav) that pdflatex would leave."""
+    name = 'tectonic'
+
+    def command(self, tex_path: Path) -> List[str]:
+        return ['tectonic', '--keep-logs', '--keep-intermediates', tex_path.name]
+
+
+class StubCompiler(Compiler):
+    """Offline stand-in that writes a placeholder PDF and a canned .log.
+
+    logs maps a document stem (e.g. "Day_01") to the log text to write;
+    documents not listed get an empty log.
+    """
+    name = 'stub'
+
+    def __init__(self, logs: Optional[Dict[str, str]] = None):
+        self.logs = logs or {}
+
+    def compile(self, tex_path: Path) -> CompileResult:
+        start = time.perf_counter()
+        tex_path.with_suffix('.pdf').write_bytes(b'%PDF-1.4\n% stub output\n')
+        tex_path.with_suffix('.log').write_text(self.logs.get(tex_path.stem, ''), encoding='utf-8')
+        return CompileResult(tex_path, True, time.perf_counter() - start)
+
+
+COMPILERS = {
+    'pdflatex': PdflatexCompiler,
+    'tectonic': TectonicCompiler,
+    'stub': StubCompiler,
+}
+
+
+def compile_all(documents: List[Path], compiler: Compiler, jobs: int = 4,
+                root: Optional[Path] = None) -> List[CompileResult]:
+    """Compile documents on a worker pool, printing progress as they finish."""
+    results = []
+    if not documents:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(compiler.compile, doc): doc for doc in documents}
+        for future in as_completed(futures):
+            result = future.result()
+            name = _relative_key(result.tex_path, root) if root else result.tex_path.name
+            if result.success:
+                print(f"✓ Success: {name} ({result.duration:.1f}s)")
+            else:
+                print(f"✗ Failed: {name}")
+            results.append(result)
+
+    results.sort(key=lambda r: r.tex_path)
+    return results
+
+
+# =============================================================================
+# Build
+# =============================================================================
+
+@dataclass
+class BuildReport:
+    """Summary of an incremental build."""
+    documents: List[Path]
+    stale: List[Path]
+    results: List[CompileResult] = field(default_factory=list)
+
+    @property
+    def failed(self) -> List[CompileResult]:
+        return [r for r in self.results if not r.success]
+
+    @property
+    def rebuilt_logs(self) -> List[Path]:
+        return [r.log_path for r in self.results if r.success and r.log_path.exists()]
+
+
+def build(root: Path, compiler: Compiler, jobs: int = 4, force: bool = False,
+          dry_run: bool = False, manifest_path: Optional[Path] = None) -> BuildReport:
+    """Rebuild every stale root document under root."""
+    root = root.resolve()
+    manifest = BuildManifest(manifest_path or root / MANIFEST_NAME)
+    hasher = ContentHasher()
+
+    documents = find_root_documents(root)
+    graph = build_dependency_graph(documents)
+
+    digests = {}
+    stale = []
+    for doc in documents:
+        key = _relative_key(doc, root)
+        digests[doc] = hasher.target_digest(doc, graph[doc], root, compiler.name)
+        pdf_missing = not doc.with_suffix('.pdf').exists()
+        if force or pdf_missing or not manifest.is_current(key, digests[doc]):
+            stale.append(doc)
+
+    report = BuildReport(documents=documents, stale=stale)
+    if dry_run:
+        return report
+
+    report.results = compile_all(stale, compiler, jobs=jobs, root=root)
+    for result in report.results:
+        if result.success:
+            manifest.record(_relative_key(result.tex_path, root), digests[result.tex_path])
+    manifest.save()
+
+    return report
+
+
+def collect_outputs(results: List[CompileResult], collect_dir: Path) -> None:
+    """Copy PDFs and .log files of successful builds into collect_dir."""
+    collect_dir.mkdir(parents=True, exist_ok=True)
+    for result in results:
+        if not result.success:
+            continue
+        for path in (result.pdf_path, result.log_path):
+            if path.exists():
+                shutil.copy2(path, collect_dir / path.name)
+
+
+def report_overflows(log_files: List[Path]) -> None:
+    """Run overflow detection on exactly the given logs, grouped by directory."""
+    by_dir = defaultdict(list)
+    for log_file in log_files:
+        by_dir[log_file.parent].append(log_file)
+    for directory in sorted(by_dir):
+        detect_overflows.generate_report(directory, by_dir[directory])
+        print()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Incrementally rebuild LaTeX slides and check rebuilt decks for overflows."
+    )
+    parser.add_argument(
+        'root',
+        type=Path,
+        nargs='?',
+        default=Path.cwd(),
+        help='Directory to scan for .tex documents (default: current directory)'
+    )
+    parser.add_argument('--compiler', '-c', choices=sorted(COMPILERS), default='pdflatex',
+                        help='LaTeX compiler to use (default: pdflatex)')
+    parser.add_argument('--jobs', '-j', type=int, default=4,
+                        help='Number of documents to compile in parallel (default: 4)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every document regardless of the manifest')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='List stale documents without compiling')
+    parser.add_argument('--manifest', type=Path,
+                        help=f'Build manifest path (default: <root>/{MANIFEST_NAME})')
+    parser.add_argument('--collect-dir', type=Path,
+                        help='Copy PDFs and .log files of rebuilt documents here')
+    parser.add_argument('--no-overflow-check', action='store_true',
+                        help='Skip overflow detection on rebuilt decks')
+
+    args = parser.parse_args()
+
+    if not args.root.is_dir():
+        print(f"Error: {args.root} is not a directory")
+        return 1
+
+    compiler = COMPILERS[args.compiler]()
+    report = build(args.root, compiler, jobs=args.jobs, force=args.force,
+                   dry_run=args.dry_run, manifest_path=args.manifest)
+
+    root = args.root.resolve()
+    print(f"\n{len(report.stale)} of {len(report.documents)} documents stale")
+    if args.dry_run:
+        for doc in report.stale:
+            print(f"  {_relative_key(doc, root)}")
+        return 0
+
+    if args.collect_dir:
+        collect_outputs(report.results, args.collect_dir)
+
+    if not args.no_overflow_check and report.rebuilt_logs:
+        print()
+        report_overflows(report.rebuilt_logs)
+
+    if report.failed:
+        print(f"{len(report.failed)} document(s) failed to compile")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
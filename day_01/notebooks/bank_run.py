@@ -0,0 +1,202 @@
+"""
+Monte Carlo bank-run engine for NB01's FractionalReserveBank challenge.
+
+FractionalReserveBank keeps reserve_ratio of every deposit as cash and lends
+out the rest, so it can pay withdrawals only until its reserves run out. This
+module stress-tests thousands of such banks at once: reserve ratios, customer
+deposits and withdrawal demand are NumPy arrays, and every scenario applies a
+random withdrawal shock to every bank.
+
+A scenario draws a market-wide panic level p from a Beta distribution (most
+days calm, a few days of widespread panic). Each customer of each bank then
+tries to withdraw their whole deposit with probability p. A bank suffers a
+run when the withdrawals exceed its reserves; the unmet demand is its
+shortfall.
+
+Scenarios are simulated in batches, and batches are spread across a process
+pool. Each batch has its own seed derived from the run's seed, so results
+are the same for any number of workers.
+
+Example:
+    from bank_run import run_probability_curve
+
+    ratios, probability = run_probability_curve(np.linspace(0.02, 0.5, 25))
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+
+# Scenarios simulated together in one vectorised batch (one pool task)
+SCENARIOS_PER_BATCH = 16
+
+# Worker state set by _init_worker, so the deposit arrays are sent once per process
+_deposits: Optional[np.ndarray] = None
+_reserves: Optional[np.ndarray] = None
+
+
+def random_deposits(n_banks: int, n_customers: int = 50, mean: float = 1000.0,
+                    sigma: float = 1.0, seed: int = 0) -> np.ndarray:
+    """
+    Lognormal customer deposits, one row per bank.
+
+    Args:
+        n_banks: Number of banks
+        n_customers: Customers per bank
+        mean: Mean deposit
+        sigma: Spread of the log deposit (larger = a few very large customers)
+        seed: Random seed
+
+    Returns:
+        Array of shape (n_banks, n_customers)
+    """
+    rng = np.random.default_rng(seed)
+    mu = np.log(mean) - sigma ** 2 / 2
+    return rng.lognormal(mu, sigma, (n_banks, n_customers))
+
+
+def _init_worker(deposits: np.ndarray, reserves: np.ndarray) -> None:
+    global _deposits, _reserves
+    _deposits, _reserves = deposits, reserves
+
+
+def _simulate_batch(seed: np.random.SeedSequence, n_scenarios: int, panic_alpha: float,
+                    panic_beta: float) -> tuple:
+    """
+    Simulate n_scenarios withdrawal shocks against every bank.
+
+    Returns:
+        (runs per bank, total shortfall per bank, total demand per bank)
+    """
+    rng = np.random.default_rng(seed)
+    deposits, reserves = _deposits, _reserves
+    runs = np.zeros(len(deposits), dtype=np.int64)
+    shortfall = np.zeros(len(deposits))
+    demand_total = np.zeros(len(deposits))
+
+    for panic in rng.beta(panic_alpha, panic_beta, n_scenarios):
+        # float32 draws are plenty for a probability and a third cheaper
+        withdraws = rng.random(deposits.shape, dtype=np.float32) < panic
+        demand = np.einsum('ij,ij->i', deposits, withdraws)
+        runs += demand > reserves
+        shortfall += np.maximum(demand - reserves, 0.0)
+        demand_total += demand
+    return runs, shortfall, demand_total
+
+
+def simulate_bank_runs(reserve_ratios: Sequence[float], n_scenarios: int = 1000,
+                       deposits: Optional[np.ndarray] = None, n_customers: int = 50,
+                       panic_alpha: float = 1.0, panic_beta: float = 9.0, seed: int = 0,
+                       workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run-probability of each bank under n_scenarios random withdrawal shocks.
+
+    Args:
+        reserve_ratios: Reserve ratio of each bank (e.g. 0.10 = 10%)
+        n_scenarios: Number of withdrawal-shock scenarios
+        deposits: Customer deposits, shape (banks, customers); default random_deposits()
+        n_customers: Customers per bank when deposits are generated
+        panic_alpha, panic_beta: Beta distribution of the panic level (mean alpha / (alpha + beta))
+        seed: Random seed (results do not depend on workers)
+        workers: Worker processes (default: all CPUs; 1 runs in this process)
+
+    Returns:
+        Dict with per-bank arrays 'reserve_ratio', 'run_probability',
+        'expected_shortfall' (mean unmet demand) and 'expected_demand', plus
+        'scenarios' and 'seconds'
+    """
+    reserve_ratios = np.asarray(reserve_ratios, dtype=np.float64)
+    if deposits is None:
+        deposits = random_deposits(len(reserve_ratios), n_customers, seed=seed)
+    deposits = np.asarray(deposits, dtype=np.float64)
+    if len(deposits) != len(reserve_ratios):
+        raise ValueError("deposits needs one row per reserve ratio")
+
+    # Same rule as FractionalReserveBank.deposit: keep reserve_ratio of each deposit
+    reserves = reserve_ratios * deposits.sum(axis=1)
+
+    batches = [min(SCENARIOS_PER_BATCH, n_scenarios - start)
+               for start in range(0, n_scenarios, SCENARIOS_PER_BATCH)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    args = [(s, size, panic_alpha, panic_beta) for s, size in zip(seeds, batches)]
+    workers = min(workers or os.cpu_count() or 1, len(batches) or 1)
+
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(deposits, reserves)
+        results = [_simulate_batch(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(deposits, reserves)) as pool:
+            results = list(pool.map(_simulate_batch, *zip(*args)))
+
+    runs = sum(r[0] for r in results)
+    shortfall = sum(r[1] for r in results)
+    demand = sum(r[2] for r in results)
+    return {
+        'reserve_ratio': reserve_ratios,
+        'run_probability': runs / n_scenarios,
+        'expected_shortfall': shortfall / n_scenarios,
+        'expected_demand': demand / n_scenarios,
+        'scenarios': n_scenarios,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def run_probability_curve(ratios: Sequence[float], banks_per_ratio: int = 1000,
+                          n_scenarios: int = 1000, **kwargs) -> tuple:
+    """
+    Probability of a bank run as a function of reserve_ratio.
+
+    Simulates banks_per_ratio banks (each with its own customers) at every
+    ratio; extra keyword arguments go to simulate_bank_runs().
+
+    Returns:
+        (ratios, run probability at each ratio)
+    """
+    ratios = np.asarray(ratios, dtype=np.float64)
+    result = simulate_bank_runs(np.repeat(ratios, banks_per_ratio), n_scenarios, **kwargs)
+    probability = result['run_probability'].reshape(len(ratios), banks_per_ratio).mean(axis=1)
+    return ratios, probability
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Monte Carlo bank-run probabilities for fractional reserve banks'
+    )
+    parser.add_argument('--ratios', type=float, nargs='+',
+                        default=[0.02, 0.05, 0.10, 0.15, 0.20, 0.30, 0.50],
+                        help='Reserve ratios to evaluate')
+    parser.add_argument('--banks', type=int, default=1000, help='Banks per reserve ratio (default: 1000)')
+    parser.add_argument('--customers', type=int, default=50, help='Customers per bank (default: 50)')
+    parser.add_argument('--scenarios', type=int, default=1000, help='Withdrawal-shock scenarios (default: 1000)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all CPUs)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    ratios = np.array(args.ratios)
+    result = simulate_bank_runs(np.repeat(ratios, args.banks), args.scenarios,
+                                n_customers=args.customers, seed=args.seed, workers=args.workers)
+    probability = result['run_probability'].reshape(len(ratios), args.banks).mean(axis=1)
+    shortfall = result['expected_shortfall'].reshape(len(ratios), args.banks).mean(axis=1)
+
+    print(f"{'Reserve ratio':>14} {'P(run)':>8} {'Mean shortfall':>15}")
+    print("-" * 40)
+    for ratio, p, s in zip(ratios, probability, shortfall):
+        print(f"{ratio:>13.0%} {p:>8.3f} {s:>15,.2f}")
+    print(f"\n{len(ratios) * args.banks:,} banks x {args.scenarios:,} scenarios "
+          f"in {result['seconds']:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
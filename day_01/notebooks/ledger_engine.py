@@ -0,0 +1,797 @@
+"""
+Columnar ledger engine for NB01: Money and Ledgers.
+
+NB01's SimpleLedger and Bank record their transactions in a ColumnarLedger
+rather than in a list of Python dicts. It stores the same information
+column by column in growable NumPy arrays (sender and recipient as interned
+integer account ids, amount, fee, timestamp, status), so totals and filters
+are vectorised; records() gives the notebook's dicts back for display.
+10 million transactions take about 500 MB, columns and index together.
+
+Per-account history is indexed CSR-style (each account's row numbers, in
+order) together with running-balance checkpoints every CHECKPOINT_EVERY
+entries. Balance-at-time and per-account history queries therefore take
+O(log n) plus at most CHECKPOINT_EVERY rows of work, instead of a scan of the
+whole ledger. The index is brought up to date lazily, on the first query
+after a batch of appends: only the new rows are sorted, then merged into the
+existing index INDEX_CHUNK rows at a time, which keeps the temporary arrays
+small (10 million rows are indexed in under 1 GB).
+
+LedgerBank puts the notebook's Bank rules (fee, minimum fee, insufficient
+funds rejection) on top of a ColumnarLedger, without the per-call printing
+and processing delay. transfer_batch() applies arrays of transfers with the
+same outcomes as calling transfer() on each, in vectorised passes.
+
+Run this file to benchmark the scalar and batch transfer paths:
+    python ledger_engine.py --sizes 10000 100000 1000000 10000000
+
+Example:
+    from ledger_engine import LedgerBank
+
+    bank = LedgerBank("Visualization Bank", transfer_fee_percent=0.5, minimum_fee=0.10)
+    bank.create_account("Alice", 100.0)
+    bank.create_account("Bob", 50.0)
+    bank.transfer("Alice", "Bob", 20.0)
+    bank.ledger.balance_at("Alice", time.time())
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+COMPLETED = 0
+REJECTED = 1
+STATUS_NAMES = {COMPLETED: 'COMPLETED', REJECTED: 'REJECTED'}
+
+# Running balances are stored once every this many entries of an account
+CHECKPOINT_EVERY = 64
+
+# New rows are merged into the per-account index this many at a time
+INDEX_CHUNK = 1 << 20
+
+# LedgerBank.transfer_batch settles chunks of transfers in vectorised passes;
+# chunks grow while few passes are needed and shrink when long chains of
+# dependent transfers (e.g. nearly empty accounts) need many
+MIN_TRANSFER_CHUNK = 64
+MAX_TRANSFER_CHUNK = 16384
+
+# Rejection reasons returned by LedgerBank.transfer_batch (0 = accepted)
+REASON_MESSAGES = {
+    1: "Sender account does not exist",
+    2: "Recipient account does not exist",
+    3: "Transfer amount must be positive",
+    4: "Insufficient funds",
+}
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """Return array with capacity for at least size items (amortised doubling)."""
+    if size <= len(array):
+        return array
+    grown = np.empty(max(size, 2 * len(array), 16), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class ColumnarLedger:
+    """
+    Append-only transaction ledger stored as NumPy columns.
+
+    Rows are numbered from 0 in append order. Timestamps (seconds since the
+    epoch) must be non-decreasing, which keeps time-range queries a binary
+    search over the timestamp column.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Create an empty ledger.
+
+        Args:
+            capacity: Initial number of rows to allocate (grows as needed)
+        """
+        self._n = 0
+        self._sender = np.empty(capacity, dtype=np.int32)
+        self._recipient = np.empty(capacity, dtype=np.int32)
+        self._amount = np.empty(capacity, dtype=np.float64)
+        self._fee = np.empty(capacity, dtype=np.float64)
+        self._timestamp = np.empty(capacity, dtype=np.float64)
+        self._status = np.empty(capacity, dtype=np.int8)
+        self.descriptions: Dict[int, str] = {}
+
+        # Interned account names
+        self._ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+        # Per-account index: rows of account a are _index_rows[_index_offsets[a]:_index_offsets[a + 1]]
+        self._indexed = 0
+        self._index_rows = np.empty(0, dtype=np.int64)
+        self._index_offsets = np.zeros(1, dtype=np.int64)
+        self._checkpoints = np.empty(0, dtype=np.float64)
+        self._checkpoint_offsets = np.zeros(1, dtype=np.int64)
+        self._balances = np.zeros(0)
+
+    # ------------------------------------------------------------------
+    # Appending
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._n
+
+    def account_id(self, name: str) -> int:
+        """Return the integer id for an account name, interning it if new."""
+        account = self._ids.get(name)
+        if account is None:
+            account = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return account
+
+    def _reserve(self, size: int) -> None:
+        for column in ('_sender', '_recipient', '_amount', '_fee', '_timestamp', '_status'):
+            setattr(self, column, _grow(getattr(self, column), size))
+
+    def append(self, sender: str, recipient: str, amount: float, fee: float = 0.0,
+               status: int = COMPLETED, timestamp: Optional[float] = None,
+               description: str = "") -> int:
+        """
+        Append one transaction.
+
+        Args:
+            sender: Sender account name (e.g. "DEPOSIT" for deposits)
+            recipient: Recipient account name
+            amount: Amount transferred
+            fee: Fee paid by the sender
+            status: COMPLETED or REJECTED
+            timestamp: Seconds since the epoch (default: now, kept non-decreasing)
+            description: Optional note, e.g. the rejection reason
+
+        Returns:
+            Row number of the new transaction
+        """
+        row = self._n
+        last = self._timestamp[row - 1] if row else -np.inf
+        if timestamp is None:
+            timestamp = max(time.time(), last)
+        elif timestamp < last:
+            raise ValueError("Timestamps must be non-decreasing")
+
+        self._reserve(row + 1)
+        self._sender[row] = self.account_id(sender)
+        self._recipient[row] = self.account_id(recipient)
+        self._amount[row] = amount
+        self._fee[row] = fee
+        self._timestamp[row] = timestamp
+        self._status[row] = status
+        if description:
+            self.descriptions[row] = description
+        self._n += 1
+        return row
+
+    def append_batch(self, senders: Iterable, recipients: Iterable, amounts: Iterable,
+                     fees: Optional[Iterable] = None, statuses: Optional[Iterable] = None,
+                     timestamps: Optional[Iterable] = None) -> range:
+        """
+        Append many transactions at once.
+
+        Senders and recipients may be account names or integer ids returned by
+        account_id(). Fees default to 0, statuses to COMPLETED and timestamps
+        to now.
+
+        Returns:
+            Range of the new row numbers
+        """
+        senders = self._as_ids(senders)
+        recipients = self._as_ids(recipients)
+        count = len(senders)
+        start = self._n
+        last = self._timestamp[start - 1] if start else -np.inf
+
+        if timestamps is None:
+            timestamps = np.full(count, max(time.time(), last))
+        else:
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+            if count and (timestamps[0] < last or np.any(np.diff(timestamps) < 0)):
+                raise ValueError("Timestamps must be non-decreasing")
+
+        self._reserve(start + count)
+        end = start + count
+        self._sender[start:end] = senders
+        self._recipient[start:end] = recipients
+        self._amount[start:end] = amounts
+        self._fee[start:end] = 0.0 if fees is None else fees
+        self._timestamp[start:end] = timestamps
+        self._status[start:end] = COMPLETED if statuses is None else statuses
+        self._n = end
+        return range(start, end)
+
+    def _as_ids(self, accounts: Iterable) -> np.ndarray:
+        accounts = np.asarray(accounts)
+        if accounts.dtype.kind in 'iu':
+            if len(accounts) and (accounts.min() < 0 or accounts.max() >= len(self.names)):
+                raise ValueError("Unknown account id; intern names with account_id() first")
+            return accounts.astype(np.int32, copy=False)
+        names, inverse = np.unique(accounts, return_inverse=True)
+        ids = np.array([self.account_id(str(name)) for name in names], dtype=np.int32)
+        return ids[inverse]
+
+    # ------------------------------------------------------------------
+    # Columns
+    # ------------------------------------------------------------------
+
+    @property
+    def sender(self) -> np.ndarray:
+        return self._sender[:self._n]
+
+    @property
+    def recipient(self) -> np.ndarray:
+        return self._recipient[:self._n]
+
+    @property
+    def amount(self) -> np.ndarray:
+        return self._amount[:self._n]
+
+    @property
+    def fee(self) -> np.ndarray:
+        return self._fee[:self._n]
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self._timestamp[:self._n]
+
+    @property
+    def status(self) -> np.ndarray:
+        return self._status[:self._n]
+
+    def completed(self) -> np.ndarray:
+        """Boolean mask of completed transactions."""
+        return self.status == COMPLETED
+
+    def fees_collected(self) -> float:
+        """Total fees of completed transactions."""
+        return float(self.fee[self.completed()].sum())
+
+    # ------------------------------------------------------------------
+    # Per-account index
+    # ------------------------------------------------------------------
+
+    def _deltas(self, rows: np.ndarray, accounts: np.ndarray) -> np.ndarray:
+        """Balance change of accounts caused by rows (0 for rejected rows)."""
+        amount = self._amount[rows]
+        delta = np.where(self._recipient[rows] == accounts, amount, 0.0)
+        delta -= np.where(self._sender[rows] == accounts, amount + self._fee[rows], 0.0)
+        delta[self._status[rows] != COMPLETED] = 0.0
+        return delta
+
+    @staticmethod
+    def _merge_csr(values: np.ndarray, offsets: np.ndarray, new_values: np.ndarray,
+                   new_counts: np.ndarray) -> tuple:
+        """Append new_values (grouped by account) after each account's existing values."""
+        n_accounts = len(new_counts)
+        old_counts = np.zeros(n_accounts, dtype=np.int64)
+        old_counts[:len(offsets) - 1] = np.diff(offsets)
+        old_ends = np.full(n_accounts, offsets[-1], dtype=np.int64)
+        old_ends[:len(offsets) - 1] = offsets[1:]
+
+        merged_offsets = np.zeros(n_accounts + 1, dtype=np.int64)
+        np.cumsum(old_counts + new_counts, out=merged_offsets[1:])
+        # np.insert keeps new values with the same position in order, and needs
+        # no full-size temporaries besides the result
+        merged = np.insert(values, np.repeat(old_ends, new_counts), new_values)
+        return merged, merged_offsets
+
+    def _update_index(self) -> None:
+        """Merge rows appended since the last query into the index and checkpoints."""
+        if self._indexed == self._n and len(self._index_offsets) == len(self.names) + 1:
+            return
+        # A bounded number of rows at a time keeps the temporary arrays small
+        for start in range(self._indexed, self._n, INDEX_CHUNK):
+            self._index_rows_between(start, min(start + INDEX_CHUNK, self._n))
+        if len(self._index_offsets) != len(self.names) + 1:
+            self._index_rows_between(self._n, self._n)
+
+    def _index_rows_between(self, start: int, n: int) -> None:
+        """Merge rows start..n-1 into the index and checkpoints."""
+        n_accounts = len(self.names)
+        batch = n - start
+        senders = self._sender[start:n].astype(np.int64)
+        recipients = self._recipient[start:n].astype(np.int64)
+        amount, fee = self._amount[start:n], self._fee[start:n]
+        completed = self._status[start:n] == COMPLETED
+        distinct = senders != recipients
+
+        # Balance change on each side of each row; a self-transfer only costs the fee
+        deltas = np.concatenate([
+            np.where(distinct, -(amount + fee), -fee) * completed,
+            amount * completed,
+        ])
+
+        # One entry per (account, row, side), dropping the recipient side of
+        # self-transfers, sorted as a single int64 key (much faster than a
+        # stable argsort by account)
+        offsets = np.arange(batch, dtype=np.int64)
+        keys = np.concatenate([
+            (senders * n + start + offsets) * 2,
+            (recipients[distinct] * n + start + offsets[distinct]) * 2 + 1,
+        ])
+        keys.sort()
+        side = keys & 1
+        new_accounts, new_rows = np.divmod(keys >> 1, n)
+        new_deltas = deltas[side * batch + new_rows - start]
+        new_counts = np.bincount(new_accounts, minlength=n_accounts)
+        old_counts = np.zeros(n_accounts, dtype=np.int64)
+        old_counts[:len(self._index_offsets) - 1] = np.diff(self._index_offsets)
+
+        # Running balances of the new entries, continuing from each account's last one
+        balances = np.zeros(n_accounts)
+        balances[:len(self._balances)] = self._balances
+        running = np.cumsum(new_deltas)
+        new_starts = np.cumsum(new_counts) - new_counts
+        restart = np.concatenate([[0.0], running])[new_starts] - balances
+        running -= np.repeat(restart, new_counts)
+        local = np.arange(len(keys)) - np.repeat(new_starts - old_counts, new_counts)
+        at_checkpoint = (local + 1) % CHECKPOINT_EVERY == 0
+        checkpoint_counts = (old_counts + new_counts) // CHECKPOINT_EVERY - old_counts // CHECKPOINT_EVERY
+
+        self._index_rows, self._index_offsets = self._merge_csr(
+            self._index_rows, self._index_offsets, new_rows, new_counts)
+        self._checkpoints, self._checkpoint_offsets = self._merge_csr(
+            self._checkpoints, self._checkpoint_offsets, running[at_checkpoint], checkpoint_counts)
+        self._balances = balances + np.bincount(new_accounts, weights=new_deltas, minlength=n_accounts)
+        self._indexed = n
+
+    def _account_rows(self, name: str) -> tuple:
+        self._update_index()
+        account = self._ids.get(name)
+        if account is None:
+            raise KeyError(f"Unknown account '{name}'")
+        start, end = self._index_offsets[account], self._index_offsets[account + 1]
+        return account, self._index_rows[start:end]
+
+    def _balance_after_entries(self, account: int, rows: np.ndarray, count: int) -> float:
+        """Balance of account after its first count entries."""
+        checkpoint = count // CHECKPOINT_EVERY
+        base = 0.0
+        if checkpoint:
+            base = self._checkpoints[self._checkpoint_offsets[account] + checkpoint - 1]
+        tail = rows[checkpoint * CHECKPOINT_EVERY:count]
+        return float(base + self._deltas(tail, np.full(len(tail), account)).sum())
+
+    def _row_at(self, timestamp: float) -> int:
+        """Number of rows with timestamp <= timestamp."""
+        return int(np.searchsorted(self.timestamp, timestamp, side='right'))
+
+    def balance_at(self, name: str, timestamp: float) -> float:
+        """
+        Balance of an account including all transactions up to timestamp.
+
+        Args:
+            name: Account name
+            timestamp: Seconds since the epoch
+
+        Returns:
+            Balance at that time (0.0 before the account's first transaction)
+        """
+        account, rows = self._account_rows(name)
+        count = int(np.searchsorted(rows, self._row_at(timestamp)))
+        return self._balance_after_entries(account, rows, count)
+
+    def balance(self, name: str) -> float:
+        """Current balance of an account, from the ledger alone."""
+        account, _ = self._account_rows(name)
+        return float(self._balances[account])
+
+    def history(self, name: str, start: Optional[float] = None,
+                end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Transactions of one account, optionally within [start, end].
+
+        Returns:
+            Dict of column arrays ('row', 'timestamp', 'sender', 'recipient',
+            'amount', 'fee', 'status') plus 'balance', the account's running
+            balance after each row
+        """
+        account, rows = self._account_rows(name)
+        first = 0 if start is None else int(np.searchsorted(rows, np.searchsorted(self.timestamp, start)))
+        last = len(rows) if end is None else int(np.searchsorted(rows, self._row_at(end)))
+        selected = rows[first:last]
+
+        opening = self._balance_after_entries(account, rows, first)
+        balance = opening + np.cumsum(self._deltas(selected, np.full(len(selected), account)))
+        return {
+            'row': selected,
+            'timestamp': self._timestamp[selected],
+            'sender': self._sender[selected],
+            'recipient': self._recipient[selected],
+            'amount': self._amount[selected],
+            'fee': self._fee[selected],
+            'status': self._status[selected],
+            'balance': balance,
+        }
+
+    def records(self, rows: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Transactions as NB01's transaction dicts.
+
+        Keys are 'id' (row + 1), 'timestamp' (local datetime), 'sender',
+        'recipient', 'amount', 'fee', 'status' ('COMPLETED' or 'REJECTED')
+        and 'description'. Meant for small ledgers; use the columns for large ones.
+        """
+        rows = np.arange(self._n) if rows is None else np.asarray(rows, dtype=np.int64)
+        return [
+            {
+                'id': row + 1,
+                'timestamp': datetime.fromtimestamp(timestamp),
+                'sender': self.names[sender],
+                'recipient': self.names[recipient],
+                'amount': amount,
+                'fee': fee,
+                'status': STATUS_NAMES[status],
+                'description': self.descriptions.get(row, ""),
+            }
+            for row, timestamp, sender, recipient, amount, fee, status in zip(
+                rows.tolist(), self._timestamp[rows].tolist(), self._sender[rows].tolist(),
+                self._recipient[rows].tolist(), self._amount[rows].tolist(), self._fee[rows].tolist(),
+                self._status[rows].tolist())
+        ]
+
+    def to_dataframe(self, rows: Optional[np.ndarray] = None):
+        """Transactions as a pandas DataFrame with the notebook's column names."""
+        import pandas as pd
+
+        rows = np.arange(self._n) if rows is None else np.asarray(rows)
+        names = np.array(self.names, dtype=object)
+        return pd.DataFrame({
+            'id': rows + 1,
+            'timestamp': pd.to_datetime(self._timestamp[rows], unit='s'),
+            'sender': names[self._sender[rows]],
+            'recipient': names[self._recipient[rows]],
+            'amount': self._amount[rows],
+            'fee': self._fee[rows],
+            'status': np.array(list(STATUS_NAMES.values()), dtype=object)[self._status[rows]],
+            'description': [self.descriptions.get(int(r), "") for r in rows],
+        })
+
+
+def _apply_transfers(balances: np.ndarray, senders: np.ndarray, recipients: np.ndarray,
+                     amounts: np.ndarray, costs: np.ndarray) -> None:
+    """Debit costs and credit amounts in transfer order (bit-identical to a Python loop)."""
+    accounts = np.column_stack([senders, recipients]).ravel()
+    changes = np.column_stack([-costs, amounts]).ravel()
+    np.add.at(balances, accounts, changes)
+
+
+def _settle_transfers(balances: np.ndarray, senders: np.ndarray, recipients: np.ndarray,
+                      amounts: np.ndarray, costs: np.ndarray, valid: np.ndarray) -> tuple:
+    """
+    Decide which of a chunk of valid transfers are covered, applying them to balances.
+
+    A transfer is accepted when its sender's balance, after all earlier
+    accepted transfers, is at least its cost.
+
+    Returns:
+        (accepted mask, number of vectorised passes used)
+    """
+    n = len(amounts)
+    accepted = np.zeros(n, dtype=bool)
+    passes = 0
+    eps = np.finfo(np.float64).eps
+    start = 0
+    while start < n:
+        m = n - start
+        cost, is_valid = costs[start:], valid[start:]
+
+        # Both sides of every transfer (debit at even, credit at odd positions),
+        # grouped by account and in transfer order
+        keys = np.sort(np.column_stack([senders[start:], recipients[start:]]).ravel().astype(np.int64)
+                       * (2 * m) + np.arange(2 * m))
+        accounts, positions = np.divmod(keys, 2 * m)
+        rows = positions // 2
+        base = np.where(positions % 2 == 0, -costs[start:][rows], amounts[start:][rows])
+        new_account = np.r_[True, accounts[1:] != accounts[:-1]]
+        group_first = np.maximum.accumulate(np.where(new_account, np.arange(2 * m), 0))
+
+        # For each transfer: where its debit entry and its account's first entry are
+        debit = np.empty(m, dtype=np.int64)
+        debit[rows[positions % 2 == 0]] = np.flatnonzero(positions % 2 == 0)
+        debit_first = group_first[debit]
+        opening = balances[senders[start:]]
+
+        # Bound on the rounding error of sender_before below: comparisons within
+        # it are too close to call and keep their previous decision, so each
+        # pass settles at least one more transfer; the first of them is then
+        # decided exactly on its own
+        tolerance = 4 * m * eps * (np.cumsum(np.abs(base))[debit] + np.abs(opening))
+
+        decision = is_valid.copy()
+        while True:
+            passes += 1
+            changes = base * decision[rows]
+            # Balance just before each entry = opening + earlier changes of the same account
+            before = np.cumsum(changes) - changes
+            sender_before = before[debit] - before[debit_first] + opening
+            close = np.abs(sender_before - cost) <= tolerance
+            new_decision = is_valid & np.where(close, decision, sender_before >= cost)
+            if np.array_equal(new_decision, decision):
+                break
+            decision = new_decision
+
+        close = np.flatnonzero(is_valid & close)
+        stop = m if len(close) == 0 else close[0]
+
+        done = np.arange(start, start + stop)[decision[:stop]]
+        accepted[done] = True
+        _apply_transfers(balances, senders[done], recipients[done], amounts[done], costs[done])
+        if stop < m:
+            i = start + stop
+            if balances[senders[i]] >= costs[i]:
+                accepted[i] = True
+                balances[senders[i]] -= costs[i]
+                balances[recipients[i]] += amounts[i]
+            stop += 1
+        start += stop
+    return accepted, passes
+
+
+class LedgerBank:
+    """
+    NB01's Bank on a ColumnarLedger: same fees and validation, no printing.
+
+    Current balances are kept in a dict for O(1) validation; the ledger keeps
+    the full history for time-travel and per-account queries.
+    """
+
+    def __init__(self, name: str = "Central Bank", transfer_fee_percent: float = 1.0,
+                 minimum_fee: float = 0.50):
+        """
+        Initialize the bank.
+
+        Args:
+            name: Name of the bank
+            transfer_fee_percent: Fee as a percentage of the amount
+            minimum_fee: Minimum fee per transfer
+        """
+        self.name = name
+        self.transfer_fee_percent = transfer_fee_percent
+        self.minimum_fee = minimum_fee
+        self.balances: Dict[str, float] = {}
+        self.ledger = ColumnarLedger()
+
+    def create_account(self, name: str, initial_balance: float = 0.0) -> bool:
+        """Create an account; the initial balance is recorded as a DEPOSIT."""
+        if name in self.balances or initial_balance < 0:
+            return False
+        self.balances[name] = initial_balance
+        self.ledger.account_id(name)
+        if initial_balance > 0:
+            self.ledger.append("DEPOSIT", name, initial_balance, description="Initial deposit")
+        return True
+
+    def get_balance(self, name: str) -> Optional[float]:
+        return self.balances.get(name)
+
+    def calculate_fee(self, amount: float) -> float:
+        """Fee for a transfer: transfer_fee_percent of the amount, at least minimum_fee."""
+        return max(amount * (self.transfer_fee_percent / 100), self.minimum_fee)
+
+    def transfer(self, sender: str, recipient: str, amount: float,
+                 timestamp: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Transfer money with the same validation as NB01's Bank.transfer.
+
+        Returns:
+            Dictionary with the transaction result
+        """
+        if sender not in self.balances:
+            reason = f"Sender account '{sender}' does not exist"
+        elif recipient not in self.balances:
+            reason = f"Recipient account '{recipient}' does not exist"
+        elif amount <= 0:
+            reason = "Transfer amount must be positive"
+        else:
+            fee = self.calculate_fee(amount)
+            total_cost = amount + fee
+            if self.balances[sender] >= total_cost:
+                # Ledger first: it rejects out-of-order timestamps before any money moves
+                row = self.ledger.append(sender, recipient, amount, fee, COMPLETED, timestamp)
+                self.balances[sender] -= total_cost
+                self.balances[recipient] += amount
+                return {
+                    'success': True,
+                    'transaction_id': row + 1,
+                    'amount': amount,
+                    'fee': fee,
+                    'sender_balance': self.balances[sender],
+                    'recipient_balance': self.balances[recipient]
+                }
+            reason = (f"Insufficient funds: has ${self.balances[sender]:.2f}, "
+                      f"needs ${total_cost:.2f} (including ${fee:.2f} fee)")
+
+        row = self.ledger.append(sender, recipient, amount, 0.0, REJECTED, timestamp, reason)
+        return {'success': False, 'transaction_id': row + 1, 'reason': reason}
+
+    def transfer_batch(self, senders: Iterable, recipients: Iterable, amounts: Iterable,
+                       timestamps: Optional[Iterable] = None) -> Dict[str, np.ndarray]:
+        """
+        Apply many transfers in order, with the same outcomes as calling transfer() on each.
+
+        Fees, account and amount checks are computed for the whole batch at
+        once. Whether a transfer overdraws its sender depends on every earlier
+        transfer, so each chunk of transfers is settled by
+        repeating a vectorised pass (running balances of all accounts, given
+        the current accept/reject decisions) until the decisions stop
+        changing; that fixed point is exactly the sequential result. Balances
+        are then updated in transfer order, so they match the scalar path to
+        the last bit. Rejected transfers are recorded without a description;
+        the 'reason' codes are listed in REASON_MESSAGES.
+
+        Args:
+            senders: Sender account names (or ledger account ids)
+            recipients: Recipient account names (or ledger account ids)
+            amounts: Amounts to transfer
+            timestamps: Optional non-decreasing timestamps (default: now)
+
+        Returns:
+            Dict of arrays: 'transaction_id', 'status' (COMPLETED/REJECTED),
+            'fee' (0 for rejected transfers) and 'reason'
+        """
+        ledger = self.ledger
+        senders = ledger._as_ids(senders)
+        recipients = ledger._as_ids(recipients)
+        amounts = np.asarray(amounts, dtype=np.float64)
+
+        # Same operations as calculate_fee, elementwise
+        fees = np.maximum(amounts * (self.transfer_fee_percent / 100), self.minimum_fee)
+        costs = amounts + fees
+
+        # Balances of the accounts involved, as an array indexed by ledger account id
+        exists = np.zeros(len(ledger.names), dtype=bool)
+        balances = np.zeros(len(ledger.names))
+        involved = np.flatnonzero(np.bincount(np.concatenate([senders, recipients]),
+                                               minlength=len(ledger.names))).tolist()
+        for account in involved:
+            balance = self.balances.get(ledger.names[account])
+            if balance is not None:
+                exists[account] = True
+                balances[account] = balance
+        reasons = np.zeros(len(amounts), dtype=np.int8)
+        reasons[amounts <= 0] = 3
+        reasons[~exists[recipients]] = 2
+        reasons[~exists[senders]] = 1
+
+        accepted = np.zeros(len(amounts), dtype=bool)
+        start, size = 0, 1024
+        while start < len(amounts):
+            chunk = slice(start, start + size)
+            accepted[chunk], passes = _settle_transfers(balances, senders[chunk], recipients[chunk],
+                                                        amounts[chunk], costs[chunk], reasons[chunk] == 0)
+            start += size
+            if passes <= 4:
+                size = min(2 * size, MAX_TRANSFER_CHUNK)
+            elif passes > 16:
+                size = max(size // 2, MIN_TRANSFER_CHUNK)
+        reasons[(reasons == 0) & ~accepted] = 4
+
+        # Settled on a copy so far; append_batch rejects out-of-order timestamps
+        # before any account is updated
+        statuses = np.where(accepted, COMPLETED, REJECTED).astype(np.int8)
+        fees = np.where(accepted, fees, 0.0)
+        rows = ledger.append_batch(senders, recipients, amounts, fees, statuses, timestamps)
+        for account in involved:
+            if exists[account]:
+                self.balances[ledger.names[account]] = float(balances[account])
+        return {
+            'transaction_id': np.arange(rows.start, rows.stop) + 1,
+            'status': statuses,
+            'fee': fees,
+            'reason': reasons,
+        }
+
+    def fees_collected(self) -> float:
+        return self.ledger.fees_collected()
+
+    def balance_history(self, name: str) -> np.ndarray:
+        """Running balance of an account after each of its transactions."""
+        return self.ledger.history(name)['balance']
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def random_transfers(num_transfers: int, num_accounts: int, low: float = 5.0, high: float = 30.0,
+                     seed: int = 0) -> tuple:
+    """
+    Random transfers like NB01's simulate_transaction_history, as arrays.
+
+    Returns:
+        (senders, recipients, amounts); senders and recipients are account
+        numbers in range(num_accounts), never equal
+    """
+    rng = np.random.default_rng(seed)
+    senders = rng.integers(0, num_accounts, num_transfers)
+    recipients = (senders + rng.integers(1, num_accounts, num_transfers)) % num_accounts
+    return senders, recipients, rng.uniform(low, high, num_transfers)
+
+
+def _benchmark_bank(num_accounts: int, seed: int) -> tuple:
+    bank = LedgerBank("Benchmark Bank", transfer_fee_percent=0.5, minimum_fee=0.10)
+    rng = np.random.default_rng(seed)
+    names = [f"Customer_{i}" for i in range(num_accounts)]
+    for name, balance in zip(names, rng.integers(50, 151, num_accounts)):
+        bank.create_account(name, float(balance))
+    return bank, names
+
+
+def benchmark_transfers(sizes: Sequence[int] = (10**4, 10**5, 10**6, 10**7), num_accounts: int = 1000,
+                        scalar_limit: Optional[int] = None, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Time transfer() in a loop against transfer_batch() on the same random transfers.
+
+    Both paths start from identical banks; outcomes and final balances are
+    compared. Sizes above scalar_limit run the batch path only.
+
+    Returns:
+        One dict per size with the timings, transfers per second and outcome counts
+    """
+    results = []
+    for size in sizes:
+        senders, recipients, amounts = random_transfers(size, num_accounts, seed=seed)
+        result = {'transfers': size, 'scalar_s': None, 'scalar_per_s': None, 'match': None}
+
+        batch_bank, names = _benchmark_bank(num_accounts, seed)
+        ids = np.array([batch_bank.ledger.account_id(name) for name in names])
+        start = time.perf_counter()
+        outcome = batch_bank.transfer_batch(ids[senders], ids[recipients], amounts)
+        result['batch_s'] = time.perf_counter() - start
+        result['batch_per_s'] = size / result['batch_s']
+        result['completed'] = int(np.sum(outcome['status'] == COMPLETED))
+        result['rejected'] = size - result['completed']
+
+        if scalar_limit is None or size <= scalar_limit:
+            scalar_bank, _ = _benchmark_bank(num_accounts, seed)
+            transfer = scalar_bank.transfer
+            start = time.perf_counter()
+            for s, r, a in zip([names[i] for i in senders], [names[i] for i in recipients], amounts.tolist()):
+                transfer(s, r, a)
+            result['scalar_s'] = time.perf_counter() - start
+            result['scalar_per_s'] = size / result['scalar_s']
+            result['match'] = (np.array_equal(scalar_bank.ledger.status, batch_bank.ledger.status)
+                               and scalar_bank.balances == batch_bank.balances)
+        results.append(result)
+    return results
+
+
+def print_benchmark(results: List[Dict[str, Any]]) -> None:
+    print(f"{'Transfers':>12} {'Scalar s':>10} {'Batch s':>9} {'Speedup':>8} "
+          f"{'Batch tx/s':>12} {'Rejected':>9} {'Same result':>12}")
+    print("-" * 78)
+    for r in results:
+        scalar = f"{r['scalar_s']:>10.2f}" if r['scalar_s'] is not None else f"{'-':>10}"
+        speedup = f"{r['scalar_s'] / r['batch_s']:>7.0f}x" if r['scalar_s'] is not None else f"{'-':>8}"
+        match = '-' if r['match'] is None else ('yes' if r['match'] else 'NO')
+        print(f"{r['transfers']:>12,} {scalar} {r['batch_s']:>9.2f} {speedup} "
+              f"{r['batch_per_s']:>12,.0f} {r['rejected'] / r['transfers']:>8.1%} {match:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark scalar LedgerBank.transfer against transfer_batch'
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5, 10**6, 10**7],
+                        help='Numbers of transfers (default: 10^4 to 10^7)')
+    parser.add_argument('--accounts', type=int, default=1000, help='Number of accounts (default: 1000)')
+    parser.add_argument('--scalar-limit', type=int,
+                        help='Largest size to also run through the scalar path (default: all)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    results = benchmark_transfers(args.sizes, args.accounts, args.scalar_limit, args.seed)
+    print_benchmark(results)
+    return 0 if all(r['match'] is not False for r in results) else 1
+
+
+if __name__ == '__main__':
+    exit(main())
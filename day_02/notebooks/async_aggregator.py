@@ -0,0 +1,227 @@
+"""
+Concurrent account aggregation for NB03: Open Banking API Explorer.
+
+The notebook's AccountAggregator walks a user's bank connections one by one,
+and for each bank asks for the accounts and then for every account's
+balances or transactions, one call after another. With real network delays,
+aggregating N banks therefore takes the sum of every call's latency.
+
+AsyncAccountAggregator answers the same three questions (all accounts, total
+balance, combined transactions) for the connections of an existing
+AccountAggregator, but sends the calls concurrently with asyncio:
+
+- every connected bank is asked at the same time
+- within a bank, the per-account calls run side by side, at most
+  max_concurrent_per_bank at once (banks rate-limit third parties)
+- every call has a timeout, so one slow bank cannot hold up the others
+
+MockBank methods are ordinary blocking calls (like an HTTP request made with
+the requests library), so they run on a thread pool and the event loop only
+waits on them. A bank that fails or times out is reported under 'failedBanks'
+and the aggregate is built from the banks that did answer. Aggregation
+therefore takes about as long as the slowest bank, not the sum of all banks.
+
+Example (in a notebook, where `await` works at the top level):
+    from async_aggregator import AsyncAccountAggregator
+
+    fast_aggregator = AsyncAccountAggregator(aggregator, max_concurrent_per_bank=4, timeout=1.0)
+    balances = await fast_aggregator.get_total_balance("aggregator-user-001")
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+
+class BankError(Exception):
+    """A bank answered with an Open Banking error response."""
+
+
+async def _gather(calls) -> List:
+    """Results of all calls; if any failed, the first error once all have finished."""
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+class AsyncAccountAggregator:
+    """
+    Concurrent front end to an AccountAggregator's bank connections.
+
+    Results have the same shape as AccountAggregator's, plus 'failedBanks':
+    one {'bank', 'error'} entry per bank that could not be (fully) read.
+    """
+
+    def __init__(self, aggregator, max_concurrent_per_bank: int = 4, timeout: float = 5.0,
+                 max_workers: int = 64):
+        """
+        Args:
+            aggregator: AccountAggregator whose users and bank connections to use
+            max_concurrent_per_bank: Calls in flight at once to any one bank
+            timeout: Seconds to wait for a single API call before giving up on it
+            max_workers: Threads running blocking bank calls, across all banks
+        """
+        self.aggregator = aggregator
+        self.max_concurrent_per_bank = max_concurrent_per_bank
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='bank-call')
+
+    def close(self) -> None:
+        """Stop the worker threads (calls that timed out are not waited for)."""
+        self._executor.shutdown(wait=False)
+
+    # ------------------------------------------------------------------
+    # Aggregated views
+    # ------------------------------------------------------------------
+
+    async def get_all_accounts(self, user_id: str) -> Dict:
+        """Aggregated view of all accounts across connected banks."""
+        connections = self._connections(user_id)
+        if connections is None:
+            return {"error": "USER_NOT_FOUND"}
+
+        results = await self._per_bank(connections, self._bank_accounts)
+        all_accounts = []
+        for connection, accounts in results['ok']:
+            for account in accounts:
+                account["_bank"] = connection["bank_name"]
+                account["_bic"] = connection["bank"].bic
+                all_accounts.append(account)
+
+        return {
+            "accounts": all_accounts,
+            "totalBanksConnected": len(connections),
+            "totalAccounts": len(all_accounts),
+            "failedBanks": results['failed'],
+            "_aggregator": self.aggregator.name
+        }
+
+    async def get_total_balance(self, user_id: str) -> Dict:
+        """Total ClosingAvailable balance per currency across all connected accounts."""
+        connections = self._connections(user_id)
+        if connections is None:
+            return {"error": "USER_NOT_FOUND"}
+
+        results = await self._per_bank(connections, self._bank_balances)
+        total_by_currency: Dict[str, float] = {}
+        account_details = []
+        for connection, details in results['ok']:
+            for detail in details:
+                total_by_currency[detail["currency"]] = (
+                    total_by_currency.get(detail["currency"], 0) + detail["balance"])
+                account_details.append(detail)
+
+        return {
+            "totalBalances": [
+                {"currency": curr, "amount": amt}
+                for curr, amt in total_by_currency.items()
+            ],
+            "accountBreakdown": account_details,
+            "failedBanks": results['failed'],
+            "calculatedAt": datetime.now().isoformat()
+        }
+
+    async def get_all_transactions(self, user_id: str, days: int = 30) -> Dict:
+        """Combined booked transactions of the last `days` days across all banks, newest first."""
+        connections = self._connections(user_id)
+        if connections is None:
+            return {"error": "USER_NOT_FOUND"}
+
+        date_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        results = await self._per_bank(connections, partial(self._bank_transactions, date_from=date_from))
+        all_transactions = [tx for _, transactions in results['ok'] for tx in transactions]
+        all_transactions.sort(key=lambda x: x.get("bookingDate", ""), reverse=True)
+
+        return {
+            "transactions": all_transactions,
+            "totalTransactions": len(all_transactions),
+            "failedBanks": results['failed'],
+            "dateRange": {
+                "from": date_from,
+                "to": datetime.now().strftime('%Y-%m-%d')
+            }
+        }
+
+    # ------------------------------------------------------------------
+    # Per-bank work
+    # ------------------------------------------------------------------
+
+    async def _bank_accounts(self, connection: Dict, limit: asyncio.Semaphore) -> List[Dict]:
+        response = await self._call(connection, limit, 'get_accounts',
+                                    connection["customer_id"], connection["consent_id"])
+        return response["accounts"]
+
+    async def _bank_balances(self, connection: Dict, limit: asyncio.Semaphore) -> List[Dict]:
+        accounts = await self._bank_accounts(connection, limit)
+        responses = await _gather(
+            self._call(connection, limit, 'get_balances', account["accountId"], connection["consent_id"])
+            for account in accounts
+        )
+        return [
+            {
+                "bank": connection["bank_name"],
+                "account": account["name"],
+                "balance": float(bal["balanceAmount"]["amount"]),
+                "currency": bal["balanceAmount"]["currency"]
+            }
+            for account, response in zip(accounts, responses)
+            for bal in response["balances"] if bal["balanceType"] == "ClosingAvailable"
+        ]
+
+    async def _bank_transactions(self, connection: Dict, limit: asyncio.Semaphore,
+                                 date_from: str) -> List[Dict]:
+        accounts = await self._bank_accounts(connection, limit)
+        responses = await _gather(
+            self._call(connection, limit, 'get_transactions', account["accountId"],
+                       connection["consent_id"], date_from=date_from)
+            for account in accounts
+        )
+        transactions = []
+        for account, response in zip(accounts, responses):
+            for tx in response["transactions"].get("booked", []):
+                tx["_bank"] = connection["bank_name"]
+                tx["_accountName"] = account["name"]
+                transactions.append(tx)
+        return transactions
+
+    async def _per_bank(self, connections: List[Dict], work) -> Dict[str, List]:
+        """Run work(connection, limit) for every bank at once; split successes from failures."""
+        limits = {}
+        for connection in connections:
+            limits.setdefault(id(connection["bank"]), asyncio.Semaphore(self.max_concurrent_per_bank))
+        outcomes = await asyncio.gather(
+            *(work(connection, limits[id(connection["bank"])]) for connection in connections),
+            return_exceptions=True
+        )
+
+        results = {'ok': [], 'failed': []}
+        for connection, outcome in zip(connections, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                results['failed'].append({"bank": connection["bank_name"],
+                                          "error": f"TIMEOUT after {self.timeout}s"})
+            elif isinstance(outcome, Exception):
+                results['failed'].append({"bank": connection["bank_name"], "error": str(outcome)})
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results['ok'].append((connection, outcome))
+        return results
+
+    async def _call(self, connection: Dict, limit: asyncio.Semaphore, method: str,
+                    *args, **kwargs) -> Dict:
+        """One blocking bank API call on the thread pool, within the bank's limit and the timeout."""
+        loop = asyncio.get_running_loop()
+        call = partial(getattr(connection["bank"], method), *args, **kwargs)
+        async with limit:
+            response = await asyncio.wait_for(loop.run_in_executor(self._executor, call), self.timeout)
+        if "error" in response:
+            raise BankError(f"{method}: {response['error']}")
+        return response
+
+    def _connections(self, user_id: str) -> Optional[List[Dict[str, Any]]]:
+        user = self.aggregator.users.get(user_id)
+        return None if user is None else user["bank_connections"]
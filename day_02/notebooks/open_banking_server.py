@@ -0,0 +1,616 @@
+"""
+Local REST stand-in and load-test harness for NB03: Open Banking API Explorer.
+
+NB03's MockBank and OAuthServer are plain Python objects, called in-process.
+OpenBankingServer puts them behind a real HTTP server on localhost, speaking
+the Berlin Group-style JSON the notebook's to_api_response() methods produce:
+
+    POST   /token                                          OAuth 2.0 token endpoint (form encoded)
+    GET    /accounts                                       accounts covered by the consent
+    GET    /accounts/{accountId}/balances
+    GET    /accounts/{accountId}/transactions              dateFrom, dateTo, bookingStatus, pageSize, cursor
+    POST   /payments/sepa-credit-transfers                 JSON body as in NB03's payment demo
+    GET    /payments/sepa-credit-transfers/{paymentId}/status
+    POST   /payments/sepa-credit-transfers/{paymentId}/authorisations
+    GET    /consents/{consentId}
+    DELETE /consents/{consentId}                           revoke the consent
+
+Resource endpoints need "Authorization: Bearer <access token>" and a
+"Consent-ID" header. The token is checked against the OAuthServer: it must
+carry the endpoint's scope ('accounts' or 'payments') and belong to the
+consent's customer, whose accounts are the only ones it can reach. Bank error responses are
+returned with a matching HTTP status (401 for invalid consents, 404 for
+unknown resources, 400 otherwise).
+
+On the client side, OpenBankingClient keeps a pool of keep-alive
+connections, and TokenCache holds the access token and renews it with the
+refresh token shortly before it expires, so the token endpoint is called
+once per hour instead of once per request. load_test() sends requests from
+several threads and reports requests/second and latency percentiles.
+
+Run this file to load-test a server started from the notebook:
+    python open_banking_server.py http://127.0.0.1:8000 --access-token <token> \\
+        --consent-id <consent> --path /accounts --requests 5000 --concurrency 16
+
+Example:
+    from open_banking_server import OpenBankingServer, OpenBankingClient, TokenCache, load_test
+
+    server = OpenBankingServer(demo_bank, oauth_server).start()
+    tokens = TokenCache(server.url, client.client_id, client.client_secret)
+    tokens.exchange_code(code, redirect_uri="https://financeapp.example/callback")
+    api = OpenBankingClient(server.url, tokens)
+    status, accounts = api.get("/accounts")
+    report = load_test(api, ["/accounts", "/accounts/ACC000001/balances"], requests=2000)
+    server.stop()
+"""
+
+import argparse
+import http.client
+import json
+import queue
+import re
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+# HTTP status for the error codes MockBank and OAuthServer return (others: 400)
+ERROR_STATUS = {
+    'CONSENT_INVALID': 401,
+    'CONSENT_EXPIRED': 401,
+    'TOKEN_INVALID': 401,
+    'invalid_client': 401,
+    'CUSTOMER_NOT_FOUND': 404,
+    'ACCOUNT_NOT_FOUND': 404,
+    'RESOURCE_UNKNOWN': 404,
+    'PAYMENT_NOT_FOUND': 404,
+}
+
+# Renew the access token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 60.0
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class OpenBankingServer:
+    """
+    HTTP front end for a MockBank and (optionally) its OAuthServer.
+
+    Without an OAuthServer, Bearer tokens are not checked and /token is not
+    available. Requests are served on one thread per connection.
+    """
+
+    # (method, path pattern, endpoint, OAuth scope the token needs; None = any)
+    ROUTES = [
+        ('POST', r'/token', '_token', None),
+        ('GET', r'/accounts', '_accounts', 'accounts'),
+        ('GET', r'/accounts/(?P<account_id>[^/]+)/balances', '_balances', 'accounts'),
+        ('GET', r'/accounts/(?P<account_id>[^/]+)/transactions', '_transactions', 'accounts'),
+        ('POST', r'/payments/sepa-credit-transfers', '_initiate_payment', 'payments'),
+        ('GET', r'/payments/sepa-credit-transfers/(?P<payment_id>[^/]+)/status', '_payment_status', 'payments'),
+        ('POST', r'/payments/sepa-credit-transfers/(?P<payment_id>[^/]+)/authorisations',
+         '_authorise_payment', 'payments'),
+        ('GET', r'/consents/(?P<consent_id>[^/]+)', '_consent', None),
+        ('DELETE', r'/consents/(?P<consent_id>[^/]+)', '_revoke_consent', None),
+    ]
+
+    def __init__(self, bank, oauth=None, host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            bank: MockBank to serve
+            oauth: OAuthServer issuing and checking access tokens (None = no token checks)
+            host: Interface to listen on
+            port: Port to listen on (0 = any free port; see .url)
+        """
+        self.bank = bank
+        self.oauth = oauth
+        self._routes = [(method, re.compile(pattern + '$'), getattr(self, name), scope)
+                        for method, pattern, name, scope in self.ROUTES]
+        self._httpd = _HTTPServer((host, port), _Handler)
+        self._httpd.api = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'OpenBankingServer':
+        """Serve in a background thread; returns self."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='open-banking-server',
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'OpenBankingServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def handle(self, method: str, path: str, query: Dict[str, str], headers, body: bytes) -> Tuple[int, Any]:
+        """Route one request; returns (HTTP status, JSON-serialisable body or None)."""
+        allowed = False
+        for route_method, pattern, endpoint, scope in self._routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            allowed = True
+            if route_method == method:
+                params = match.groupdict()
+                if endpoint != self._token:
+                    error = self._authorize(headers, scope, params)
+                    if error:
+                        return error
+                return endpoint(query=query, headers=headers, body=body, **params)
+        if allowed:
+            return 405, {"error": "METHOD_NOT_ALLOWED"}
+        return 404, {"error": "RESOURCE_UNKNOWN", "message": f"No endpoint {path}"}
+
+    def _check_token(self, headers):
+        """The request's valid AccessToken, or None if it is missing, unknown or expired."""
+        scheme, _, token = (headers.get('Authorization') or '').partition(' ')
+        token_obj = self.oauth.access_tokens.get(token) if scheme == 'Bearer' else None
+        if token_obj is None or (token_obj.expires_at and token_obj.expires_at < datetime.now()):
+            return None
+        return token_obj
+
+    def _authorize(self, headers, scope: Optional[str], params: Dict[str, str]) -> Optional[Tuple[int, Dict]]:
+        """
+        Error response if the request may not use this endpoint, else None.
+
+        The token must be valid, carry the route's scope and belong to the
+        customer of the consent used: the Consent-ID header, or the consent
+        in the path for /consents/{consentId}. Accounts and payments in the
+        path must belong to that customer too.
+        """
+        consent_id = params.get('consent_id') or headers.get('Consent-ID')
+        consent = self.bank.consents.get(consent_id)
+        if self.oauth is not None:
+            token = self._check_token(headers)
+            if token is None:
+                return 401, {"error": "TOKEN_INVALID", "message": "Missing, unknown or expired access token"}
+            if scope is not None and scope not in token.scope:
+                return 403, {"error": "SCOPE_INVALID", "message": f"Token lacks the '{scope}' scope"}
+            if consent is None or consent.get("customer_id") != token.user_id:
+                return 401, {"error": "CONSENT_INVALID", "message": "Consent does not belong to this token"}
+        if consent is None:
+            return None  # the bank reports the missing consent itself
+
+        owned = set(self.bank.customers.get(consent.get("customer_id"), {}).get("account_ids", []))
+        account_id = params.get('account_id')
+        payment = self.bank.payments.get(params.get('payment_id')) if 'payment_id' in params else None
+        if payment is not None:
+            debtor = self.bank.accounts_by_iban.get(payment.debtor_account)
+            account_id = debtor.account_id if debtor is not None else ''
+        if account_id is not None and account_id in self.bank.accounts and account_id not in owned:
+            return 401, {"error": "CONSENT_INVALID", "message": "Account not covered by this consent"}
+        return None
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    def _token(self, body: bytes, **_) -> Tuple[int, Dict]:
+        if self.oauth is None:
+            return 404, {"error": "RESOURCE_UNKNOWN", "message": "No OAuth server configured"}
+        form = {key: values[-1] for key, values in parse_qs(body.decode()).items()}
+        response = self.oauth.token(
+            grant_type=form.get('grant_type'), code=form.get('code'),
+            client_id=form.get('client_id'), client_secret=form.get('client_secret'),
+            redirect_uri=form.get('redirect_uri'), refresh_token=form.get('refresh_token')
+        )
+        return _with_status(response)
+
+    def _accounts(self, headers, **_) -> Tuple[int, Dict]:
+        consent_id = headers.get('Consent-ID')
+        consent = self.bank.consents.get(consent_id, {})
+        return _with_status(self.bank.get_accounts(consent.get('customer_id'), consent_id))
+
+    def _balances(self, headers, account_id: str, **_) -> Tuple[int, Dict]:
+        return _with_status(self.bank.get_balances(account_id, headers.get('Consent-ID')))
+
+    def _transactions(self, query, headers, account_id: str, **_) -> Tuple[int, Dict]:
+        try:
+            page_size = int(query['pageSize']) if 'pageSize' in query else None
+        except ValueError:
+            page_size = 0
+        if page_size is not None and page_size < 1:
+            return 400, {"error": "FORMAT_ERROR", "message": "pageSize must be a positive integer"}
+        return _with_status(self.bank.get_transactions(
+            account_id, headers.get('Consent-ID'),
+            date_from=query.get('dateFrom'), date_to=query.get('dateTo'),
+            booking_status=query.get('bookingStatus', 'both'),
+            page_size=page_size, cursor=query.get('cursor')
+        ))
+
+    def _initiate_payment(self, headers, body: bytes, **_) -> Tuple[int, Dict]:
+        try:
+            request = json.loads(body)
+            arguments = dict(
+                debtor_iban=request['debtorAccount']['iban'],
+                creditor_iban=request['creditorAccount']['iban'],
+                creditor_name=request['creditorName'],
+                amount=float(request['instructedAmount']['amount']),
+                currency=request['instructedAmount'].get('currency', 'EUR'),
+                remittance_info=request.get('remittanceInformationUnstructured', '')
+            )
+        except (ValueError, KeyError, TypeError) as error:
+            return 400, {"error": "FORMAT_ERROR", "message": f"Invalid payment request: {error}"}
+        consent = self.bank.consents.get(headers.get('Consent-ID'))
+        debtor = self.bank.accounts_by_iban.get(arguments['debtor_iban'])
+        if consent is not None and debtor is not None and debtor.account_id not in \
+                self.bank.customers.get(consent.get("customer_id"), {}).get("account_ids", []):
+            return 401, {"error": "CONSENT_INVALID", "message": "Debtor account not covered by this consent"}
+        status, response = _with_status(self.bank.initiate_payment(headers.get('Consent-ID'), **arguments))
+        return (201 if status == 200 else status), response
+
+    def _payment_status(self, headers, payment_id: str, **_) -> Tuple[int, Dict]:
+        return _with_status(self.bank.get_payment_status(payment_id, headers.get('Consent-ID')))
+
+    def _authorise_payment(self, payment_id: str, **_) -> Tuple[int, Dict]:
+        return _with_status(self.bank.authorize_payment(payment_id))
+
+    def _consent(self, consent_id: str, **_) -> Tuple[int, Dict]:
+        consent = self.bank.consents.get(consent_id)
+        if consent is None:
+            return 404, {"error": "CONSENT_UNKNOWN"}
+        return 200, {
+            "consentId": consent_id,
+            "consentStatus": consent["status"],
+            "validUntil": consent.get("expires"),
+            "scope": consent.get("scope", []),
+        }
+
+    def _revoke_consent(self, consent_id: str, **_) -> Tuple[int, None]:
+        consent = self.bank.consents.get(consent_id)
+        if consent is None:
+            return 404, {"error": "CONSENT_UNKNOWN"}
+        consent["status"] = "revoked"
+        return 204, None
+
+
+def _with_status(response: Dict) -> Tuple[int, Dict]:
+    if "error" in response:
+        return ERROR_STATUS.get(response["error"], 400), response
+    return 200, response
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for a load test's burst of new connections (the default backlog of 5
+    # makes the extra clients retry their connect a second later)
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so clients can reuse connections
+    # Headers and body go out in separate writes: without TCP_NODELAY, each
+    # response on a kept-alive connection waits ~40ms for a delayed ACK
+    disable_nagle_algorithm = True
+    # Close kept-alive connections idle this many seconds (also ends them after stop())
+    timeout = 10
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        try:
+            status, payload = self.server.api.handle(method, url.path, query, self.headers, body)
+        except ConnectionError as error:
+            # MockBank.simulate_network() playing an unreachable bank
+            status, payload = 503, {"error": "SERVICE_UNAVAILABLE", "message": str(error)}
+        except Exception as error:
+            status, payload = 500, {"error": "INTERNAL_ERROR", "message": repr(error)}
+
+        data = b'' if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if self.headers.get('X-Request-ID'):
+            self.send_header('X-Request-ID', self.headers['X-Request-ID'])
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # one line per request would drown a load test
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+
+class TokenCache:
+    """
+    OAuth access token of one client, renewed with its refresh token.
+
+    access_token() returns the cached token until TOKEN_REFRESH_MARGIN seconds
+    before it expires, then swaps the refresh token for a new one (once, even
+    if many threads ask at the same time).
+    """
+
+    def __init__(self, base_url: str, client_id: Optional[str] = None,
+                 client_secret: Optional[str] = None):
+        """
+        Args:
+            base_url: Server URL; tokens come from base_url + "/token"
+            client_id, client_secret: Registered TPP client credentials
+        """
+        self.token_url = base_url.rstrip('/') + '/token'
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.consent_id: Optional[str] = None
+        self.token_requests = 0
+        self._token: Optional[Dict] = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def exchange_code(self, code: str, redirect_uri: str) -> Dict:
+        """Swap an authorization code for the first tokens (step 3 of the OAuth flow)."""
+        return self._request(grant_type='authorization_code', code=code, client_id=self.client_id,
+                             client_secret=self.client_secret, redirect_uri=redirect_uri)
+
+    def set_token(self, token_response: Dict) -> None:
+        """Use a token response obtained elsewhere (e.g. a direct OAuthServer.token() call)."""
+        with self._lock:
+            self._store(token_response)
+
+    def access_token(self) -> str:
+        with self._lock:
+            if self._token is None:
+                raise RuntimeError("No token yet: call exchange_code() or set_token() first")
+            if time.monotonic() >= self._expires - TOKEN_REFRESH_MARGIN and self._token.get('refresh_token'):
+                self._request(grant_type='refresh_token', refresh_token=self._token['refresh_token'],
+                              locked=True)
+            return self._token['access_token']
+
+    def _request(self, locked: bool = False, **form) -> Dict:
+        data = urlencode({key: value for key, value in form.items() if value is not None}).encode()
+        request = urllib.request.Request(self.token_url, data=data, method='POST', headers={
+            'Content-Type': 'application/x-www-form-urlencoded'})
+        try:
+            with urllib.request.urlopen(request) as reply:
+                response = json.load(reply)
+        except urllib.error.HTTPError as error:
+            response = json.load(error)
+            raise RuntimeError(f"Token request failed: {response.get('error')}") from None
+        self.token_requests += 1
+        if locked:
+            self._store(response)
+        else:
+            with self._lock:
+                self._store(response)
+        return response
+
+    def _store(self, response: Dict) -> None:
+        self._token = response
+        self._expires = time.monotonic() + float(response.get('expires_in', 3600))
+        # Only the authorization-code response names the consent; refreshes keep it
+        self.consent_id = response.get('consent_id', self.consent_id)
+
+
+class OpenBankingClient:
+    """
+    JSON client for OpenBankingServer with pooled keep-alive connections.
+
+    Up to pool_size idle connections are kept for reuse; a request made while
+    all of them are busy opens another one. Connections idle longer than
+    max_idle are closed rather than reused, as the server may be closing them
+    too. Safe to share between threads.
+    """
+
+    def __init__(self, base_url: str, tokens: Optional[TokenCache] = None,
+                 consent_id: Optional[str] = None, pool_size: int = 8, timeout: float = 10.0,
+                 max_idle: float = 5.0):
+        """
+        Args:
+            base_url: Server URL, e.g. OpenBankingServer.url
+            tokens: TokenCache supplying the Bearer token (None = no Authorization header)
+            consent_id: Consent-ID header (default: the consent of the token's code exchange)
+            pool_size: Idle connections kept open
+            timeout: Socket timeout in seconds
+            max_idle: Seconds a pooled connection may sit unused and still be reused
+                (keep it below the server's idle timeout of 10 seconds)
+        """
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.tokens = tokens
+        self.consent_id = consent_id
+        self.timeout = timeout
+        self.max_idle = max_idle
+        # (connection, time it was last released)
+        self._pool: 'queue.LifoQueue[Tuple[http.client.HTTPConnection, float]]' = queue.LifoQueue(pool_size)
+
+    # Methods safe to resend when a pooled connection fails mid-request; a
+    # repeated POST could initiate the same payment twice
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+
+    def get(self, path: str) -> Tuple[int, Any]:
+        return self.request('GET', path)
+
+    def post(self, path: str, body: Optional[Dict] = None) -> Tuple[int, Any]:
+        return self.request('POST', path, body)
+
+    def delete(self, path: str) -> Tuple[int, Any]:
+        return self.request('DELETE', path)
+
+    def request(self, method: str, path: str, body: Optional[Dict] = None) -> Tuple[int, Any]:
+        """Send one request; returns (HTTP status, decoded JSON body or None)."""
+        headers = {'X-Request-ID': str(uuid.uuid4())}
+        if self.tokens is not None:
+            headers['Authorization'] = f"Bearer {self.tokens.access_token()}"
+        consent_id = self.consent_id or (self.tokens.consent_id if self.tokens else None)
+        if consent_id:
+            headers['Consent-ID'] = consent_id
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+
+        for attempt in range(2):
+            connection = self._acquire() if attempt == 0 else self._connect()
+            try:
+                connection.request(method, path, body=data, headers=headers)
+                reply = connection.getresponse()
+                payload = reply.read()
+            except (ConnectionError, http.client.HTTPException):
+                # The server may have closed an idle keep-alive connection: retry once
+                # on a fresh one, unless the server might already have acted on it
+                connection.close()
+                if attempt or method not in self.IDEMPOTENT_METHODS:
+                    raise
+                continue
+            self._release(connection)
+            if reply.getheader('Content-Type', '').startswith('application/json') and payload:
+                return reply.status, json.loads(payload)
+            return reply.status, (payload.decode(errors='replace') or None)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait()[0].close()
+            except queue.Empty:
+                return
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        while True:
+            try:
+                connection, idle_since = self._pool.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - idle_since <= self.max_idle:
+                return connection
+            connection.close()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait((connection, time.monotonic()))
+        except queue.Full:
+            connection.close()
+
+
+# =============================================================================
+# LOAD TEST
+# =============================================================================
+
+def load_test(client: OpenBankingClient, paths: Sequence[str], requests: int = 1000,
+              concurrency: int = 8) -> Dict[str, Any]:
+    """
+    GET paths in turn, `requests` times in total, from `concurrency` threads.
+
+    Returns:
+        Dict with 'requests', 'errors' (non-2xx or failed), 'concurrency',
+        'seconds', 'requests_per_second', 'latency_ms' (p50, p90, p99, max),
+        'status_counts' and 'token_requests' (calls the token cache made)
+    """
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    statuses: List[Dict[Any, int]] = [{} for _ in range(concurrency)]
+    token_requests = client.tokens.token_requests if client.tokens else 0
+
+    def worker(k: int) -> None:
+        for i in range(k, requests, concurrency):
+            start = time.perf_counter()
+            try:
+                status, _ = client.get(paths[i % len(paths)])
+            except OSError as error:
+                status = type(error).__name__
+            latencies[k].append(time.perf_counter() - start)
+            statuses[k][status] = statuses[k].get(status, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    all_latencies = sorted(latency * 1000 for per_worker in latencies for latency in per_worker)
+    status_counts: Dict[Any, int] = {}
+    for per_worker in statuses:
+        for status, count in per_worker.items():
+            status_counts[status] = status_counts.get(status, 0) + count
+    cuts = statistics.quantiles(all_latencies, n=100) if len(all_latencies) > 1 else all_latencies * 99
+    return {
+        'requests': requests,
+        'errors': sum(count for status, count in status_counts.items()
+                      if not (isinstance(status, int) and 200 <= status < 300)),
+        'concurrency': concurrency,
+        'seconds': seconds,
+        'requests_per_second': requests / seconds if seconds else float('inf'),
+        'latency_ms': {'p50': cuts[49], 'p90': cuts[89], 'p99': cuts[98],
+                       'max': all_latencies[-1] if all_latencies else 0.0},
+        'status_counts': status_counts,
+        'token_requests': (client.tokens.token_requests if client.tokens else 0) - token_requests,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    latency = report['latency_ms']
+    print(f"{report['requests']:,} requests from {report['concurrency']} threads "
+          f"in {report['seconds']:.2f}s: {report['requests_per_second']:,.0f} requests/s")
+    print(f"Latency (ms): p50 {latency['p50']:.2f}  p90 {latency['p90']:.2f}  "
+          f"p99 {latency['p99']:.2f}  max {latency['max']:.2f}")
+    print(f"Errors: {report['errors']:,}   status codes: {report['status_counts']}   "
+          f"token requests: {report['token_requests']}")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load-test an OpenBankingServer started from NB03'
+    )
+    parser.add_argument('url', help='Server URL, e.g. http://127.0.0.1:8000')
+    parser.add_argument('--access-token', help='Bearer token (from the notebook\'s token response)')
+    parser.add_argument('--refresh-token', help='Refresh token, to renew the access token when it expires')
+    parser.add_argument('--client-id', help='TPP client id (needed with --refresh-token)')
+    parser.add_argument('--client-secret', help='TPP client secret (needed with --refresh-token)')
+    parser.add_argument('--consent-id', help='Consent-ID header')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help='Path to GET (repeat for several; default: /accounts)')
+    parser.add_argument('--requests', type=int, default=2000, help='Total requests (default: 2000)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads (default: 8)')
+    args = parser.parse_args()
+
+    tokens = None
+    if args.access_token or args.refresh_token:
+        tokens = TokenCache(args.url, args.client_id, args.client_secret)
+        tokens.set_token({'access_token': args.access_token or '', 'refresh_token': args.refresh_token,
+                          'expires_in': 3600 if args.access_token else 0, 'consent_id': args.consent_id})
+    client = OpenBankingClient(args.url, tokens, consent_id=args.consent_id, pool_size=args.concurrency)
+    print_report(load_test(client, args.paths or ['/accounts'], args.requests, args.concurrency))
+    client.close()
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
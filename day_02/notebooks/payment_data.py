@@ -0,0 +1,333 @@
+"""
+Vectorised synthetic payment data for NB02: Payment Transaction Analysis.
+
+NB02's generate_payment_data builds one dict per transaction in a Python
+loop. This module draws the same columns (sender, receiver other than the
+sender, lognormal amount, payment method, fee, settlement time, status) for
+a whole chunk of transactions at once with NumPy. Chunks can be streamed to
+Parquet, Arrow or CSV, so datasets of 100 million rows are generated with
+memory bounded by the chunk size.
+
+Rows come out in timestamp order without a global sort: timestamps are the
+sorted order statistics of the notebook's distribution (a uniform day in the
+period plus 8-18 hours), generated chunk by chunk.
+
+Example:
+    from payment_data import generate_payment_data, write_payment_data
+
+    payments_df = generate_payment_data(n_transactions=1_000_000, n_parties=5_000)
+    write_payment_data('payments.parquet', n_transactions=100_000_000, n_parties=1_000_000)
+
+Command line:
+    python payment_data.py payments.parquet --rows 100000000 --parties 1000000
+"""
+
+import argparse
+import gzip
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+# Same payment methods, weights and statuses as NB02's generate_payment_data
+PAYMENT_METHODS = {
+    'Wire Transfer': {'fee_pct': 0.005, 'fee_fixed': 25.0, 'settlement_days': (1, 3)},
+    'ACH': {'fee_pct': 0.001, 'fee_fixed': 0.5, 'settlement_days': (1, 3)},
+    'Credit Card': {'fee_pct': 0.025, 'fee_fixed': 0.30, 'settlement_days': (0, 1)},
+    'Debit Card': {'fee_pct': 0.015, 'fee_fixed': 0.25, 'settlement_days': (0, 1)},
+    'Digital Wallet': {'fee_pct': 0.029, 'fee_fixed': 0.30, 'settlement_days': (0, 0)},
+    'Cryptocurrency': {'fee_pct': 0.01, 'fee_fixed': 2.0, 'settlement_days': (0, 1)}
+}
+METHOD_WEIGHTS = [0.1, 0.25, 0.25, 0.2, 0.15, 0.05]
+
+STATUSES = ['Completed', 'Pending', 'Failed']
+STATUS_WEIGHTS = [0.92, 0.05, 0.03]
+
+# Business hours added to each random day, as in the notebook
+BUSINESS_HOURS = (8, 18)
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Timestamps are generated in blocks of this many rows, whatever the chunk size
+SORTED_BLOCK = 65536
+
+BUSINESS_TYPES = ['Corp', 'LLC', 'Inc', 'Ltd', 'GmbH']
+FIRST_NAMES = ['Alpha', 'Beta', 'Gamma', 'Delta', 'Epsilon', 'Zeta', 'Eta', 'Theta', 'Iota', 'Kappa']
+INDUSTRIES = ['Tech', 'Finance', 'Retail', 'Health', 'Energy', 'Media', 'Food', 'Auto', 'Travel', 'Education']
+
+
+def make_parties(n_parties: int, rng: np.random.Generator) -> List[str]:
+    """
+    Party names: 70% businesses, 30% individuals, like the notebook.
+
+    Repeated business names get a number, so every party is distinct.
+    """
+    n_businesses = -(-n_parties * 7 // 10)
+    names = (np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), n_businesses)] + ' '
+             + np.array(INDUSTRIES, dtype=object)[rng.integers(0, len(INDUSTRIES), n_businesses)] + ' '
+             + np.array(BUSINESS_TYPES, dtype=object)[rng.integers(0, len(BUSINESS_TYPES), n_businesses)])
+
+    # The k-th occurrence of a name (k > 1) becomes "<name> k"
+    names = pd.Series(names)
+    count = names.groupby(names, sort=False).cumcount() + 1
+    repeated = count.to_numpy() > 1
+    names[repeated] = names[repeated] + ' ' + count[repeated].astype(str)
+
+    width = max(3, len(str(n_parties)))
+    return names.tolist() + [f"Individual_{i + 1:0{width}d}" for i in range(n_businesses, n_parties)]
+
+
+def _sorted_uniforms(n: int, chunk_size: int, rng: np.random.Generator) -> Iterator[np.ndarray]:
+    """
+    The n order statistics of Uniform(0, 1), ascending, chunk by chunk.
+
+    Uses the descending-maximum recurrence M_n = V^(1/n), M_k = M_(k+1) V^(1/k)
+    on 1 - U, in log space, so no chunk needs the others. Values are computed
+    in fixed blocks of SORTED_BLOCK and regrouped, so they do not depend on
+    chunk_size.
+    """
+    log_max = 0.0
+    pending = np.empty(0)
+    for start in range(0, n, SORTED_BLOCK):
+        k = np.arange(n - start, max(n - start - SORTED_BLOCK, 0), -1, dtype=np.float64)
+        logs = log_max + np.cumsum(np.log(rng.random(len(k))) / k)
+        log_max = logs[-1]
+        pending = np.concatenate([pending, -np.expm1(logs)])
+        while len(pending) >= chunk_size:
+            yield pending[:chunk_size]
+            pending = pending[chunk_size:]
+    if len(pending):
+        yield pending
+
+
+def _offsets_from_uniforms(u: np.ndarray, days: float) -> np.ndarray:
+    """
+    Seconds after start_date for quantiles u of Uniform(0, days) + Uniform(8h, 18h).
+
+    The sum of two uniforms has a trapezoidal density; this is its inverse CDF.
+    """
+    a, b = days * 86400.0, (BUSINESS_HOURS[1] - BUSINESS_HOURS[0]) * 3600.0
+    long, short = max(a, b), min(a, b)
+    ramp = short / (2 * long)
+    z = np.where(u < ramp, np.sqrt(2 * long * short * u), u * long + short / 2)
+    z = np.where(u > 1 - ramp, long + short - np.sqrt(2 * long * short * (1 - u)), z)
+    return z + BUSINESS_HOURS[0] * 3600.0
+
+
+def _transaction_ids(start: int, count: int, width: int) -> np.ndarray:
+    """'TXN000001'-style ids built digit by digit, without a Python loop."""
+    ids = np.arange(start + 1, start + count + 1, dtype=np.int64)
+    digits = (ids[:, None] // 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)) % 10 + ord('0')
+    chars = np.empty((count, width + 3), dtype=np.uint8)
+    chars[:, :3] = np.frombuffer(b'TXN', dtype=np.uint8)
+    chars[:, 3:] = digits
+    return chars.view(f'S{width + 3}').ravel().astype(f'U{width + 3}')
+
+
+def generate_payment_chunks(n_transactions: int = 5000, n_parties: int = 50, start_date: str = '2024-01-01',
+                            days: float = 90, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            seed: int = 42) -> Iterator[pd.DataFrame]:
+    """
+    Synthetic payment transactions in timestamp order, chunk_size rows at a time.
+
+    Args:
+        n_transactions: Total number of transactions
+        n_parties: Number of unique parties (senders/receivers)
+        start_date: Start date for transactions
+        days: Number of days to span
+        chunk_size: Rows per yielded DataFrame
+        seed: Random seed (the same seed gives the same rows for any chunk_size)
+
+    Yields:
+        DataFrames with the columns of NB02's generate_payment_data; sender,
+        receiver, payment_method and status are categoricals
+    """
+    if n_parties < 2:
+        raise ValueError("Need at least 2 parties")
+
+    # One stream per column, so the data does not depend on chunk_size
+    (party_rng, time_rng, sender_rng, receiver_rng, method_rng, amount_rng,
+     settlement_rng, status_rng) = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(8)]
+    # Dtypes built once: from_codes would otherwise re-check a million categories per chunk
+    parties = pd.CategoricalDtype(make_parties(n_parties, party_rng))
+    methods = pd.CategoricalDtype(list(PAYMENT_METHODS))
+    statuses = pd.CategoricalDtype(STATUSES)
+    fee_pct = np.array([m['fee_pct'] for m in PAYMENT_METHODS.values()])
+    fee_fixed = np.array([m['fee_fixed'] for m in PAYMENT_METHODS.values()])
+    settle_min = np.array([m['settlement_days'][0] for m in PAYMENT_METHODS.values()], dtype=np.float64)
+    settle_span = np.array([m['settlement_days'][1] for m in PAYMENT_METHODS.values()]) - settle_min
+    method_cdf = np.cumsum(METHOD_WEIGHTS) / np.sum(METHOD_WEIGHTS)
+    status_cdf = np.cumsum(STATUS_WEIGHTS) / np.sum(STATUS_WEIGHTS)
+
+    base = np.datetime64(pd.Timestamp(start_date), 'ms')
+    width = max(6, len(str(n_transactions)))
+    start = 0
+    for u in _sorted_uniforms(n_transactions, chunk_size, time_rng):
+        count = len(u)
+        timestamp = base + (_offsets_from_uniforms(u, days) * 1000).astype('timedelta64[ms]')
+
+        # A uniformly chosen party other than the sender
+        sender = sender_rng.integers(0, n_parties, count)
+        receiver = (sender + receiver_rng.integers(1, n_parties, count)) % n_parties
+
+        method = np.searchsorted(method_cdf, method_rng.random(count), side='right').clip(max=len(PAYMENT_METHODS) - 1)
+        amount = np.clip(amount_rng.lognormal(mean=6, sigma=1.5, size=count), 10, 100000)
+        fee = amount * fee_pct[method] + fee_fixed[method]
+        settlement_days = settle_min[method] + settlement_rng.random(count) * settle_span[method]
+        status = np.searchsorted(status_cdf, status_rng.random(count), side='right').clip(max=len(STATUSES) - 1)
+
+        yield pd.DataFrame({
+            'transaction_id': _transaction_ids(start, count, width),
+            'timestamp': timestamp,
+            'sender': pd.Categorical.from_codes(sender, dtype=parties),
+            'receiver': pd.Categorical.from_codes(receiver, dtype=parties),
+            'amount': amount.round(2),
+            'fee': fee.round(2),
+            'payment_method': pd.Categorical.from_codes(method, dtype=methods),
+            'settlement_date': timestamp + (settlement_days * 86400000).astype('timedelta64[ms]'),
+            'settlement_hours': (settlement_days * 24).round(1),
+            'status': pd.Categorical.from_codes(status, dtype=statuses),
+        }, index=pd.RangeIndex(start, start + count))
+        start += count
+
+
+def generate_payment_data(n_transactions: int = 5000, n_parties: int = 50, start_date: str = '2024-01-01',
+                          days: float = 90, seed: int = 42) -> pd.DataFrame:
+    """
+    Vectorised drop-in for NB02's generate_payment_data (one in-memory DataFrame).
+
+    Returns:
+        DataFrame with payment transactions, sorted by timestamp
+    """
+    return pd.concat(generate_payment_chunks(n_transactions, n_parties, start_date, days, seed=seed))
+
+
+def _to_arrow(df: pd.DataFrame, dictionaries: dict):
+    """
+    Convert a chunk to an Arrow table, reusing the Arrow categories of earlier chunks.
+
+    With a million parties, converting the sender/receiver categories again
+    for every chunk would cost more than generating the chunk. Categoricals
+    with more categories than rows are written as plain strings: Parquet
+    would otherwise store the whole dictionary in every row group.
+    """
+    columns = {}
+    for name, column in df.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            if name not in dictionaries:
+                dictionaries[name] = pa.array(column.cat.categories.astype(str))
+            codes = pa.array(column.cat.codes.to_numpy())
+            if len(dictionaries[name]) > len(df):
+                columns[name] = dictionaries[name].take(codes)
+            else:
+                columns[name] = pa.DictionaryArray.from_arrays(codes, dictionaries[name])
+        else:
+            columns[name] = pa.array(column.to_numpy())
+    return pa.table(columns)
+
+
+# File extension -> format; anything else is CSV
+FILE_FORMATS = {'.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow'}
+
+
+def file_format_from_path(path) -> str:
+    """'parquet', 'arrow' or 'csv', from the last extension of path ignoring a trailing .gz."""
+    suffixes = Path(path).suffixes
+    if suffixes and suffixes[-1] == '.gz':
+        suffixes = suffixes[:-1]
+    return FILE_FORMATS.get(suffixes[-1] if suffixes else '', 'csv')
+
+
+def write_payment_data(path, n_transactions: int, n_parties: int = 1000, start_date: str = '2024-01-01',
+                       days: float = 90, chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int = 42,
+                       file_format: Optional[str] = None) -> int:
+    """
+    Stream synthetic payments to a file, one chunk at a time.
+
+    Args:
+        path: Output file
+        file_format: 'parquet', 'arrow' or 'csv' (default: from the file extension;
+            .parquet, .arrow/.feather, .csv/.csv.gz)
+
+    Returns:
+        Number of rows written
+    """
+    path = Path(path)
+    if file_format is None:
+        file_format = file_format_from_path(path)
+    if file_format in ('parquet', 'arrow') and pa is None:
+        raise ImportError(f"Writing {file_format} needs pyarrow (pip install pyarrow); use a .csv path instead")
+
+    chunks = generate_payment_chunks(n_transactions, n_parties, start_date, days, chunk_size, seed)
+    rows = 0
+    if file_format == 'csv' and pa is None:
+        # pandas fallback: appending to .csv.gz adds gzip members, which readers concatenate
+        for df in chunks:
+            df.to_csv(path, mode='w' if rows == 0 else 'a', header=rows == 0, index=False)
+            rows += len(df)
+        return rows
+
+    sink = writer = None
+    dictionaries = {}
+    try:
+        for df in chunks:
+            table = _to_arrow(df, dictionaries)
+            if writer is None:
+                if file_format == 'parquet':
+                    writer = pq.ParquetWriter(path, table.schema)
+                elif file_format == 'arrow':
+                    writer = pa.ipc.new_file(path, table.schema)
+                else:
+                    # Much faster than DataFrame.to_csv
+                    sink = gzip.open(path, 'wb', compresslevel=6) if path.suffix == '.gz' else open(path, 'wb')
+                    writer = pa.csv.CSVWriter(sink, table.schema)
+            writer.write_table(table)
+            rows += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+        if sink is not None:
+            sink.close()
+    return rows
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate synthetic payment transactions to Parquet, Arrow or CSV'
+    )
+    parser.add_argument('output', type=Path, help='Output file (.parquet, .arrow, .feather, .csv, .csv.gz)')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Number of transactions (default: 1,000,000)')
+    parser.add_argument('--parties', type=int, default=1000, help='Number of parties (default: 1000)')
+    parser.add_argument('--start-date', default='2024-01-01', help='First day (default: 2024-01-01)')
+    parser.add_argument('--days', type=float, default=90, help='Days covered (default: 90)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Rows per chunk, bounds memory use (default: {DEFAULT_CHUNK_SIZE:,})')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = write_payment_data(args.output, args.rows, args.parties, args.start_date, args.days,
+                              args.chunk_size, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {rows:,} transactions to {args.output} "
+          f"({args.output.stat().st_size / 1e6:,.1f} MB) in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,562 @@
+"""
+Sparse payment-network analytics for NB02: Payment Transaction Analysis.
+
+NB02 builds its payment network as a NetworkX DiGraph, one edge at a time,
+and computes centralities in pure Python. That is fine for 50 parties but
+not for a million. PaymentNetwork keeps the network as two SciPy CSR
+matrices (transaction counts and amounts, sender rows x receiver columns)
+built straight from the transaction columns, and computes the notebook's
+metrics with sparse linear algebra:
+
+- weighted in/out degree (transactions and value) and net flow
+- degree centrality and PageRank (power iteration, same results as nx.pagerank)
+- betweenness centrality, exact or estimated from a sample of source parties
+  (Brandes' algorithm, one breadth-first search level at a time)
+- communities of parties that mostly pay each other (Louvain method) and
+  their modularity
+
+NetworkX is only needed to draw a (small) part of the network.
+
+Example:
+    from payment_network import PaymentNetwork
+
+    network = PaymentNetwork.from_transactions(completed_df, min_transactions=3)
+    node_metrics = network.node_metrics()
+    centrality_df = network.centrality(betweenness_samples=256)
+    community, modularity = network.communities(seed=42)
+    G = network.to_networkx(node_metrics.nlargest(20, 'total_activity')['party'])
+
+Command line:
+    python payment_network.py --rows 10000000 --parties 1000000
+    python payment_network.py --rows 2000000 --parties 200000 --planted-communities 200
+"""
+
+import argparse
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+
+# Louvain sweeps of party moves per level: at most LOUVAIN_MAX_SWEEPS, stopping
+# after LOUVAIN_PATIENCE sweeps that raise modularity by less than LOUVAIN_MIN_GAIN
+LOUVAIN_MAX_SWEEPS = 64
+LOUVAIN_PATIENCE = 3
+LOUVAIN_MIN_GAIN = 1e-5
+
+
+class PaymentNetwork:
+    """
+    Directed payment network stored as sparse sender x receiver matrices.
+
+    Attributes:
+        parties: Party name of each node
+        counts: CSR matrix of transaction counts, counts[sender, receiver]
+        amounts: CSR matrix of total amounts, with the same sparsity pattern
+    """
+
+    def __init__(self, parties: np.ndarray, counts: sparse.csr_matrix, amounts: sparse.csr_matrix):
+        self.parties = np.asarray(parties)
+        self.counts = counts
+        self.amounts = amounts
+        self._index = None
+
+    @classmethod
+    def from_transactions(cls, df: pd.DataFrame, min_transactions: int = 1, sender: str = 'sender',
+                          receiver: str = 'receiver', amount: str = 'amount') -> 'PaymentNetwork':
+        """
+        Aggregate transactions by sender-receiver pair into a network.
+
+        Same edges as NB02's build_payment_network: pairs with fewer than
+        min_transactions transactions are dropped, and so are parties left
+        without any edge.
+
+        Args:
+            df: DataFrame with sender, receiver and amount columns
+            min_transactions: Minimum transactions to include an edge
+        """
+        senders, receivers = df[sender], df[receiver]
+        if (isinstance(senders.dtype, pd.CategoricalDtype)
+                and senders.cat.categories.equals(getattr(receivers.dtype, 'categories', None))):
+            # Categorical columns (e.g. from payment_data) already number the parties
+            parties = senders.cat.categories
+            senders, receivers = senders.cat.codes.to_numpy(), receivers.cat.codes.to_numpy()
+        else:
+            codes, parties = pd.factorize(pd.concat([senders, receivers], ignore_index=True), sort=True)
+            senders, receivers = codes[:len(df)], codes[len(df):]
+        n = len(parties)
+
+        # Building a CSR matrix sums the duplicate (sender, receiver) entries.
+        # Count and amount travel together as one complex number, so the
+        # (slow) conversion runs once and both share one sparsity pattern.
+        pairs = sparse.csr_matrix((1.0 + 1j * df[amount].to_numpy(dtype=np.float64), (senders, receivers)),
+                                  shape=(n, n))
+        counts, amounts = pairs.data.real, pairs.data.imag
+
+        keep = counts >= min_transactions
+        senders = np.repeat(np.arange(n), np.diff(pairs.indptr))[keep]
+        receivers = pairs.indices[keep]
+
+        # Keep only parties with at least one remaining edge
+        active = np.zeros(n, dtype=bool)
+        active[senders] = True
+        active[receivers] = True
+        node = np.cumsum(active) - 1
+        n = int(active.sum())
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(node[senders], minlength=n))])
+        return cls(np.asarray(parties)[active],
+                   sparse.csr_matrix((counts[keep], node[receivers], indptr), shape=(n, n)),
+                   sparse.csr_matrix((amounts[keep], node[receivers], indptr), shape=(n, n)))
+
+    def number_of_nodes(self) -> int:
+        return len(self.parties)
+
+    def number_of_edges(self) -> int:
+        return self.counts.nnz
+
+    def density(self) -> float:
+        """Edges as a fraction of all possible directed edges, like nx.density."""
+        n = self.number_of_nodes()
+        return self.number_of_edges() / (n * (n - 1)) if n > 1 else 0.0
+
+    def index_of(self, parties: Iterable[str]) -> np.ndarray:
+        """Node index of each party name (KeyError for unknown parties)."""
+        if self._index is None:
+            self._index = pd.Index(self.parties)
+        parties = list(parties)
+        indexer = self._index.get_indexer(parties)
+        if (indexer < 0).any():
+            raise KeyError(f"Unknown party: {parties[int(np.argmax(indexer < 0))]}")
+        return indexer
+
+    def edges(self) -> pd.DataFrame:
+        """The edge list, with the columns of NB02's edge_data."""
+        coo = self.counts.tocoo()
+        return pd.DataFrame({
+            'sender': self.parties[coo.row],
+            'receiver': self.parties[coo.col],
+            'transaction_count': coo.data.astype(np.int64),
+            'total_amount': self.amounts.data,
+        })
+
+    def degree(self) -> np.ndarray:
+        """Number of distinct counterparties (in + out edges) of each party."""
+        return np.diff(self.counts.indptr) + np.bincount(self.counts.indices,
+                                                         minlength=self.number_of_nodes())
+
+    def node_metrics(self) -> pd.DataFrame:
+        """
+        Weighted degrees and net flow of every party.
+
+        Returns:
+            DataFrame with columns party, incoming_txns, outgoing_txns,
+            incoming_value, outgoing_value, net_flow, total_activity
+        """
+        incoming_txns = np.asarray(self.counts.sum(axis=0)).ravel().astype(np.int64)
+        outgoing_txns = np.asarray(self.counts.sum(axis=1)).ravel().astype(np.int64)
+        incoming_value = np.asarray(self.amounts.sum(axis=0)).ravel()
+        outgoing_value = np.asarray(self.amounts.sum(axis=1)).ravel()
+        return pd.DataFrame({
+            'party': self.parties,
+            'incoming_txns': incoming_txns,
+            'outgoing_txns': outgoing_txns,
+            'incoming_value': incoming_value,
+            'outgoing_value': outgoing_value,
+            'net_flow': incoming_value - outgoing_value,
+            'total_activity': incoming_txns + outgoing_txns,
+        })
+
+    def degree_centrality(self) -> np.ndarray:
+        """Degree divided by the maximum possible degree, like nx.degree_centrality."""
+        n = self.number_of_nodes()
+        return self.degree() / (n - 1) if n > 1 else np.ones(n)
+
+    def pagerank(self, alpha: float = 0.85, weight: Optional[str] = 'count', tol: float = 1e-6,
+                 max_iter: int = 100) -> np.ndarray:
+        """
+        PageRank by sparse power iteration, matching nx.pagerank(G).
+
+        Args:
+            alpha: Damping factor
+            weight: 'count' (transactions, nx's default 'weight'), 'amount' or None
+            tol: Convergence tolerance (per node, as in NetworkX)
+            max_iter: Maximum number of iterations
+
+        Returns:
+            PageRank of each party (sums to 1)
+        """
+        n = self.number_of_nodes()
+        if n == 0:
+            return np.empty(0)
+        matrix = {'count': self.counts, 'amount': self.amounts, None: self.counts.astype(bool)}[weight]
+        matrix = matrix.astype(np.float64)
+        out_weight = np.asarray(matrix.sum(axis=1)).ravel()
+        dangling = out_weight == 0
+        # Row-normalise: each party splits its rank over its recipients by weight
+        transition = sparse.diags(np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)) @ matrix
+        transition_t = transition.T.tocsr()
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            previous = rank
+            # Dangling parties (no payments out) spread their rank over everyone
+            rank = alpha * (transition_t @ previous + previous[dangling].sum() / n) + (1 - alpha) / n
+            if np.abs(rank - previous).sum() < n * tol:
+                return rank
+        raise RuntimeError(f"PageRank did not converge in {max_iter} iterations")
+
+    def betweenness_centrality(self, samples: Optional[int] = None, seed: int = 0,
+                               normalized: bool = True) -> np.ndarray:
+        """
+        Betweenness centrality (unweighted shortest paths), like nx.betweenness_centrality.
+
+        Brandes' algorithm: a breadth-first search from each source party
+        counts shortest paths, then dependencies flow back level by level.
+        Every level is handled as arrays of edges, so a search costs a few
+        NumPy calls per level instead of a Python step per edge.
+
+        Args:
+            samples: Number of randomly chosen source parties (None = all, exact).
+                The estimate is scaled up by n / samples, as NetworkX does with k.
+            seed: Random seed for choosing the sources
+            normalized: Divide by (n-1)(n-2), the number of ordered pairs of other parties
+
+        Returns:
+            Betweenness of each party
+        """
+        n = self.number_of_nodes()
+        if samples is None or samples >= n:
+            sources = np.arange(n)
+        else:
+            sources = np.random.default_rng(seed).choice(n, samples, replace=False)
+
+        betweenness = np.zeros(n)
+        # Per-search scratch arrays, reset after each search
+        sigma, delta, seen = np.zeros(n), np.zeros(n), np.zeros(n, dtype=bool)
+        for source in sources:
+            self._add_dependencies(source, betweenness, sigma, delta, seen)
+
+        if n > 2:
+            scale = 1.0 / ((n - 1) * (n - 2)) if normalized else 1.0
+            betweenness *= scale * n / len(sources)
+        return betweenness
+
+    def _add_dependencies(self, source: int, betweenness: np.ndarray, sigma: np.ndarray,
+                          delta: np.ndarray, seen: np.ndarray) -> None:
+        """Add the Brandes dependencies of one breadth-first search to betweenness."""
+        indptr, indices = self.counts.indptr, self.counts.indices
+        frontier = np.array([source])
+        sigma[source], seen[source] = 1.0, True
+        visited = [frontier]
+        levels = []  # (predecessor, successor) shortest-path edges out of each level
+
+        while True:
+            starts = indptr[frontier]
+            lengths = indptr[frontier + 1] - starts
+            edges = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            predecessors, successors = np.repeat(frontier, lengths), indices[edges]
+            new = ~seen[successors]
+            predecessors, successors = predecessors[new], successors[new]
+            if not len(successors):
+                break
+            paths = np.bincount(successors, weights=sigma[predecessors], minlength=len(sigma))
+            frontier = np.flatnonzero(paths)
+            seen[frontier] = True
+            sigma[frontier] = paths[frontier]
+            visited.append(frontier)
+            levels.append((predecessors, successors))
+
+        for predecessors, successors in reversed(levels):
+            share = sigma[predecessors] / sigma[successors] * (1.0 + delta[successors])
+            # Predecessors come out of the search grouped, so sum each group's share
+            groups = np.flatnonzero(np.diff(predecessors, prepend=-1))
+            delta[predecessors[groups]] += np.add.reduceat(share, groups)
+
+        visited = np.concatenate(visited)
+        betweenness[visited[1:]] += delta[visited[1:]]
+        sigma[visited], delta[visited], seen[visited] = 0.0, 0.0, False
+
+    def centrality(self, betweenness_samples: Optional[int] = None, seed: int = 0) -> pd.DataFrame:
+        """
+        The centrality table of NB02.
+
+        Args:
+            betweenness_samples: Source parties sampled for betweenness (None = exact)
+            seed: Random seed for the sample
+
+        Returns:
+            DataFrame with columns party, degree_centrality,
+            betweenness_centrality, pagerank
+        """
+        return pd.DataFrame({
+            'party': self.parties,
+            'degree_centrality': self.degree_centrality(),
+            'betweenness_centrality': self.betweenness_centrality(betweenness_samples, seed),
+            'pagerank': self.pagerank(),
+        })
+
+    def undirected(self, weight: Optional[str] = 'count') -> sparse.csr_matrix:
+        """
+        Symmetric adjacency matrix: weight of payments in both directions between two parties.
+
+        Args:
+            weight: 'count' (transactions), 'amount' or None (1 per direction)
+        """
+        matrix = {'count': self.counts, 'amount': self.amounts, None: self.counts.astype(bool)}[weight]
+        matrix = matrix.astype(np.float64)
+        return (matrix + matrix.T).tocsr()
+
+    def modularity(self, labels: np.ndarray, weight: Optional[str] = 'count',
+                   resolution: float = 1.0) -> float:
+        """Modularity of a community assignment, like nx.community.modularity on the undirected graph."""
+        return _modularity(self.undirected(weight), np.asarray(labels), resolution)
+
+    def communities(self, weight: Optional[str] = 'count', resolution: float = 1.0,
+                    seed: int = 0) -> tuple:
+        """
+        Communities of parties that mostly pay each other (Louvain method).
+
+        Louvain alternates two phases until modularity stops improving:
+        parties move to the neighbouring community that raises modularity
+        most, then each community is merged into a single node. Both phases
+        are sparse-matrix operations over all parties at once; in each sweep
+        a random half of the parties may move, so that neighbours do not keep
+        swapping communities. The same seed gives the same communities.
+
+        Args:
+            weight: Edge weight, see undirected()
+            resolution: Higher values give more, smaller communities
+            seed: Random seed
+
+        Returns:
+            (community of each party, numbered from the largest community,
+            modularity of the assignment)
+        """
+        adjacency = self.undirected(weight)
+        rng = np.random.default_rng(seed)
+        labels = np.arange(self.number_of_nodes())
+        modularity = _modularity(adjacency, labels, resolution)
+
+        level = adjacency
+        while True:
+            moved = _local_moves(level, resolution, rng)
+            _, moved = np.unique(moved, return_inverse=True)
+            candidate = moved[labels]
+            candidate_modularity = _modularity(adjacency, candidate, resolution)
+            if moved.max(initial=-1) + 1 == level.shape[0] or candidate_modularity <= modularity + 1e-12:
+                break
+            labels, modularity = candidate, candidate_modularity
+            # Merge each community into one node (internal weight becomes a self-loop)
+            merge = sparse.csr_matrix((np.ones(level.shape[0]), (np.arange(level.shape[0]), moved)))
+            level = (merge.T @ level @ merge).tocsr()
+
+        # Number communities from the largest
+        sizes = np.bincount(labels)
+        rank = np.empty(len(sizes), dtype=np.int64)
+        rank[np.argsort(-sizes, kind='stable')] = np.arange(len(sizes))
+        return rank[labels], modularity
+
+    def to_networkx(self, parties: Optional[Iterable[str]] = None):
+        """
+        NetworkX DiGraph of the network (or of the given parties), for drawing.
+
+        Edges carry 'weight' (transaction count) and 'amount', as in NB02.
+        """
+        if nx is None:
+            raise ImportError("to_networkx needs networkx (pip install networkx)")
+        counts, amounts, names = self.counts, self.amounts, self.parties
+        if parties is not None:
+            nodes = self.index_of(parties)
+            counts, amounts, names = counts[nodes][:, nodes], amounts[nodes][:, nodes], names[nodes]
+
+        G = nx.DiGraph()
+        G.add_nodes_from(names.tolist())
+        coo = counts.tocoo()
+        G.add_edges_from(
+            (names[s], names[r], {'weight': int(c), 'amount': float(a)})
+            for s, r, c, a in zip(coo.row, coo.col, coo.data, amounts.tocsr().data)
+        )
+        return G
+
+
+def _modularity(adjacency: sparse.csr_matrix, labels: np.ndarray, resolution: float = 1.0) -> float:
+    """Modularity of labels on a symmetric adjacency matrix."""
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    two_m = degree.sum()
+    if two_m == 0:
+        return 0.0
+    coo = adjacency.tocoo()
+    internal = coo.data[labels[coo.row] == labels[coo.col]].sum()
+    totals = np.bincount(labels, weights=degree)
+    return internal / two_m - resolution * (totals ** 2).sum() / two_m ** 2
+
+
+def _local_moves(adjacency: sparse.csr_matrix, resolution: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Louvain's first phase on a symmetric adjacency matrix: community of each node.
+
+    Moving node i from community D to C changes modularity by (up to a
+    constant factor) gain(C) - gain(D), with gain(C) = w(i, C) - resolution *
+    k_i * tot(C) / 2m, where w(i, C) is the weight between i and C, k_i the
+    degree of i and tot(C) the total degree of C without i.
+
+    Nodes move together, so a sweep can occasionally lower modularity; the
+    best assignment seen is returned.
+    """
+    n = adjacency.shape[0]
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    two_m = degree.sum()
+    if two_m == 0:
+        return np.arange(n)
+    coo = adjacency.tocoo()
+    # Self-loops (merged communities) never move with their node
+    neighbours = adjacency - sparse.diags(adjacency.diagonal())
+    neighbours.eliminate_zeros()
+
+    labels = np.arange(n)
+    totals = degree.copy()
+    best_labels, best_modularity, stale = labels.copy(), -np.inf, 0
+    for _ in range(LOUVAIN_MAX_SWEEPS):
+        modularity = (coo.data[labels[coo.row] == labels[coo.col]].sum() / two_m
+                      - resolution * (totals ** 2).sum() / two_m ** 2)
+        if modularity > best_modularity:
+            stale = 0 if modularity > best_modularity + LOUVAIN_MIN_GAIN else stale + 1
+            best_labels, best_modularity = labels.copy(), modularity
+        else:
+            stale += 1
+        if stale >= LOUVAIN_PATIENCE:
+            break
+
+        # Weight from every node to every neighbouring community: the product
+        # with the node x community indicator matrix sums it without sorting
+        membership = sparse.csr_matrix((np.ones(n), labels, np.arange(n + 1)), shape=(n, n))
+        links = neighbours @ membership
+        counts = np.diff(links.indptr)
+        nodes = np.flatnonzero(counts)
+        link_rows = np.repeat(np.arange(n), counts)
+        own = links.indices == labels[link_rows]
+        tot = totals[links.indices] - np.where(own, degree[link_rows], 0.0)
+        gain = links.data - resolution * degree[link_rows] * tot / two_m
+
+        stay = -resolution * degree * (totals[labels] - degree) / two_m
+        stay[link_rows[own]] = gain[own]
+
+        # Best neighbouring community of each node (first one found on ties)
+        best_gain = np.maximum.reduceat(gain, links.indptr[nodes]) if len(nodes) else np.empty(0)
+        is_best = np.flatnonzero(gain == np.repeat(best_gain, counts[nodes]))
+        first = is_best[np.diff(link_rows[is_best], prepend=-1) != 0]
+        best = links.indices[first]
+
+        improves = best_gain > stay[nodes] + 1e-12 * two_m
+        if not improves.any():
+            break
+        # Only a random half may move, so that neighbours rarely swap places
+        move = improves & (rng.random(len(nodes)) < 0.5)
+        movers, targets = nodes[move], best[move]
+        totals -= np.bincount(labels[movers], weights=degree[movers], minlength=n)
+        totals += np.bincount(targets, weights=degree[movers], minlength=n)
+        labels[movers] = targets
+
+    modularity = (coo.data[labels[coo.row] == labels[coo.col]].sum() / two_m
+                  - resolution * (totals ** 2).sum() / two_m ** 2)
+    return labels if modularity > best_modularity else best_labels
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def planted_payments(n_transactions: int, n_parties: int, n_communities: int, within: float = 0.8,
+                     seed: int = 0) -> tuple:
+    """
+    Random payments with a known community structure, for benchmarking communities().
+
+    Each party belongs to one of n_communities groups; a share `within` of
+    payments go to a random member of the sender's group, the rest to anyone.
+
+    Returns:
+        (DataFrame with sender, receiver and amount columns, planted group of each party)
+    """
+    rng = np.random.default_rng(seed)
+    group = rng.integers(0, n_communities, n_parties)
+    members = np.argsort(group, kind='stable')
+    starts = np.searchsorted(group[members], np.arange(n_communities + 1))
+
+    sender = rng.integers(0, n_parties, n_transactions)
+    first, size = starts[group[sender]], np.diff(starts)[group[sender]]
+    same_group = members[first + (rng.random(n_transactions) * size).astype(np.int64)]
+    receiver = np.where(rng.random(n_transactions) < within, same_group,
+                        rng.integers(0, n_parties, n_transactions))
+    keep = sender != receiver
+    parties = pd.CategoricalDtype([f"Party_{i}" for i in range(n_parties)])
+    df = pd.DataFrame({
+        'sender': pd.Categorical.from_codes(sender[keep], dtype=parties),
+        'receiver': pd.Categorical.from_codes(receiver[keep], dtype=parties),
+        'amount': rng.lognormal(6, 1.5, keep.sum()),
+    })
+    return df, group
+
+
+def main():
+    from payment_data import generate_payment_data
+
+    parser = argparse.ArgumentParser(
+        description='Build and analyse a synthetic payment network with sparse matrices'
+    )
+    parser.add_argument('--rows', type=int, default=10_000_000, help='Transactions (default: 10,000,000)')
+    parser.add_argument('--parties', type=int, default=1_000_000, help='Parties (default: 1,000,000)')
+    parser.add_argument('--min-transactions', type=int, default=1, help='Minimum transactions per edge')
+    parser.add_argument('--betweenness-samples', type=int, default=8,
+                        help='Source parties sampled for betweenness (default: 8, 0 to skip)')
+    parser.add_argument('--planted-communities', type=int,
+                        help='Use random payments with this many planted communities instead of payment_data')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    args = parser.parse_args()
+
+    if args.planted_communities:
+        df, planted = planted_payments(args.rows, args.parties, args.planted_communities, seed=args.seed)
+    else:
+        df = generate_payment_data(args.rows, args.parties, seed=args.seed)
+    timings = {}
+
+    start = time.perf_counter()
+    network = PaymentNetwork.from_transactions(df, args.min_transactions)
+    timings['build network'] = time.perf_counter() - start
+
+    steps = [
+        ('node metrics', network.node_metrics),
+        ('degree centrality', network.degree_centrality),
+        ('pagerank', network.pagerank),
+        ('communities (Louvain)', lambda: network.communities(seed=args.seed)),
+    ]
+    if args.betweenness_samples:
+        steps.append((f'betweenness ({args.betweenness_samples} sources)',
+                      lambda: network.betweenness_centrality(args.betweenness_samples, args.seed)))
+    results = {}
+    for name, compute in steps:
+        start = time.perf_counter()
+        results[name] = compute()
+        timings[name] = time.perf_counter() - start
+
+    print(f"{network.number_of_nodes():,} parties, {network.number_of_edges():,} edges "
+          f"from {len(df):,} transactions")
+    for name, seconds in timings.items():
+        print(f"  {name:<30} {seconds:>8.2f}s")
+
+    labels, modularity = results['communities (Louvain)']
+    print(f"\n{labels.max() + 1:,} communities, modularity {modularity:.4f}")
+    if args.planted_communities:
+        planted = planted[df['sender'].cat.categories.get_indexer(network.parties)]
+        print(f"{args.planted_communities:,} planted communities, modularity {network.modularity(planted):.4f}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
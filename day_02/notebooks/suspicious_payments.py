@@ -0,0 +1,342 @@
+"""
+Streaming suspicious-transaction screening for NB02's Challenge 1.
+
+A transaction is flagged when it:
+
+1. is more than amount_threshold times the sender's average amount,
+2. happens at an unusual hour, or
+3. comes from a sender with fewer than min_transactions earlier payments.
+
+Payments are screened the way a live monitor sees them: in time order, one
+chunk at a time. The sender averages are running (Welford) means over the
+sender's *earlier* transactions, kept per sender and updated after every
+chunk, so the whole dataset never has to be in memory. Chunks can come from
+a Parquet/Arrow/CSV file (read_payment_chunks), from payment_data's
+generator, or from a live feed of small batches.
+
+In parallel mode the stream is partitioned by sender: every sender always
+goes to the same worker process, which holds that sender's statistics, so
+the flags are the same as in a single process.
+
+Example:
+    from suspicious_payments import flag_suspicious_stream, read_payment_chunks
+
+    for flagged in flag_suspicious_stream(read_payment_chunks('payments.parquet')):
+        print(flagged[['transaction_id', 'sender', 'amount', 'risk_score']])
+
+Command line:
+    python suspicious_payments.py payments.parquet --output flagged.csv --workers 4
+"""
+
+import argparse
+import multiprocessing
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from payment_data import file_format_from_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Columns added to every screened row
+FLAG_COLUMNS = ['sender_txn_count', 'sender_mean_amount', 'large_amount', 'unusual_hour',
+                'low_activity', 'risk_score']
+
+
+class SuspiciousTransactionScorer:
+    """
+    Screens payment chunks in time order, keeping running statistics per sender.
+
+    Args:
+        amount_threshold: Flag if amount > threshold * sender's mean amount so far
+        unusual_hours: (start_hour, end_hour) considered unusual; wraps past
+            midnight if start_hour > end_hour, e.g. (22, 5)
+        min_transactions: Flag senders with fewer earlier transactions than this
+    """
+
+    def __init__(self, amount_threshold: float = 3, unusual_hours: Tuple[int, int] = (0, 6),
+                 min_transactions: int = 3):
+        self.amount_threshold = amount_threshold
+        self.unusual_hours = unusual_hours
+        self.min_transactions = min_transactions
+        self.senders = pd.Index([], dtype=object)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.means = np.zeros(0)
+        self._categories = None
+        self._category_ids = None
+
+    def _sender_ids(self, senders: pd.Series) -> np.ndarray:
+        """State index of each sender, adding senders not seen before."""
+        if isinstance(senders.dtype, pd.CategoricalDtype):
+            # Look up each category once, then broadcast by code; chunks from
+            # one generator share their categories, so the lookup is reused
+            categories = senders.cat.categories
+            if self._categories is not categories:
+                self._category_ids = self._sender_ids(pd.Series(categories))
+                self._categories = categories
+            return self._category_ids[senders.cat.codes.to_numpy()]
+
+        # Plain object arrays hash much faster than mixed string dtypes
+        senders = senders.to_numpy(dtype=object)
+        ids = self.senders.get_indexer(senders)
+        new = ids < 0
+        if new.any():
+            unseen = pd.unique(senders[new])
+            self.senders = self.senders.append(pd.Index(unseen, dtype=object))
+            self.counts = np.concatenate([self.counts, np.zeros(len(unseen), dtype=np.int64)])
+            self.means = np.concatenate([self.means, np.zeros(len(unseen))])
+            ids[new] = self.senders.get_indexer(senders[new])
+        return ids
+
+    def score(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Screen a chunk (in time order) and update the sender statistics.
+
+        Returns:
+            The chunk with the FLAG_COLUMNS added: the sender's transaction
+            count and mean amount before each row, the three flags and
+            risk_score (number of flags raised)
+        """
+        ids = self._sender_ids(chunk['sender'])
+        amount = chunk['amount'].to_numpy(dtype=np.float64)
+        count, mean = self.counts[ids], self.means[ids]
+
+        # Deviations from the mean at the start of the chunk; summing them over
+        # a sender's earlier rows gives the running mean without losing precision
+        deviation = pd.Series(amount - mean)
+        by_sender = deviation.groupby(ids, sort=False)
+        earlier = by_sender.cumcount().to_numpy()
+        earlier_deviation = by_sender.cumsum().to_numpy() - deviation.to_numpy()
+        txn_count = count + earlier
+        mean_amount = np.where(txn_count > 0, mean + earlier_deviation / np.maximum(txn_count, 1), np.nan)
+
+        # Welford update of every sender in the chunk
+        new_count = self.counts + np.bincount(ids, minlength=len(self.counts))
+        touched = new_count > self.counts
+        self.means[touched] += (np.bincount(ids, weights=deviation.to_numpy(), minlength=len(self.counts))[touched]
+                                / new_count[touched])
+        self.counts = new_count
+
+        start, end = self.unusual_hours
+        hour = chunk['timestamp'].dt.hour.to_numpy()
+        unusual_hour = (hour >= start) & (hour < end) if start <= end else (hour >= start) | (hour < end)
+        large_amount = txn_count > 0
+        large_amount[large_amount] = amount[large_amount] > self.amount_threshold * mean_amount[large_amount]
+        low_activity = txn_count < self.min_transactions
+
+        return chunk.assign(
+            sender_txn_count=txn_count,
+            sender_mean_amount=mean_amount,
+            large_amount=large_amount,
+            unusual_hour=unusual_hour,
+            low_activity=low_activity,
+            risk_score=large_amount.astype(np.int8) + unusual_hour + low_activity,
+        )
+
+    def flag(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Screen a chunk and return only its flagged rows."""
+        scored = self.score(chunk)
+        return scored[scored['risk_score'] > 0]
+
+    def sender_stats(self) -> pd.DataFrame:
+        """Transaction count and mean amount of every sender seen so far."""
+        seen = self.counts > 0
+        return pd.DataFrame({'sender': self.senders[seen], 'txn_count': self.counts[seen],
+                             'mean_amount': self.means[seen]})
+
+
+def read_payment_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        file_format: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read a payments file (as written by payment_data) chunk by chunk.
+
+    Args:
+        path: Parquet, Arrow IPC or CSV (.csv.gz) file
+        chunk_size: Rows per chunk (Arrow files keep the batches they were written with)
+        file_format: 'parquet', 'arrow' or 'csv' (default: from the file extension)
+    """
+    path = Path(path)
+    if file_format is None:
+        file_format = file_format_from_path(path)
+    if file_format in ('parquet', 'arrow') and pa is None:
+        raise ImportError(f"Reading {file_format} needs pyarrow (pip install pyarrow)")
+
+    if file_format == 'parquet':
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif file_format == 'arrow':
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, parse_dates=['timestamp'])
+
+
+def _partition_worker(inbox, outbox, scorer_kwargs: dict) -> None:
+    """Worker process: screen the partitions it receives, in order, with its own statistics."""
+    scorer = SuspiciousTransactionScorer(**scorer_kwargs)
+    for seq, part in iter(inbox.get, None):
+        try:
+            outbox.put((seq, scorer.flag(part)))
+        except Exception as error:
+            outbox.put((seq, error))
+
+
+def _flag_partitioned(chunks: Iterable[pd.DataFrame], workers: int,
+                      scorer_kwargs: dict) -> Iterator[pd.DataFrame]:
+    """Parallel flag_suspicious_stream: one worker process per sender partition."""
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue(maxsize=2) for _ in range(workers)]
+    outbox = context.Queue()
+    processes = [context.Process(target=_partition_worker, args=(inbox, outbox, scorer_kwargs), daemon=True)
+                 for inbox in inboxes]
+    for process in processes:
+        process.start()
+
+    results = {}
+
+    def collect(seq):
+        # Workers may already be sending results for the next chunk
+        while len(results.get(seq, ())) < workers:
+            part_seq, part = outbox.get()
+            if isinstance(part, Exception):
+                raise part
+            results.setdefault(part_seq, []).append(part)
+        # Back to stream order (each part keeps its rows' positions in the chunk)
+        flagged = pd.concat(results.pop(seq))
+        return flagged.sort_values('_row', kind='stable').drop(columns='_row')
+
+    try:
+        pending = None
+        for seq, chunk in enumerate(chunks):
+            # A stable hash, so a sender maps to the same worker in every chunk
+            partition = pd.util.hash_array(chunk['sender'].to_numpy()) % workers
+            chunk = chunk.assign(_row=np.arange(len(chunk)))
+            for worker, inbox in enumerate(inboxes):
+                part = chunk[partition == worker]
+                # Send each worker only the categories it uses, not (say) a million party names
+                used = {name: column.cat.remove_unused_categories() for name, column in part.items()
+                        if isinstance(column.dtype, pd.CategoricalDtype)}
+                inbox.put((seq, part.assign(**used)))
+            # Screen this chunk while the previous one is handed back
+            if pending is not None:
+                yield collect(pending)
+            pending = seq
+        if pending is not None:
+            yield collect(pending)
+    finally:
+        for inbox in inboxes:
+            inbox.put(None)
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+
+def flag_suspicious_stream(chunks: Iterable[pd.DataFrame], amount_threshold: float = 3,
+                           unusual_hours: Tuple[int, int] = (0, 6), min_transactions: int = 3,
+                           workers: int = 1) -> Iterator[pd.DataFrame]:
+    """
+    Screen a stream of payment chunks (in time order), yielding the flagged rows of each.
+
+    Args:
+        chunks: DataFrames with sender, amount and timestamp columns
+        amount_threshold, unusual_hours, min_transactions: See SuspiciousTransactionScorer
+        workers: Worker processes; with more than 1, senders are partitioned across them
+
+    Yields:
+        Flagged rows of each chunk, with the FLAG_COLUMNS added
+    """
+    scorer_kwargs = dict(amount_threshold=amount_threshold, unusual_hours=unusual_hours,
+                         min_transactions=min_transactions)
+    if workers > 1:
+        yield from _flag_partitioned(chunks, workers, scorer_kwargs)
+        return
+    scorer = SuspiciousTransactionScorer(**scorer_kwargs)
+    for chunk in chunks:
+        yield scorer.flag(chunk)
+
+
+def flag_suspicious_transactions(df: pd.DataFrame, amount_threshold: float = 3,
+                                 unusual_hours: Tuple[int, int] = (0, 6), min_transactions: int = 3,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Flag potentially suspicious transactions in an in-memory DataFrame.
+
+    Same signature as NB02's Challenge 1. Rows are screened in timestamp
+    order, against each sender's history up to that transaction.
+
+    Returns:
+        DataFrame of flagged transactions, with the FLAG_COLUMNS added
+    """
+    if not df['timestamp'].is_monotonic_increasing:
+        df = df.sort_values('timestamp', kind='stable')
+    chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+    flagged = list(flag_suspicious_stream(chunks, amount_threshold, unusual_hours, min_transactions))
+    return pd.concat(flagged) if flagged else df.iloc[:0].assign(**{c: [] for c in FLAG_COLUMNS})
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Flag suspicious payments in a Parquet, Arrow or CSV file, chunk by chunk'
+    )
+    parser.add_argument('input', type=Path, help='Payments file (e.g. written by payment_data.py)')
+    parser.add_argument('--output', type=Path, help='CSV file for the flagged rows (default: summary only)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Rows per chunk (default: {DEFAULT_CHUNK_SIZE:,})')
+    parser.add_argument('--amount-threshold', type=float, default=3,
+                        help="Flag amounts above this multiple of the sender's mean (default: 3)")
+    parser.add_argument('--unusual-hours', type=int, nargs=2, default=[0, 6], metavar=('START', 'END'),
+                        help='Unusual hours of the day (default: 0 6)')
+    parser.add_argument('--min-transactions', type=int, default=3,
+                        help='Flag senders with fewer earlier transactions (default: 3)')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (default: 1)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = flagged_rows = 0
+    by_flag = dict.fromkeys(['large_amount', 'unusual_hour', 'low_activity'], 0)
+
+    def counted(chunks):
+        nonlocal rows
+        for chunk in chunks:
+            rows += len(chunk)
+            yield chunk
+
+    stream = flag_suspicious_stream(counted(read_payment_chunks(args.input, args.chunk_size)),
+                                    args.amount_threshold, tuple(args.unusual_hours),
+                                    args.min_transactions, args.workers)
+    for flagged in stream:
+        if args.output is not None:
+            flagged.to_csv(args.output, mode='w' if flagged_rows == 0 else 'a',
+                           header=flagged_rows == 0, index=False)
+        flagged_rows += len(flagged)
+        for flag in by_flag:
+            by_flag[flag] += int(flagged[flag].sum())
+    elapsed = time.perf_counter() - start
+
+    print(f"Screened {rows:,} transactions in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+    print(f"Flagged {flagged_rows:,} ({flagged_rows / max(rows, 1):.2%})")
+    for flag, count in by_flag.items():
+        print(f"  {flag:<14} {count:>12,}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,274 @@
+"""
+Indexed transaction store for NB03: Open Banking API Explorer.
+
+The notebook's MockBank keeps each account's transactions in a plain list, so
+every GET /accounts/{id}/transactions filters the whole list for dateFrom and
+dateTo and then splits booked from pending in two more passes.
+TransactionStore keeps each account's transactions sorted by
+(booking_date, transaction_id), separately for every status. A date range is
+then two binary searches and a page of results is a slice, whatever the size
+of the history.
+
+Pages are returned newest first, like the notebook's lists. A page that does
+not reach the start of the range comes with an opaque cursor naming the last
+transaction returned, and the next request continues just before it. The
+cursor is a position in the sort order, not a row number, so transactions
+booked between two requests do not shift or repeat the pages that follow.
+
+TransactionStore behaves like the dict it replaces (account_id -> list of
+transactions, newest first): code that assigns or reads
+bank.transactions[account_id] keeps working.
+
+Run this file to benchmark range queries against a full scan:
+    python transaction_store.py --sizes 10000 100000 1000000 5000000
+
+Example:
+    from transaction_store import TransactionStore
+
+    store = TransactionStore()
+    store["ACC000001"] = generate_transactions("ACC000001", 50)
+    page, cursor = store.page("ACC000001", TransactionStatus.BOOKED,
+                              date_from="2024-01-01", page_size=20)
+    older, cursor = store.page("ACC000001", TransactionStatus.BOOKED,
+                               date_from="2024-01-01", page_size=20, cursor=cursor)
+"""
+
+import argparse
+import base64
+import json
+import random
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from collections.abc import MutableMapping
+from datetime import date, timedelta
+from operator import itemgetter
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+_booking_date = itemgetter(0)
+
+
+def _sort_key(transaction) -> Tuple[str, str]:
+    return (transaction.booking_date, transaction.transaction_id)
+
+
+def encode_cursor(key: Tuple[str, str]) -> str:
+    """Opaque, URL-safe cursor for the (booking_date, transaction_id) sort key."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Sort key from a cursor made by encode_cursor(); ValueError if it is not one."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from error
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(k, str) for k in key)):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return tuple(key)
+
+
+class _SortedTransactions:
+    """One account's transactions of one status, in (booking_date, transaction_id) order."""
+
+    __slots__ = ('dates', 'keys', 'items')
+
+    def __init__(self, transactions: Iterable = ()):
+        self.items: List[Any] = sorted(transactions, key=_sort_key)
+        self.keys: List[Tuple[str, str]] = list(map(_sort_key, self.items))
+        # Booking dates on their own, so date bounds are a plain C-level bisect
+        self.dates: List[str] = list(map(_booking_date, self.keys))
+
+    def add(self, transaction) -> None:
+        key = _sort_key(transaction)
+        # New bookings usually come last, which makes this an append
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.dates.insert(position, key[0])
+        self.items.insert(position, transaction)
+
+    def bounds(self, date_from: Optional[str], date_to: Optional[str]) -> Tuple[int, int]:
+        """Positions [lo, hi) of the transactions booked from date_from to date_to inclusive."""
+        lo = 0 if date_from is None else bisect_left(self.dates, date_from)
+        hi = len(self.dates) if date_to is None else bisect_right(self.dates, date_to)
+        return lo, hi
+
+
+_EMPTY = _SortedTransactions()
+
+
+class TransactionStore(MutableMapping):
+    """
+    Per-account transactions, sorted by booking date and split by status.
+
+    Transactions need booking_date (YYYY-MM-DD), transaction_id and status
+    attributes, like the notebook's Transaction; status may be any hashable
+    value (e.g. the TransactionStatus enum).
+    """
+
+    def __init__(self):
+        self._accounts: Dict[str, Dict[Hashable, _SortedTransactions]] = {}
+
+    # ------------------------------------------------------------------
+    # Dict interface: account_id -> transactions, newest first
+    # ------------------------------------------------------------------
+
+    def __setitem__(self, account_id: str, transactions: Iterable) -> None:
+        by_status: Dict[Hashable, List] = {}
+        for transaction in transactions:
+            by_status.setdefault(transaction.status, []).append(transaction)
+        self._accounts[account_id] = {status: _SortedTransactions(group)
+                                      for status, group in by_status.items()}
+
+    def __getitem__(self, account_id: str) -> List:
+        columns = self._accounts[account_id].values()
+        if len(columns) == 1:
+            return [t for column in columns for t in reversed(column.items)]
+        return sorted((t for column in columns for t in column.items), key=_sort_key, reverse=True)
+
+    def __delitem__(self, account_id: str) -> None:
+        del self._accounts[account_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._accounts)
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    # ------------------------------------------------------------------
+    # Indexed access
+    # ------------------------------------------------------------------
+
+    def add(self, account_id: str, transaction) -> None:
+        """Book one more transaction on an account, keeping the order."""
+        columns = self._accounts.setdefault(account_id, {})
+        if transaction.status not in columns:
+            columns[transaction.status] = _SortedTransactions()
+        columns[transaction.status].add(transaction)
+
+    def size(self, account_id: str) -> int:
+        """Number of transactions on an account, of every status."""
+        return sum(len(column.keys) for column in self._accounts.get(account_id, {}).values())
+
+    def count(self, account_id: str, status: Hashable, date_from: Optional[str] = None,
+              date_to: Optional[str] = None) -> int:
+        """Number of transactions with this status booked from date_from to date_to."""
+        lo, hi = self._column(account_id, status).bounds(date_from, date_to)
+        return hi - lo
+
+    def page(self, account_id: str, status: Hashable, date_from: Optional[str] = None,
+             date_to: Optional[str] = None, page_size: Optional[int] = None,
+             cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+        """
+        One page of an account's transactions with this status, newest first.
+
+        Args:
+            account_id: The account identifier
+            status: Status of the transactions (e.g. TransactionStatus.BOOKED)
+            date_from: First booking date (YYYY-MM-DD, inclusive)
+            date_to: Last booking date (YYYY-MM-DD, inclusive)
+            page_size: Maximum transactions on the page (None = all of them)
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            (transactions, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If page_size is below 1 or cursor was not made by this store
+        """
+        if page_size is not None and page_size < 1:
+            raise ValueError(f"page_size must be at least 1, got {page_size}")
+        column = self._column(account_id, status)
+        lo, hi = column.bounds(date_from, date_to)
+        if cursor is not None:
+            hi = max(lo, min(hi, bisect_left(column.keys, decode_cursor(cursor))))
+        start = lo if page_size is None else max(lo, hi - page_size)
+        next_cursor = encode_cursor(column.keys[start]) if start > lo else None
+        return column.items[start:hi][::-1], next_cursor
+
+    def _column(self, account_id: str, status: Hashable) -> _SortedTransactions:
+        return self._accounts.get(account_id, {}).get(status, _EMPTY)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+# Just the fields the store and the scan need
+SyntheticTransaction = namedtuple('SyntheticTransaction',
+                                  'transaction_id booking_date status amount')
+
+
+def synthetic_history(n_transactions: int, days: int = 5 * 365, pending_share: float = 0.01,
+                      seed: int = 0) -> List[SyntheticTransaction]:
+    """One account's history: n_transactions spread evenly over the last `days` days."""
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=days)
+    dates = [(start + timedelta(days=d)).isoformat() for d in range(days + 1)]
+    return [
+        SyntheticTransaction(f"TX{i:09d}", dates[i * days // max(n_transactions - 1, 1)],
+                             'pending' if rng.random() < pending_share else 'booked',
+                             round(rng.uniform(-200, 200), 2))
+        for i in range(n_transactions)
+    ]
+
+
+def _scan(history: List, status: str, date_from: str, date_to: str) -> List:
+    """The notebook's original filter: a pass per condition over the whole list."""
+    transactions = [t for t in history if t.booking_date >= date_from]
+    transactions = [t for t in transactions if t.booking_date <= date_to]
+    return [t for t in transactions if t.status == status]
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark indexed transaction queries against a full scan'
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help='Transactions on the account (default: 10000 100000 1000000)')
+    parser.add_argument('--days', type=int, default=30, help='Length of the queried date range (default: 30)')
+    parser.add_argument('--page-size', type=int, default=50, help='Transactions per page (default: 50)')
+    parser.add_argument('--queries', type=int, default=2000, help='Indexed queries to time (default: 2000)')
+    args = parser.parse_args()
+
+    print(f"{'Transactions':>13} {'Index build':>12} {'Page query':>12} {'Full scan':>12} {'Speed-up':>9}")
+    print("-" * 62)
+    for n in args.sizes:
+        history = synthetic_history(n)
+        store = TransactionStore()
+        start = time.perf_counter()
+        store['ACC'] = history
+        build = time.perf_counter() - start
+
+        # Random windows inside the history
+        rng = random.Random(1)
+        first = date.fromisoformat(history[0].booking_date)
+        span = (date.fromisoformat(history[-1].booking_date) - first).days - args.days
+        windows = []
+        for _ in range(args.queries):
+            date_from = first + timedelta(days=rng.randint(0, max(span, 0)))
+            windows.append((date_from.isoformat(), (date_from + timedelta(days=args.days)).isoformat()))
+
+        start = time.perf_counter()
+        for date_from, date_to in windows:
+            store.page('ACC', 'booked', date_from, date_to, page_size=args.page_size)
+        indexed = (time.perf_counter() - start) / len(windows)
+
+        scans = windows[:max(1, min(len(windows), 20_000_000 // max(n, 1)))]
+        start = time.perf_counter()
+        for date_from, date_to in scans:
+            _scan(history, 'booked', date_from, date_to)
+        scan = (time.perf_counter() - start) / len(scans)
+
+        print(f"{n:>13,} {build:>11.2f}s {indexed * 1e6:>10.1f}us {scan * 1e3:>10.2f}ms "
+              f"{scan / indexed:>8,.0f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -3,10 +3,14 @@
 Detect and report LaTeX beamer frame overflows from pdflatex .log files.
 
 Parses overfull vbox/hbox warnings, maps them to frame titles in .tex files,
-and produces a severity-rated report.
+and produces a severity-rated report. When beamer's .nav (or .aux) file is
+present, every frame is also mapped to its PDF pages and each overflow to the
+page and overlay it occurs on; the JSON report stores this index so a review
+tool can jump straight to the page.
 """
 
 import argparse
+import json
 import re
 from pathlib import Path
 from dataclasses import dataclass
@@ -21,6 +25,8 @@ class Overflow:
     amount_pt: float
     line_number: int
     line_range: Optional[Tuple[int, int]] = None  # For hbox only
+    page: Optional[int] = None  # PDF page being built when the warning fired
+    overlay: Optional[int] = None  # 1-based overlay within the frame
 
     @property
     def severity(self) -> str:
@@ -42,6 +48,8 @@ class Frame:
     start_line: int
     end_line: int
     overflows: List[Overflow]
+    first_page: Optional[int] = None
+    last_page: Optional[int] = None
 
     def contains_line(self, line_num: int) -> bool:
         """Check if line number falls within this frame."""
@@ -49,22 +57,37 @@ class Frame:
 
 
 def parse_log_file(log_path: Path) -> List[Overflow]:
-    """Parse a pdflatex .log file for overflow warnings."""
+    """Parse a pdflatex .log file for overflow warnings.
+
+    Page shipouts ("[12") are tracked along the way, so each overflow records
+    the page that was being built when it was reported.
+    """
     overflows = []
 
     # Regex patterns
     vbox_pattern = re.compile(r'Overfull \\vbox \(([\d.]+)pt too high\) detected at line (\d+)')
     hbox_pattern = re.compile(r'Overfull \\hbox \(([\d.]+)pt too wide\) in paragraph at lines (\d+)--(\d+)')
+    box_detail_pattern = re.compile(r'(?:Over|Under)full \\hbox')
+    shipout_pattern = re.compile(r'\[(\d+)(?=[\s\]{<]|$)')
+
+    last_page = 0
+    in_box_detail = False
 
     try:
         with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
             for line in f:
+                # Skip the typeset box contents printed after hbox warnings
+                if in_box_detail:
+                    if not line.strip():
+                        in_box_detail = False
+                    continue
+
                 # Check for vbox overflow
                 vbox_match = vbox_pattern.search(line)
                 if vbox_match:
                     amount = float(vbox_match.group(1))
                     line_num = int(vbox_match.group(2))
-                    overflows.append(Overflow('vbox', amount, line_num))
+                    overflows.append(Overflow('vbox', amount, line_num, page=last_page + 1))
                     continue
 
                 # Check for hbox overflow
@@ -73,7 +96,15 @@ def parse_log_file(log_path: Path) -> List[Overflow]:
                     amount = float(hbox_match.group(1))
                     start_line = int(hbox_match.group(2))
                     end_line = int(hbox_match.group(3))
-                    overflows.append(Overflow('hbox', amount, start_line, (start_line, end_line)))
+                    overflows.append(Overflow('hbox', amount, start_line, (start_line, end_line),
+                                              page=last_page + 1))
+
+                if box_detail_pattern.search(line):
+                    in_box_detail = True
+                    continue
+
+                for page_match in shipout_pattern.finditer(line):
+                    last_page = int(page_match.group(1))
 
     except Exception as e:
         print(f"Warning: Could not parse {log_path}: {e}")
@@ -135,9 +166,128 @@ def assign_overflows_to_frames(overflows: List[Overflow], frames: List[Frame]) -
                 break
 
 
-def generate_report(directory: Path) -> None:
-    """Generate overflow report for all .log files in directory."""
-    log_files = list(directory.glob("*.log"))
+def parse_nav_file(nav_path: Path) -> Tuple[List[Tuple[int, int]], int]:
+    """Parse beamer navigation data into frame page ranges.
+
+    Reads the .nav file, or the nav entries beamer writes to the .aux file
+    when no .nav exists. Returns (first_page, last_page) for every typeset
+    frame in order, with (0, 0) markers where a \\section started.
+    """
+    framepages_pattern = re.compile(r'\\beamer@framepages\s*\{(\d+)\}\{(\d+)\}')
+    section_pattern = re.compile(r'\\sectionentry\s*\{')
+
+    try:
+        text = nav_path.read_text(encoding='utf-8', errors='ignore')
+    except OSError as e:
+        print(f"Warning: Could not parse {nav_path}: {e}")
+        return [], 0
+
+    if nav_path.suffix == '.aux':
+        text = '\n'.join(line for line in text.splitlines() if line.startswith('\\@writefile{nav}'))
+
+    entries = []
+    events = [(m.start(), m) for m in framepages_pattern.finditer(text)]
+    events += [(m.start(), None) for m in section_pattern.finditer(text)]
+    for _, match in sorted(events, key=lambda e: e[0]):
+        if match is None:
+            entries.append((0, 0))
+        else:
+            entries.append((int(match.group(1)), int(match.group(2))))
+
+    sections = sum(1 for e in entries if e == (0, 0))
+    return entries, sections
+
+
+def _frame_begin_lines(tex_path: Path) -> List[int]:
+    """Line numbers of every \\begin{frame} in the document body, titled or not."""
+    frame_begin_pattern = re.compile(r'^[^%]*\\begin\{frame\}')
+    lines = []
+    in_body = False
+    with open(tex_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line_num, line in enumerate(f, start=1):
+            if not in_body:
+                in_body = '\\begin{document}' in line.split('%')[0]
+                continue
+            if frame_begin_pattern.search(line):
+                lines.append(line_num)
+    return lines
+
+
+def assign_pages_to_frames(tex_path: Path, frames: List[Frame]) -> bool:
+    """Fill in frame page ranges and overflow overlays from the deck's .nav/.aux.
+
+    Source frames are aligned with the typeset frames in order. Frames that
+    beamer inserts itself (\\AtBeginSection) are detected when the typeset
+    count exceeds the source count by exactly the number of sections.
+    Returns False if no navigation data was found or alignment failed.
+    """
+    nav_path = tex_path.with_suffix('.nav')
+    if not nav_path.exists():
+        nav_path = tex_path.with_suffix('.aux')
+        if not nav_path.exists():
+            return False
+
+    entries, sections = parse_nav_file(nav_path)
+    begin_lines = _frame_begin_lines(tex_path)
+    typeset = sum(1 for e in entries if e != (0, 0))
+
+    if typeset == len(begin_lines):
+        skip_after_section = False
+    elif typeset == len(begin_lines) + sections:
+        skip_after_section = True
+    else:
+        print(f"Warning: {nav_path.name} lists {typeset} frames but {tex_path.name} "
+              f"has {len(begin_lines)}; skipping page mapping")
+        return False
+
+    page_ranges = []
+    skip_next = False
+    for entry in entries:
+        if entry == (0, 0):
+            skip_next = skip_after_section
+        elif skip_next:
+            skip_next = False
+        else:
+            page_ranges.append(entry)
+
+    by_start = {frame.start_line: frame for frame in frames}
+    for begin_line, (first_page, last_page) in zip(begin_lines, page_ranges):
+        frame = by_start.get(begin_line)
+        if frame is None:
+            continue
+        frame.first_page, frame.last_page = first_page, last_page
+        for overflow in frame.overflows:
+            if overflow.page is not None and first_page <= overflow.page <= last_page:
+                overflow.overlay = overflow.page - first_page + 1
+
+    return True
+
+
+def analyze_deck(log_file: Path, tex_file: Path) -> Tuple[List[Overflow], List[Frame]]:
+    """Parse a deck's log and source and attach overflows and pages to frames."""
+    overflows = parse_log_file(log_file)
+    frames = parse_tex_frames(tex_file)
+    assign_overflows_to_frames(overflows, frames)
+    assign_pages_to_frames(tex_file, frames)
+    return overflows, frames
+
+
+def _page_label(frame: Frame) -> str:
+    if frame.first_page is None:
+        return ''
+    if frame.first_page == frame.last_page:
+        return f", page {frame.first_page}"
+    return f", pages {frame.first_page}-{frame.last_page}"
+
+
+def generate_report(directory: Path, log_files: Optional[List[Path]] = None) -> None:
+    """Generate overflow report for .log files in directory.
+
+    If log_files is given, only those logs are reported (e.g. the decks a
+    build just recompiled); otherwise every .log in directory is used.
+    """
+    if log_files is None:
+        log_files = list(directory.glob("*.log"))
 
     if not log_files:
         print(f"No .log files found in {directory}")
@@ -159,16 +309,12 @@ def generate_report(directory: Path) -> None:
             print(f"Warning: No corresponding .tex file for {log_file.name}\n")
             continue
 
-        # Parse log and tex files
-        overflows = parse_log_file(log_file)
-        frames = parse_tex_frames(tex_file)
+        # Parse log and tex files, assign overflows and pages to frames
+        overflows, frames = analyze_deck(log_file, tex_file)
 
         if not overflows:
             continue
 
-        # Assign overflows to frames
-        assign_overflows_to_frames(overflows, frames)
-
         # Count stats
         file_stats = defaultdict(int)
         vbox_count = sum(1 for o in overflows if o.overflow_type == 'vbox')
@@ -187,7 +333,7 @@ def generate_report(directory: Path) -> None:
             file_stats[severity] += 1
             all_stats[severity] += 1
 
-            print(f"  [{severity}] Frame \"{frame.title}\" (lines {frame.start_line}-{frame.end_line})")
+            print(f"  [{severity}] Frame \"{frame.title}\" (lines {frame.start_line}-{frame.end_line}{_page_label(frame)})")
 
             # List all overflows in this frame
             for overflow in sorted(frame.overflows, key=lambda o: o.amount_pt, reverse=True):
@@ -240,6 +386,77 @@ def generate_report(directory: Path) -> None:
         print("No overflows detected!")
 
 
+def _overflow_to_dict(overflow: Overflow) -> dict:
+    return {
+        'type': overflow.overflow_type,
+        'amount_pt': overflow.amount_pt,
+        'severity': overflow.severity,
+        'line': overflow.line_number,
+        'line_range': list(overflow.line_range) if overflow.line_range else None,
+        'page': overflow.page,
+        'overlay': overflow.overlay,
+    }
+
+
+def build_json_report(directory: Path, log_files: Optional[List[Path]] = None) -> dict:
+    """Build a JSON-serialisable report with the frame-to-page index of each deck.
+
+    Every frame is listed (not only overflowing ones) together with its PDF
+    page range, so consumers can navigate without re-parsing .log/.nav files.
+    """
+    if log_files is None:
+        log_files = list(directory.glob("*.log"))
+
+    decks = []
+    for log_file in sorted(log_files):
+        tex_file = log_file.with_suffix('.tex')
+        if not tex_file.exists():
+            continue
+
+        overflows, frames = analyze_deck(log_file, tex_file)
+        decks.append({
+            'file': tex_file.name,
+            'pdf': tex_file.with_suffix('.pdf').name,
+            'overflow_count': len(overflows),
+            'frames': [
+                {
+                    'title': frame.title,
+                    'start_line': frame.start_line,
+                    'end_line': frame.end_line,
+                    'first_page': frame.first_page,
+                    'last_page': frame.last_page,
+                    'overflows': [_overflow_to_dict(o) for o in
+                                  sorted(frame.overflows, key=lambda o: o.amount_pt, reverse=True)],
+                }
+                for frame in frames
+            ],
+        })
+
+    return {'directory': str(directory), 'decks': decks}
+
+
+def iter_overflow_records(report: dict):
+    """Yield one flat record per overflow (file, frame, severity, amount, ...).
+
+    Takes a report from build_json_report. This is the NDJSON row format, also
+    used by the overflow trend store.
+    """
+    for deck in report['decks']:
+        title_counts = defaultdict(int)
+        for frame in deck['frames']:
+            title_counts[frame['title']] += 1
+            for overflow in frame['overflows']:
+                record = {
+                    'file': deck['file'],
+                    'frame': frame['title'],
+                    'frame_index': title_counts[frame['title']],
+                    'start_line': frame['start_line'],
+                    'end_line': frame['end_line'],
+                }
+                record.update(overflow)
+                yield record
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -252,6 +469,17 @@ def main():
         default=Path.cwd(),
         help='Directory containing .log and .tex files (default: current directory)'
     )
+    parser.add_argument(
+        '--format', '-f',
+        choices=['text', 'json', 'ndjson'],
+        default='text',
+        help='Report format (default: text)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        type=Path,
+        help='Write the JSON/NDJSON report to this file instead of stdout'
+    )
 
     args = parser.parse_args()
 
@@ -263,7 +491,19 @@ def main():
         print(f"Error: {args.directory} is not a directory")
         return 1
 
-    generate_report(args.directory)
+    if args.format in ('json', 'ndjson'):
+        if args.format == 'json':
+            report = json.dumps(build_json_report(args.directory), indent=2)
+        else:
+            records = iter_overflow_records(build_json_report(args.directory))
+            report = '\n'.join(json.dumps(r) for r in records)
+        if args.output:
+            args.output.write_text(report + '\n', encoding='utf-8')
+            print(f"{args.format.upper()} report written to {args.output}")
+        else:
+            print(report)
+    else:
+        generate_report(args.directory)
     return 0
 
 
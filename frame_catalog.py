@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite catalogue joining frame audits with overflow results.
+
+Loads the per-frame pedagogical audits (audit_day*.json) and the overflows
+detect_overflows finds in the current .log files into one database, indexed
+on file and line range, so cross-cutting questions are single SQL queries
+instead of loops over every JSON file. The catalogue is derived data: `build`
+recreates it from scratch.
+
+Usage:
+    # Build the catalogue from the audits and the slide logs
+    python frame_catalog.py build
+
+    # High cognitive load frames that also overflow
+    python frame_catalog.py query --load high
+
+    # Only frames with HIGH or CRITICAL overflows, any load
+    python frame_catalog.py query --min-severity HIGH
+
+    # Ad-hoc SQL
+    python frame_catalog.py sql "SELECT content_type, COUNT(*) FROM audits GROUP BY 1"
+"""
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+
+from detect_overflows import build_json_report, iter_overflow_records
+
+
+DEFAULT_DB = Path('frame_catalog.sqlite')
+SEVERITY_RANK = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3, 'CRITICAL': 4}
+
+SCHEMA = '''
+DROP TABLE IF EXISTS audits;
+DROP TABLE IF EXISTS overflows;
+CREATE TABLE audits (
+    day INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    frame_title TEXT NOT NULL,
+    frame_number INTEGER,
+    line_start INTEGER NOT NULL,
+    line_end INTEGER NOT NULL,
+    purpose TEXT,
+    purpose_clear INTEGER,
+    prerequisite_knowledge TEXT,
+    prerequisite_violated INTEGER,
+    jargon_undefined TEXT,
+    builds_on_previous INTEGER,
+    content_type TEXT,
+    cognitive_load TEXT,
+    findings TEXT
+);
+CREATE TABLE overflows (
+    file TEXT NOT NULL,
+    frame TEXT NOT NULL,
+    start_line INTEGER,
+    end_line INTEGER,
+    overflow_type TEXT NOT NULL,
+    amount_pt REAL NOT NULL,
+    severity TEXT NOT NULL,
+    severity_rank INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    page INTEGER
+);
+CREATE INDEX idx_audits_file_lines ON audits(file, line_start, line_end);
+CREATE INDEX idx_audits_load ON audits(cognitive_load);
+CREATE INDEX idx_overflows_file_line ON overflows(file, line);
+'''
+
+# Audited frames joined with the overflows whose line falls inside them
+OVERFLOWING_FRAMES_QUERY = '''
+    SELECT a.file, a.frame_number, a.frame_title, a.line_start, a.line_end,
+           a.cognitive_load, COUNT(*) AS overflow_count,
+           MAX(o.amount_pt) AS worst_pt, MAX(o.severity_rank) AS worst_rank,
+           MIN(o.page) AS page
+    FROM audits a
+    JOIN overflows o ON o.file = a.file AND o.line BETWEEN a.line_start AND a.line_end
+    WHERE (:load IS NULL OR a.cognitive_load = :load)
+    GROUP BY a.rowid
+    HAVING worst_rank >= :min_rank
+    ORDER BY worst_rank DESC, worst_pt DESC
+'''
+
+
+def _find_audit_files(root: Path) -> List[Path]:
+    return sorted(root.glob('audit_day*.json'))
+
+
+def _find_log_directories(root: Path) -> List[Path]:
+    return sorted(p for p in root.glob('day_*/slides') if p.is_dir())
+
+
+def load_audits(conn: sqlite3.Connection, audit_files: List[Path]) -> int:
+    """Insert every audit record; returns the number of rows loaded."""
+    rows = []
+    for audit_file in audit_files:
+        day = int(''.join(c for c in audit_file.stem if c.isdigit()) or 0)
+        with open(audit_file, 'r', encoding='utf-8') as f:
+            for r in json.load(f):
+                rows.append((
+                    day, r['file'], r['frame_title'], r.get('frame_number'),
+                    r['line_start'], r['line_end'], r.get('purpose'), r.get('purpose_clear'),
+                    r.get('prerequisite_knowledge'), r.get('prerequisite_violated'),
+                    json.dumps(r.get('jargon_undefined', [])), r.get('builds_on_previous'),
+                    r.get('content_type'), r.get('cognitive_load'),
+                    json.dumps(r.get('findings', []))
+                ))
+    conn.executemany('INSERT INTO audits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    return len(rows)
+
+
+def load_overflows(conn: sqlite3.Connection, directories: List[Path]) -> int:
+    """Insert the overflows found in the .log files of directories."""
+    rows = []
+    for directory in directories:
+        for r in iter_overflow_records(build_json_report(directory)):
+            rows.append((
+                r['file'], r['frame'], r['start_line'], r['end_line'], r['type'],
+                r['amount_pt'], r['severity'], SEVERITY_RANK[r['severity']], r['line'], r['page']
+            ))
+    conn.executemany('INSERT INTO overflows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    return len(rows)
+
+
+def build_catalog(db_path: Path, audit_files: List[Path], log_dirs: List[Path]) -> sqlite3.Connection:
+    """(Re)create the catalogue database and load audits and overflows."""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executescript(SCHEMA)
+        audits = load_audits(conn, audit_files)
+        overflows = load_overflows(conn, log_dirs)
+    print(f"Loaded {audits} audited frames and {overflows} overflows into {db_path}")
+    return conn
+
+
+def overflowing_frames(conn: sqlite3.Connection, cognitive_load: Optional[str] = None,
+                       min_severity: str = 'LOW') -> List[sqlite3.Row]:
+    """Audited frames that overflow, optionally filtered by load and severity."""
+    conn.row_factory = sqlite3.Row
+    return conn.execute(OVERFLOWING_FRAMES_QUERY, {
+        'load': cognitive_load,
+        'min_rank': SEVERITY_RANK[min_severity],
+    }).fetchall()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Join frame audits with overflow results in an indexed SQLite catalogue."
+    )
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB,
+                        help=f'SQLite database (default: {DEFAULT_DB})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='(Re)build the catalogue')
+    build.add_argument('--root', type=Path, default=Path('.'),
+                       help='Course root containing audit_day*.json (default: .)')
+    build.add_argument('--logs', type=Path, nargs='+',
+                       help='Directories with .log/.tex files (default: day_*/slides)')
+
+    query = sub.add_parser('query', help='List audited frames that overflow')
+    query.add_argument('--load', choices=['low', 'medium', 'high'], help='Cognitive load filter')
+    query.add_argument('--min-severity', choices=list(SEVERITY_RANK), default='LOW',
+                       help='Minimum worst-overflow severity (default: LOW)')
+
+    sql = sub.add_parser('sql', help='Run an SQL query against the catalogue')
+    sql.add_argument('statement', help='SQL statement')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_catalog(args.db, _find_audit_files(args.root),
+                      args.logs or _find_log_directories(args.root))
+        return 0
+
+    if not args.db.exists():
+        print(f"Error: {args.db} not found; run 'build' first")
+        return 1
+    conn = sqlite3.connect(args.db)
+
+    if args.command == 'query':
+        rows = overflowing_frames(conn, args.load, args.min_severity)
+        rank_names = {rank: name for name, rank in SEVERITY_RANK.items()}
+        for row in rows:
+            page = f", page {row['page']}" if row['page'] else ''
+            print(f"  [{rank_names[row['worst_rank']]}] {row['file']}: Frame {row['frame_number']} "
+                  f"\"{row['frame_title']}\" (lines {row['line_start']}-{row['line_end']}{page}) "
+                  f"load={row['cognitive_load']}, {row['overflow_count']} overflow(s), "
+                  f"worst {row['worst_pt']:.2f}pt")
+        print(f"\n{len(rows)} frame(s)")
+    else:
+        for row in conn.execute(args.statement):
+            print('\t'.join('' if v is None else str(v) for v in row))
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Append-only SQLite store of overflow reports, one run per build.
+
+Each `record` call stores the decks that were analysed and every overflow
+found in them, tagged with the git commit. `diff` compares the latest run
+with the previous run that covered the same deck, so decks that were not
+rebuilt (and therefore have no fresh .log) are never reported as fixed or
+new. Decks are keyed by their path relative to the repository root, so
+same-named decks in different folders keep separate histories. Frames are
+identified by title and occurrence within the deck, which survives edits that
+shift line numbers.
+
+Usage:
+    # Record the current logs for the slide directories
+    python overflow_history.py record day_01/slides day_02/slides
+
+    # Show frames that got worse since the previous run; fail on new CRITICALs
+    python overflow_history.py diff --fail-on CRITICAL
+
+    # Overflow counts per run for one deck
+    python overflow_history.py history --deck day_01/slides/Day_01.tex
+"""
+
+import argparse
+import sqlite3
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from detect_overflows import build_json_report, iter_overflow_records
+
+
+DEFAULT_DB = Path('overflow_history.sqlite')
+REPO_ROOT = Path(__file__).resolve().parent
+SEVERITY_RANK = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3, 'CRITICAL': 4}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    git_commit TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_decks (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file TEXT NOT NULL,
+    PRIMARY KEY (run_id, file)
+);
+CREATE TABLE IF NOT EXISTS overflows (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file TEXT NOT NULL,
+    frame TEXT NOT NULL,
+    frame_index INTEGER NOT NULL,
+    start_line INTEGER,
+    overflow_type TEXT NOT NULL,
+    amount_pt REAL NOT NULL,
+    severity TEXT NOT NULL,
+    severity_rank INTEGER NOT NULL,
+    line INTEGER,
+    page INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_run_decks_file ON run_decks(file, run_id);
+CREATE INDEX IF NOT EXISTS idx_overflows_run_file ON overflows(run_id, file);
+CREATE INDEX IF NOT EXISTS idx_overflows_frame ON overflows(file, frame, frame_index);
+'''
+
+
+@dataclass
+class Regression:
+    """A frame whose worst overflow is new or more severe than in the baseline."""
+    file: str
+    frame: str
+    frame_index: int
+    severity: str
+    amount_pt: float
+    previous_severity: Optional[str] = None
+    previous_amount_pt: Optional[float] = None
+
+    @property
+    def is_new(self) -> bool:
+        return self.previous_severity is None
+
+
+def current_commit() -> Optional[str]:
+    """Return the HEAD commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def deck_key(directory: Path, file_name: str) -> str:
+    """Key for a deck: its path relative to the repo root (absolute if outside it)."""
+    path = (directory / file_name).resolve()
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def record_run(conn: sqlite3.Connection, directories: List[Path],
+               commit: Optional[str] = None) -> int:
+    """Analyse the .log files in directories and append them as a new run."""
+    created_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    with conn:
+        run_id = conn.execute('INSERT INTO runs (git_commit, created_at) VALUES (?, ?)',
+                              (commit, created_at)).lastrowid
+        for directory in directories:
+            report = build_json_report(directory)
+            for deck in report['decks']:
+                deck['file'] = deck_key(directory, deck['file'])
+            conn.executemany('INSERT OR IGNORE INTO run_decks (run_id, file) VALUES (?, ?)',
+                             [(run_id, deck['file']) for deck in report['decks']])
+            conn.executemany(
+                'INSERT INTO overflows (run_id, file, frame, frame_index, start_line, overflow_type, '
+                'amount_pt, severity, severity_rank, line, page) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, r['file'], r['frame'], r['frame_index'], r['start_line'], r['type'],
+                  r['amount_pt'], r['severity'], SEVERITY_RANK[r['severity']], r['line'], r['page'])
+                 for r in iter_overflow_records(report)]
+            )
+    return run_id
+
+
+def latest_run(conn: sqlite3.Connection, commit: Optional[str] = None) -> Optional[int]:
+    """Return the most recent run id, optionally restricted to a commit."""
+    if commit:
+        row = conn.execute('SELECT MAX(id) FROM runs WHERE git_commit = ?', (commit,)).fetchone()
+    else:
+        row = conn.execute('SELECT MAX(id) FROM runs').fetchone()
+    return row[0]
+
+
+def _worst_per_frame(conn: sqlite3.Connection, run_id: int, file: str) -> dict:
+    rows = conn.execute(
+        'SELECT frame, frame_index, MAX(severity_rank), MAX(amount_pt) FROM overflows '
+        'WHERE run_id = ? AND file = ? GROUP BY frame, frame_index',
+        (run_id, file)
+    ).fetchall()
+    return {(frame, index): (rank, amount) for frame, index, rank, amount in rows}
+
+
+def find_regressions(conn: sqlite3.Connection, run_id: int,
+                     baseline_commit: Optional[str] = None) -> List[Regression]:
+    """Compare each deck in run_id with the previous run that covered it.
+
+    If baseline_commit is given, only runs recorded for that commit are used
+    as baselines. Decks with no earlier run are skipped (nothing to compare).
+    """
+    rank_names = {rank: name for name, rank in SEVERITY_RANK.items()}
+    files = [row[0] for row in conn.execute('SELECT file FROM run_decks WHERE run_id = ?', (run_id,))]
+    regressions = []
+
+    for file in sorted(files):
+        query = 'SELECT MAX(d.run_id) FROM run_decks d JOIN runs r ON r.id = d.run_id ' \
+                'WHERE d.file = ? AND d.run_id < ?'
+        params = [file, run_id]
+        if baseline_commit:
+            query += ' AND r.git_commit = ?'
+            params.append(baseline_commit)
+        baseline_run = conn.execute(query, params).fetchone()[0]
+        if baseline_run is None:
+            continue
+
+        before = _worst_per_frame(conn, baseline_run, file)
+        for key, (rank, amount) in sorted(_worst_per_frame(conn, run_id, file).items()):
+            prev_rank, prev_amount = before.get(key, (None, None))
+            if prev_rank is None or rank > prev_rank:
+                regressions.append(Regression(
+                    file=file, frame=key[0], frame_index=key[1],
+                    severity=rank_names[rank], amount_pt=amount,
+                    previous_severity=rank_names.get(prev_rank), previous_amount_pt=prev_amount
+                ))
+
+    return regressions
+
+
+def print_history(conn: sqlite3.Connection, deck: Optional[str] = None, limit: int = 20) -> None:
+    """Print overflow counts per severity for the most recent runs."""
+    query = '''
+        SELECT r.id, r.git_commit, r.created_at,
+               COUNT(o.run_id),
+               COALESCE(SUM(o.severity = 'CRITICAL'), 0),
+               COALESCE(SUM(o.severity = 'HIGH'), 0)
+        FROM runs r LEFT JOIN overflows o ON o.run_id = r.id {deck_filter}
+        GROUP BY r.id ORDER BY r.id DESC LIMIT ?
+    '''
+    params = [limit]
+    if deck:
+        query = query.format(deck_filter='AND o.file = ?')
+        params.insert(0, deck)
+    else:
+        query = query.format(deck_filter='')
+
+    print(f"{'Run':>5} {'Commit':<10} {'Recorded':<26} {'Total':>6} {'CRIT':>5} {'HIGH':>5}")
+    print("-" * 62)
+    for run_id, commit, created_at, total, critical, high in conn.execute(query, params):
+        print(f"{run_id:>5} {(commit or '-')[:10]:<10} {created_at:<26} {total:>6} {critical:>5} {high:>5}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Record overflow reports over time and detect regressions."
+    )
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB,
+                        help=f'SQLite database (default: {DEFAULT_DB})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='Append the current .log files as a new run')
+    rec.add_argument('directories', type=Path, nargs='*', default=[Path.cwd()],
+                     help='Directories containing .log and .tex files')
+    rec.add_argument('--commit', help='Commit to tag the run with (default: git HEAD)')
+
+    diff = sub.add_parser('diff', help='List frames that regressed since the previous run')
+    diff.add_argument('--commit', help='Compare the latest run for this commit (default: latest run)')
+    diff.add_argument('--baseline', help='Only use runs for this commit as the baseline')
+    diff.add_argument('--fail-on', choices=list(SEVERITY_RANK),
+                      help='Exit 1 if a regression reaches this severity')
+
+    hist = sub.add_parser('history', help='Show overflow counts per run')
+    hist.add_argument('--deck', help='Restrict to one deck, by path from the repo root '
+                      '(e.g. day_01/slides/Day_01.tex)')
+    hist.add_argument('--limit', type=int, default=20, help='Number of runs to show')
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+
+    if args.command == 'record':
+        for directory in args.directories:
+            if not directory.is_dir():
+                print(f"Error: {directory} is not a directory")
+                return 1
+        run_id = record_run(conn, args.directories, args.commit or current_commit())
+        decks = conn.execute('SELECT COUNT(*) FROM run_decks WHERE run_id = ?', (run_id,)).fetchone()[0]
+        print(f"Recorded run {run_id} ({decks} decks)")
+
+    elif args.command == 'diff':
+        run_id = latest_run(conn, args.commit)
+        if run_id is None:
+            print("No runs recorded")
+            return 0
+        regressions = find_regressions(conn, run_id, args.baseline)
+        if not regressions:
+            print(f"No regressions in run {run_id}")
+            return 0
+
+        print(f"=== Regressions in run {run_id} ===\n")
+        for reg in regressions:
+            if reg.is_new:
+                change = "new"
+            else:
+                change = f"was {reg.previous_severity} {reg.previous_amount_pt:.2f}pt"
+            print(f"  [{reg.severity}] {reg.file}: Frame \"{reg.frame}\" "
+                  f"{reg.amount_pt:.2f}pt ({change})")
+
+        if args.fail_on:
+            threshold = SEVERITY_RANK[args.fail_on]
+            failing = [r for r in regressions if SEVERITY_RANK[r.severity] >= threshold]
+            if failing:
+                print(f"\n{len(failing)} regression(s) at {args.fail_on} or above")
+                return 1
+
+    else:
+        print_history(conn, args.deck, args.limit)
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
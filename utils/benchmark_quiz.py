@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Quiz Generator Benchmark
+========================
+
+Times QuizGenerator on synthetic question banks and checks the generated
+pages against page-weight budgets, so template changes that make every quiz
+slower or heavier are caught before deploy.
+
+For each bank size (10 to 10,000 questions by default), with and without
+math, it measures:
+- load_questions and generate_quiz wall time (best of --repeat runs)
+- page bytes, gzip bytes and inline <script> bytes
+- an estimated script parse/compile cost on a mid-range phone
+
+generate_all_quizzes is timed on a synthetic course (cold, then incremental
+with nothing changed).
+
+Budgets apply to the reference bank (--reference, 20 questions like the
+course quizzes) plus the marginal bytes each extra question adds, measured
+between the smallest and largest bank. Any exceeded budget exits with 1.
+
+Usage:
+------
+# Default sizes and budgets
+python benchmark_quiz.py
+
+# Production build, custom budgets, results saved for comparison
+python benchmark_quiz.py --production --budget page_kb=40 --budget gzip_kb=12 --json bench.json
+
+# Quick run
+python benchmark_quiz.py --sizes 10 100 --repeat 1
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from generate_quiz import QuizGenerator, generate_all_quizzes
+
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+# Rough script parse/compile throughput of a mid-range phone (about 1 ms per
+# KB of JavaScript); only meant for comparing runs, not as a measurement
+PARSE_MS_PER_KB = 1.0
+
+# Budgets for a reference-size quiz page
+DEFAULT_BUDGETS = {
+    'page_kb': 64.0,            # HTML bytes, including inline CSS/JS/data
+    'gzip_kb': 20.0,            # transfer size with gzip
+    'script_kb': 48.0,          # inline <script> bytes
+    'parse_ms': 48.0,           # estimated script parse cost
+    'bytes_per_question': 1200.0,  # marginal page bytes per added question
+}
+
+INLINE_SCRIPT_PATTERN = re.compile(r'<script>(.*?)</script>', re.DOTALL)
+
+WORDS = ('money ledger settlement payment bank token wallet ledger consensus '
+         'liquidity custody clearing network protocol interest reserve asset '
+         'exchange contract stablecoin market risk yield collateral').split()
+
+
+# =============================================================================
+# SYNTHETIC DATA
+# =============================================================================
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def synthetic_bank(size: int, math: bool = False, seed: int = 0) -> list:
+    """A reproducible bank of size questions, with inline math if math is set."""
+    rng = random.Random(seed)
+    questions = []
+    for i in range(size):
+        question = _sentence(rng, 14) + '?'
+        explanation = _sentence(rng, 24) + '.'
+        if math:
+            question += r' Given $r = 0.05$ and $P_0 = \frac{D_1}{r - g}$.'
+            explanation += r' $$E[X] = \sum_i x_i p_i$$'
+        questions.append({
+            'id': i + 1,
+            'question': question,
+            'options': {letter: _sentence(rng, 6) for letter in 'ABCD'},
+            'correct': rng.choice('ABCD'),
+            'explanation': explanation,
+        })
+    return questions
+
+
+def write_course(course_dir: Path, quizzes: int, questions: int) -> None:
+    """Write a synthetic course of T1.N_Topic/questions.json folders."""
+    for n in range(1, quizzes + 1):
+        folder = course_dir / f'T1.{n}_Topic_{n}'
+        folder.mkdir(parents=True, exist_ok=True)
+        with open(folder / 'questions.json', 'w', encoding='utf-8') as f:
+            json.dump(synthetic_bank(questions, math=n % 4 == 0, seed=n), f)
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def best_time(func, repeat: int) -> float:
+    """Fastest of repeat calls, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def page_weight(html: bytes) -> dict:
+    """Size metrics of one generated page."""
+    script = sum(len(m.encode('utf-8')) for m in INLINE_SCRIPT_PATTERN.findall(html.decode('utf-8')))
+    return {
+        'page_kb': len(html) / 1024,
+        'gzip_kb': len(gzip.compress(html, compresslevel=9, mtime=0)) / 1024,
+        'script_kb': script / 1024,
+        'parse_ms': script / 1024 * PARSE_MS_PER_KB,
+    }
+
+
+def bench_bank(generator: QuizGenerator, work_dir: Path, size: int, math: bool, repeat: int) -> dict:
+    """Time loading and generating one synthetic bank and measure its page."""
+    json_path = work_dir / f'bank_{size}_{int(math)}.json'
+    output_path = work_dir / f'bank_{size}_{int(math)}.html'
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(synthetic_bank(size, math=math), f)
+
+    questions = generator.load_questions(json_path)
+    result = {
+        'size': size,
+        'math': math,
+        'load_ms': best_time(lambda: generator.load_questions(json_path), repeat),
+        'generate_ms': best_time(
+            lambda: generator.generate_quiz(questions, 'Benchmark', 'Benchmark', output_path), repeat
+        ),
+    }
+    result.update(page_weight(output_path.read_bytes()))
+    return result
+
+
+def bench_course(generator: QuizGenerator, work_dir: Path, quizzes: int, questions: int) -> dict:
+    """Time generate_all_quizzes on a synthetic course, cold and incremental."""
+    course_dir = work_dir / 'course'
+    output_dir = work_dir / 'course_quiz'
+    write_course(course_dir, quizzes, questions)
+
+    timings = {'quizzes': quizzes, 'questions': questions}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for label, force in (('cold_ms', True), ('incremental_ms', False)):
+            start = time.perf_counter()
+            generate_all_quizzes(course_dir, output_dir, generator, force=force)
+            timings[label] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def check_budgets(results: list, reference: int, budgets: dict) -> list:
+    """Return (metric, value, limit) for every budget the results exceed."""
+    failures = []
+    plain = sorted((r for r in results if not r['math']), key=lambda r: r['size'])
+    ref = next((r for r in plain if r['size'] == reference), None)
+    if ref is not None:
+        for metric in ('page_kb', 'gzip_kb', 'script_kb', 'parse_ms'):
+            if metric in budgets and ref[metric] > budgets[metric]:
+                failures.append((metric, ref[metric], budgets[metric]))
+
+    if 'bytes_per_question' in budgets and len(plain) > 1 and plain[-1]['size'] > plain[0]['size']:
+        per_question = ((plain[-1]['page_kb'] - plain[0]['page_kb']) * 1024
+                        / (plain[-1]['size'] - plain[0]['size']))
+        if per_question > budgets['bytes_per_question']:
+            failures.append(('bytes_per_question', per_question, budgets['bytes_per_question']))
+    return failures
+
+
+def print_results(results: list, course: dict) -> None:
+    print(f"{'Questions':>9} {'Math':<5} {'Load ms':>9} {'Gen ms':>9} {'Page KB':>9} "
+          f"{'gzip KB':>8} {'Script KB':>10} {'Parse ms':>9}")
+    print("-" * 75)
+    for r in results:
+        print(f"{r['size']:>9} {'yes' if r['math'] else 'no':<5} {r['load_ms']:>9.2f} "
+              f"{r['generate_ms']:>9.2f} {r['page_kb']:>9.1f} {r['gzip_kb']:>8.1f} "
+              f"{r['script_kb']:>10.1f} {r['parse_ms']:>9.1f}")
+    print(f"\ngenerate_all_quizzes ({course['quizzes']} x {course['questions']} questions): "
+          f"cold {course['cold_ms']:.0f} ms, incremental {course['incremental_ms']:.0f} ms")
+
+
+def _parse_budget(value: str) -> tuple:
+    name, _, limit = value.partition('=')
+    if name not in DEFAULT_BUDGETS or not limit:
+        raise argparse.ArgumentTypeError(
+            f"expected NAME=VALUE with NAME one of {', '.join(DEFAULT_BUDGETS)}"
+        )
+    return name, float(limit)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the quiz generator and enforce page-weight budgets',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='Budgets: ' + ', '.join(f'{k}={v:g}' for k, v in DEFAULT_BUDGETS.items())
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Bank sizes to benchmark (default: 10 100 1000 10000)')
+    parser.add_argument('--reference', type=int, default=20,
+                        help='Bank size the page budgets apply to (default: 20)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs per measurement (default: 3)')
+    parser.add_argument('--course-quizzes', type=int, default=26,
+                        help='Quizzes in the synthetic course for generate_all_quizzes (default: 26)')
+    parser.add_argument('--budget', type=_parse_budget, action='append', default=[],
+                        metavar='NAME=VALUE', help='Override a budget (repeatable)')
+    parser.add_argument('--no-budgets', action='store_true', help='Report only, never fail')
+    parser.add_argument('--json', type=Path, help='Also write the results as JSON')
+    parser.add_argument('--shared-assets', action='store_true', help='Benchmark with shared CSS/JS assets')
+    parser.add_argument('--production', action='store_true', help='Benchmark production (minified) output')
+    parser.add_argument('--shard-size', type=int, help='Benchmark sharded question banks')
+
+    args = parser.parse_args()
+
+    generator = QuizGenerator(
+        shared_assets=args.shared_assets,
+        production=args.production,
+        shard_size=args.shard_size
+    )
+    budgets = dict(DEFAULT_BUDGETS)
+    budgets.update(args.budget)
+    sizes = sorted(set(args.sizes) | {args.reference})
+
+    with tempfile.TemporaryDirectory(prefix='quiz_bench_') as tmp:
+        work_dir = Path(tmp)
+        results = [bench_bank(generator, work_dir, size, math, args.repeat)
+                   for math in (False, True) for size in sizes]
+        course = bench_course(generator, work_dir, args.course_quizzes, args.reference)
+
+    print_results(results, course)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'banks': results, 'course': course, 'budgets': budgets}, f, indent=2)
+
+    if args.no_budgets:
+        return 0
+
+    failures = check_budgets(results, args.reference, budgets)
+    if failures:
+        print("\nBudget exceeded:")
+        for metric, value, limit in failures:
+            print(f"  {metric}: {value:.1f} > {limit:g}")
+        return 1
+
+    print(f"\nAll budgets met ({args.reference}-question reference page)")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
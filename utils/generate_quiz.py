@@ -6,13 +6,18 @@ Interactive Quiz Generator
 Generates interactive HTML quiz players from questions.json files.
 
 Features:
-- 3-column layout with rolling question replacement
+- 3-column layout with rolling question replacement (only the answered
+  cards are rebuilt; one delegated click handler serves all options)
 - Manual "Next" button for user-controlled pace
 - KaTeX math rendering (LaTeX syntax: $...$)
 - Immediate feedback with explanations
 - Score tracking and results screen
 - Mobile responsive (3 -> 2 -> 1 columns)
 - No server required (static HTML)
+- Optional shared, content-hashed CSS/JS assets (--shared-assets)
+- Production mode: compact JSON, minified output, .gz/.br siblings (--production)
+- Large banks split into JSON shards loaded on demand (--shard-size)
+- Quiz hub page with client-side search over all quizzes (--all)
 
 Usage:
 ------
@@ -25,6 +30,62 @@ python generate_quiz.py --all --course-dir . --output-dir quiz
 # Custom configuration
 python generate_quiz.py --input questions.json --output quiz.html --title "My Quiz" --accent "#8b5cf6"
 
+# Reference shared quiz.<hash>.css / quiz.<hash>.js instead of inlining them
+python generate_quiz.py --all --course-dir . --output-dir quiz --shared-assets
+
+# Production build: minified, with precompressed .gz (and .br) siblings
+python generate_quiz.py --all --course-dir . --output-dir quiz --production --brotli
+
+# Review bank of thousands of questions, 100 per shard
+python generate_quiz.py --input review/questions.json --output quiz/review.html --shard-size 100
+
+# Generate all quizzes from the question bank (see quiz_bank.py)
+python generate_quiz.py --all --bank quiz_bank.sqlite --output-dir quiz
+
+# Serve the quizzes with live reload while editing
+python generate_quiz.py --all --course-dir . --output-dir quiz --serve
+
+Build Options:
+--------------
+Incremental builds: a manifest in the output directory records a hash of
+each questions.json together with the generator (code, template and
+settings). --all regenerates only the quizzes whose hash changed, in
+parallel on a process pool, and writes files atomically and only when their
+bytes differ, so unchanged pages keep their mtimes.
+
+Shared assets (--shared-assets): the player CSS and JavaScript are written
+once per output directory as quiz.<hash>.css and quiz.<hash>.js instead of
+being inlined in every page. The name comes from the content, so the files
+can be served with "Cache-Control: immutable". Only the theme colors and the
+question data stay inline.
+
+Production output (--production): the questions are embedded as compact
+JSON, and HTML, CSS and JavaScript are minified line by line (line breaks are
+kept so JavaScript semicolon insertion is unaffected). Every file also gets
+a gzip sibling (file.html.gz), plus a brotli one with --brotli when the
+optional brotli package is installed, for servers with precompressed-file
+support (e.g. nginx gzip_static/brotli_static).
+
+Large banks (--shard-size N): only the first N questions are inlined; the
+rest are written as JSON shards next to the page (quiz1.1.part2.<hash>.json,
+...) and fetched in the background when fewer than half a shard of unseen
+questions is left. Sharded quizzes must be served rather than opened from disk.
+
+Quiz hub: --all also writes <output-dir>/index.html, a page listing every
+quiz, and search-index.json, a prebuilt inverted index of all question text.
+The hub fetches the index when the search box is first focused and answers
+prefix queries client-side.
+
+Question bank (--bank): quiz_bank.py extracts the questions of the generated
+quiz/*.html pages into an indexed SQLite store, with duplicate detection
+across quizzes; --bank builds the quizzes from that store instead of from
+questions.json files.
+
+Live reload (--serve, --port): the quizzes are rendered in memory and the
+output directory is served on http://127.0.0.1:8000/. Editing a
+questions.json re-renders only that quiz, editing this file re-renders all
+of them, and open pages reload automatically (quiz_server.py).
+
 Questions JSON Format:
 ----------------------
 [
@@ -43,30 +104,52 @@ Math Support:
 Use LaTeX syntax in questions/options/explanations:
 - Inline: $\\mu$, $\\sigma^2$, $\\bar{x}$
 - Display: $$E[X] = \\sum x \\cdot P(x)$$
+
+Whether a quiz uses math is detected at build time using Pandoc's rule for
+$ delimiters, so currency such as "$5 or $10" does not count. Quizzes
+without math get no KaTeX at all. Quizzes with math load KaTeX lazily and
+typeset each question once; the rendered HTML is cached per question id and
+reused when the card is shown again (e.g. after "Try Again"). Pass
+--katex-dir pointing at a local KaTeX dist/ folder to vendor it into
+<output-dir>/vendor/katex/ instead of loading it from the jsDelivr CDN.
 """
 
 import json
 import argparse
+import functools
+import gzip
+import hashlib
+import html as html_lib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 import re
 
+import quiz_bank
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+MANIFEST_NAME = '.quiz_manifest.json'
+KATEX_CDN = 'https://cdn.jsdelivr.net/npm/katex@0.16.9/dist'
+KATEX_VENDOR_DIR = 'vendor/katex'
+KATEX_FILES = ['katex.min.css', 'katex.min.js', 'contrib/auto-render.min.js']
+ASSET_PATTERN = re.compile(r'^quiz\.[0-9a-f]{10}\.(css|js)(\.gz|\.br)?$')
+SEARCH_INDEX_NAME = 'search-index.json'
+HUB_NAME = 'index.html'
+
 
 # =============================================================================
 # HTML TEMPLATE
 # =============================================================================
 
-QUIZ_TEMPLATE = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} | {course_name}</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.css">
-    <script defer src="https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.js"></script>
-    <script defer src="https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/contrib/auto-render.min.js"></script>
-    <style>
-        :root {{
+# Per-page theme variables (filled from QuizGenerator colors)
+QUIZ_THEME_CSS = '''        :root {{
             --mlpurple: {color_primary};
             --mlblue: {color_secondary};
             --quiz-accent: {color_accent};
@@ -81,78 +164,80 @@ QUIZ_TEMPLATE = '''<!DOCTYPE html>
             --text-secondary: #586069;
             --border: #e1e4e8;
         }}
+'''
 
-        * {{ box-sizing: border-box; margin: 0; padding: 0; }}
+# Shared stylesheet, identical for every quiz
+QUIZ_CSS = '''        * { box-sizing: border-box; margin: 0; padding: 0; }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Helvetica, Arial, sans-serif;
             background: var(--bg);
             color: var(--text);
             line-height: 1.4;
             min-height: 100vh;
-        }}
+        }
 
-        .nav {{
+        .nav {
             background: linear-gradient(135deg, var(--mlpurple), var(--mlblue));
             color: white;
             padding: 8px 16px;
             display: flex;
             justify-content: space-between;
             align-items: center;
-        }}
-        .nav-title {{ font-weight: 600; font-size: 14px; }}
-        .nav-links {{ display: flex; gap: 16px; }}
-        .nav-links a {{ color: white; text-decoration: none; font-size: 12px; opacity: 0.9; }}
-        .nav-links a:hover {{ opacity: 1; }}
+        }
+        .nav-title { font-weight: 600; font-size: 14px; }
+        .nav-links { display: flex; gap: 16px; }
+        .nav-links a { color: white; text-decoration: none; font-size: 12px; opacity: 0.9; }
+        .nav-links a:hover { opacity: 1; }
 
-        .quiz-container {{
+        .quiz-container {
             max-width: 1400px;
             margin: 0 auto;
             padding: 12px;
-        }}
+        }
 
-        .quiz-header {{
+        .quiz-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 12px;
             padding: 0 4px;
-        }}
-        .quiz-title {{ font-size: 16px; font-weight: 600; color: var(--mlpurple); }}
-        .quiz-stats {{
+        }
+        .quiz-title { font-size: 16px; font-weight: 600; color: var(--mlpurple); }
+        .quiz-stats {
             display: flex;
             gap: 12px;
             font-size: 12px;
-        }}
-        .stat-badge {{
+        }
+        .stat-badge {
             padding: 4px 10px;
             border-radius: 12px;
             font-weight: 600;
-        }}
-        .stat-progress {{ background: var(--quiz-light); color: var(--quiz-accent); }}
-        .stat-score {{ background: var(--correct-bg); color: var(--correct); }}
+        }
+        .stat-progress { background: var(--quiz-light); color: var(--quiz-accent); }
+        .stat-score { background: var(--correct-bg); color: var(--correct); }
 
-        .progress-bar-container {{
+        .progress-bar-container {
             height: 4px;
             background: var(--border);
             border-radius: 2px;
             margin-bottom: 12px;
-        }}
-        .progress-bar {{
+        }
+        .progress-bar {
             height: 100%;
             background: var(--quiz-accent);
             border-radius: 2px;
             transition: width 0.3s;
-        }}
+        }
 
         /* Three-column layout */
-        .questions-row {{
+        .questions-row {
             display: grid;
             grid-template-columns: repeat(3, 1fr);
             gap: 12px;
-        }}
+        }
 
-        .question-card {{
+        .question-card {
             background: var(--card-bg);
             border-radius: 8px;
             box-shadow: 0 1px 3px rgba(0,0,0,0.1);
@@ -161,54 +246,54 @@ QUIZ_TEMPLATE = '''<!DOCTYPE html>
             flex-direction: column;
             transition: all 0.3s ease;
             min-height: 280px;
-        }}
+        }
 
-        .question-card.answered {{ opacity: 0.7; }}
+        .question-card.answered { opacity: 0.7; }
 
-        .question-card.correct-card {{
+        .question-card.correct-card {
             border: 2px solid var(--correct);
             background: linear-gradient(to bottom, var(--correct-bg), var(--card-bg));
-        }}
+        }
 
-        .question-card.incorrect-card {{
+        .question-card.incorrect-card {
             border: 2px solid var(--incorrect);
             background: linear-gradient(to bottom, var(--incorrect-bg), var(--card-bg));
-        }}
+        }
 
-        .q-header {{
+        .q-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 8px;
-        }}
+        }
 
-        .q-number {{
+        .q-number {
             background: var(--quiz-light);
             color: var(--quiz-accent);
             padding: 2px 8px;
             border-radius: 10px;
             font-size: 10px;
             font-weight: 600;
-        }}
+        }
 
-        .q-status {{ font-size: 14px; }}
+        .q-status { font-size: 14px; }
 
-        .q-text {{
+        .q-text {
             font-size: 13px;
             font-weight: 500;
             margin-bottom: 10px;
             line-height: 1.4;
             flex-grow: 0;
-        }}
+        }
 
-        .options {{
+        .options {
             display: flex;
             flex-direction: column;
             gap: 6px;
             flex-grow: 1;
-        }}
+        }
 
-        .option-btn {{
+        .option-btn {
             display: flex;
             align-items: center;
             gap: 8px;
@@ -221,26 +306,26 @@ QUIZ_TEMPLATE = '''<!DOCTYPE html>
             transition: all 0.15s;
             text-align: left;
             font-size: 12px;
-        }}
+        }
 
-        .option-btn:hover:not(.disabled) {{
+        .option-btn:hover:not(.disabled) {
             border-color: var(--quiz-accent);
             background: var(--quiz-light);
-        }}
+        }
 
-        .option-btn.correct {{
+        .option-btn.correct {
             border-color: var(--correct);
             background: var(--correct-bg);
-        }}
+        }
 
-        .option-btn.incorrect {{
+        .option-btn.incorrect {
             border-color: var(--incorrect);
             background: var(--incorrect-bg);
-        }}
+        }
 
-        .option-btn.disabled {{ cursor: default; }}
+        .option-btn.disabled { cursor: default; }
 
-        .option-letter {{
+        .option-letter {
             width: 20px;
             height: 20px;
             border-radius: 50%;
@@ -251,35 +336,35 @@ QUIZ_TEMPLATE = '''<!DOCTYPE html>
             font-weight: 600;
             font-size: 10px;
             flex-shrink: 0;
-        }}
+        }
 
-        .option-btn.correct .option-letter {{
+        .option-btn.correct .option-letter {
             background: var(--correct);
             color: white;
-        }}
+        }
 
-        .option-btn.incorrect .option-letter {{
+        .option-btn.incorrect .option-letter {
             background: var(--incorrect);
             color: white;
-        }}
+        }
 
-        .option-text {{ flex: 1; }}
+        .option-text { flex: 1; }
 
-        .feedback {{
+        .feedback {
             margin-top: 8px;
             padding: 8px;
             border-radius: 6px;
             font-size: 10px;
             line-height: 1.4;
             display: none;
-        }}
+        }
 
-        .feedback.show {{ display: block; }}
-        .feedback.correct {{ background: var(--correct-bg); color: #166534; }}
-        .feedback.incorrect {{ background: var(--incorrect-bg); color: #991b1b; }}
+        .feedback.show { display: block; }
+        .feedback.correct { background: var(--correct-bg); color: #166534; }
+        .feedback.incorrect { background: var(--incorrect-bg); color: #991b1b; }
 
         /* Results */
-        .results-card {{
+        .results-card {
             background: var(--card-bg);
             border-radius: 10px;
             box-shadow: 0 1px 3px rgba(0,0,0,0.1);
@@ -288,27 +373,27 @@ QUIZ_TEMPLATE = '''<!DOCTYPE html>
             max-width: 500px;
             margin: 40px auto;
             display: none;
-        }}
-        .results-card.show {{ display: block; }}
-        .results-icon {{ font-size: 48px; margin-bottom: 8px; }}
-        .results-score {{ font-size: 36px; font-weight: 700; color: var(--quiz-accent); }}
-        .results-label {{ font-size: 14px; color: var(--text-secondary); margin-bottom: 16px; }}
-        .results-grade {{
+        }
+        .results-card.show { display: block; }
+        .results-icon { font-size: 48px; margin-bottom: 8px; }
+        .results-score { font-size: 36px; font-weight: 700; color: var(--quiz-accent); }
+        .results-label { font-size: 14px; color: var(--text-secondary); margin-bottom: 16px; }
+        .results-grade {
             display: inline-block;
             padding: 6px 16px;
             border-radius: 16px;
             font-size: 13px;
             font-weight: 600;
             margin-bottom: 20px;
-        }}
-        .grade-a {{ background: #dcfce7; color: #166534; }}
-        .grade-b {{ background: #dbeafe; color: #1e40af; }}
-        .grade-c {{ background: #fef3c7; color: #92400e; }}
-        .grade-d {{ background: #fed7aa; color: #9a3412; }}
-        .grade-f {{ background: #fee2e2; color: #991b1b; }}
-
-        .results-buttons {{ display: flex; gap: 12px; justify-content: center; flex-wrap: wrap; }}
-        .btn {{
+        }
+        .grade-a { background: #dcfce7; color: #166534; }
+        .grade-b { background: #dbeafe; color: #1e40af; }
+        .grade-c { background: #fef3c7; color: #92400e; }
+        .grade-d { background: #fed7aa; color: #9a3412; }
+        .grade-f { background: #fee2e2; color: #991b1b; }
+
+        .results-buttons { display: flex; gap: 12px; justify-content: center; flex-wrap: wrap; }
+        .btn {
             padding: 8px 16px;
             border-radius: 6px;
             font-size: 12px;
@@ -316,18 +401,18 @@ QUIZ_TEMPLATE = '''<!DOCTYPE html>
             cursor: pointer;
             border: none;
             text-decoration: none;
-        }}
-        .btn-primary {{ background: var(--quiz-accent); color: white; }}
-        .btn-primary:hover {{ background: #7c3aed; }}
-        .btn-secondary {{ background: var(--card-bg); color: var(--text); border: 1px solid var(--border); }}
+        }
+        .btn-primary { background: var(--quiz-accent); color: white; }
+        .btn-primary:hover { background: #7c3aed; }
+        .btn-secondary { background: var(--card-bg); color: var(--text); border: 1px solid var(--border); }
 
         /* Next button container */
-        .next-btn-container {{
+        .next-btn-container {
             display: flex;
             justify-content: center;
             margin-top: 16px;
-        }}
-        .btn-next {{
+        }
+        .btn-next {
             padding: 10px 32px;
             border-radius: 8px;
             font-size: 14px;
@@ -338,73 +423,33 @@ QUIZ_TEMPLATE = '''<!DOCTYPE html>
             color: white;
             transition: all 0.2s;
             display: none;
-        }}
-        .btn-next:hover {{ background: #7c3aed; transform: scale(1.02); }}
-        .btn-next.show {{ display: inline-block; }}
-        .btn-next:disabled {{ opacity: 0.5; cursor: not-allowed; }}
-
-        @media (max-width: 900px) {{
-            .questions-row {{ grid-template-columns: repeat(2, 1fr); }}
-        }}
-        @media (max-width: 600px) {{
-            .questions-row {{ grid-template-columns: 1fr; }}
-            .question-card {{ min-height: auto; }}
-        }}
-    </style>
-</head>
-<body>
-    <nav class="nav">
-        <div class="nav-title">{nav_title}</div>
-        <div class="nav-links">
-            <a href="{dashboard_url}">Dashboard</a>
-            {pdf_link}
-            <a href="{github_url}" target="_blank">GitHub</a>
-        </div>
-    </nav>
-
-    <main class="quiz-container">
-        <div class="quiz-header">
-            <div class="quiz-title">{quiz_subtitle}</div>
-            <div class="quiz-stats">
-                <span class="stat-badge stat-progress" id="progressBadge">0/{total_questions}</span>
-                <span class="stat-badge stat-score" id="scoreBadge">Score: 0</span>
-            </div>
-        </div>
-
-        <div class="progress-bar-container">
-            <div class="progress-bar" id="progressBar" style="width: 0%"></div>
-        </div>
-
-        <div class="questions-row" id="questionsRow"></div>
-
-        <div class="next-btn-container">
-            <button class="btn-next" id="nextBtn" onclick="loadNextQuestions()">Next</button>
-        </div>
-
-        <div class="results-card" id="resultsCard">
-            <div class="results-icon" id="resultsIcon"></div>
-            <div class="results-score" id="resultsScore"></div>
-            <div class="results-label">Correct Answers</div>
-            <div class="results-grade" id="resultsGrade"></div>
-            <div class="results-buttons">
-                <button class="btn btn-primary" onclick="restartQuiz()">Try Again</button>
-                <a href="{dashboard_url}" class="btn btn-secondary">Dashboard</a>
-            </div>
-        </div>
-    </main>
-
-    <script>
-        const quizData = {{
-            questions: {questions_json}
-        }};
+        }
+        .btn-next:hover { background: #7c3aed; transform: scale(1.02); }
+        .btn-next.show { display: inline-block; }
+        .btn-next:disabled { opacity: 0.5; cursor: not-allowed; }
+
+        @media (max-width: 900px) {
+            .questions-row { grid-template-columns: repeat(2, 1fr); }
+        }
+        @media (max-width: 600px) {
+            .questions-row { grid-template-columns: 1fr; }
+            .question-card { min-height: auto; }
+        }
+'''
 
-        const state = {{
+# Shared player script; reads the page's inline quizData
+QUIZ_JS = '''        const state = {
             currentIndex: 0,
-            answers: {{}},
+            answers: {},
             score: 0,
             displayedQuestions: [],
             pendingSlots: []
-        }};
+        };
+
+        // Card element per slot, and typeset HTML per question id so math is
+        // only rendered once even after restarts
+        const cardsBySlot = [];
+        const mathCache = {};
 
         const questionsRow = document.getElementById('questionsRow');
         const progressBar = document.getElementById('progressBar');
@@ -413,179 +458,522 @@ QUIZ_TEMPLATE = '''<!DOCTYPE html>
         const resultsCard = document.getElementById('resultsCard');
         const nextBtn = document.getElementById('nextBtn');
 
-        function initQuiz() {{
+        function initQuiz() {
             state.currentIndex = 0;
-            state.answers = {{}};
+            state.answers = {};
             state.score = 0;
             state.displayedQuestions = [];
             state.pendingSlots = [];
 
             resultsCard.classList.remove('show');
             questionsRow.style.display = 'grid';
+            questionsRow.innerHTML = '';
+            cardsBySlot.length = 0;
             nextBtn.classList.remove('show');
 
             // Show first 3 questions
-            for (let i = 0; i < 3 && i < quizData.questions.length; i++) {{
+            for (let i = 0; i < 3 && i < quizData.questions.length; i++) {
                 state.displayedQuestions.push(i);
-            }}
+                mountCard(i);
+            }
             state.currentIndex = Math.min(3, quizData.questions.length);
 
-            renderQuestions();
             updateStats();
-        }}
-
-        function renderQuestions() {{
-            questionsRow.innerHTML = '';
-
-            state.displayedQuestions.forEach((qIdx, slot) => {{
-                const q = quizData.questions[qIdx];
-                const answered = state.answers[q.id] !== undefined;
-                const isCorrect = answered && state.answers[q.id] === q.correct;
-                const isIncorrect = answered && state.answers[q.id] !== q.correct;
-
-                const card = document.createElement('div');
-                card.className = 'question-card';
-                if (isCorrect) card.classList.add('correct-card', 'answered');
-                if (isIncorrect) card.classList.add('incorrect-card', 'answered');
-
-                card.innerHTML = `
-                    <div class="q-header">
-                        <span class="q-number">Q${{qIdx + 1}}</span>
-                        ${{answered ? `<span class="q-status">${{isCorrect ? '&#10004;' : '&#10008;'}}</span>` : ''}}
-                    </div>
-                    <div class="q-text">${{q.question}}</div>
-                    <div class="options" data-qid="${{q.id}}" data-slot="${{slot}}">
-                        ${{['A','B','C','D'].map(letter => {{
-                            let optClass = 'option-btn';
-                            if (answered) {{
-                                optClass += ' disabled';
-                                if (letter === q.correct) optClass += ' correct';
-                                else if (letter === state.answers[q.id]) optClass += ' incorrect';
-                            }}
-                            return `
-                                <button class="${{optClass}}" data-letter="${{letter}}" ${{answered ? 'disabled' : ''}}>
-                                    <span class="option-letter">${{letter}}</span>
-                                    <span class="option-text">${{q.options[letter]}}</span>
-                                </button>
-                            `;
-                        }}).join('')}}
-                    </div>
-                    <div class="feedback ${{answered ? 'show' : ''}} ${{isCorrect ? 'correct' : 'incorrect'}}">
-                        ${{answered ? (isCorrect ? '&#10004; ' : `&#10008; Answer: ${{q.correct}}. `) + q.explanation : ''}}
-                    </div>
-                `;
-
-                // Add click handlers
-                if (!answered) {{
-                    card.querySelectorAll('.option-btn').forEach(btn => {{
-                        btn.addEventListener('click', () => handleAnswer(qIdx, slot, btn.dataset.letter));
-                    }});
-                }}
-
-                questionsRow.appendChild(card);
-            }});
-
-            renderMath();
-        }}
+            prefetchShard();
+        }
 
-        function handleAnswer(qIdx, slot, letter) {{
+        function mountCard(slot) {
+            const qIdx = state.displayedQuestions[slot];
             const q = quizData.questions[qIdx];
+            const cached = mathCache[q.id] || {};
+
+            const card = document.createElement('div');
+            card.className = 'question-card';
+            card.dataset.slot = slot;
+            card.innerHTML = `
+                <div class="q-header">
+                    <span class="q-number">Q${qIdx + 1}</span>
+                    <span class="q-status"></span>
+                </div>
+                <div class="q-text">${cached.question || q.question}</div>
+                <div class="options">
+                    ${['A','B','C','D'].map(letter => `
+                        <button class="option-btn" data-letter="${letter}">
+                            <span class="option-letter">${letter}</span>
+                            <span class="option-text">${(cached.options || q.options)[letter]}</span>
+                        </button>
+                    `).join('')}
+                </div>
+                <div class="feedback"></div>
+            `;
+
+            const previous = cardsBySlot[slot];
+            if (previous) questionsRow.replaceChild(card, previous);
+            else questionsRow.appendChild(card);
+            cardsBySlot[slot] = card;
+
+            if (quizData.math && !cached.question) {
+                renderMath(card).then(ok => {
+                    if (!ok) return;
+                    const options = {};
+                    card.querySelectorAll('.option-btn').forEach(btn => {
+                        options[btn.dataset.letter] = btn.querySelector('.option-text').innerHTML;
+                    });
+                    mathCache[q.id] = Object.assign(mathCache[q.id] || {}, {
+                        question: card.querySelector('.q-text').innerHTML,
+                        options: options
+                    });
+                });
+            }
+        }
+
+        function markAnswered(slot) {
+            const card = cardsBySlot[slot];
+            const q = quizData.questions[state.displayedQuestions[slot]];
+            const chosen = state.answers[q.id];
+            const isCorrect = chosen === q.correct;
+
+            card.classList.add(isCorrect ? 'correct-card' : 'incorrect-card', 'answered');
+            card.querySelector('.q-status').innerHTML = isCorrect ? '&#10004;' : '&#10008;';
+            card.querySelectorAll('.option-btn').forEach(btn => {
+                btn.disabled = true;
+                btn.classList.add('disabled');
+                if (btn.dataset.letter === q.correct) btn.classList.add('correct');
+                else if (btn.dataset.letter === chosen) btn.classList.add('incorrect');
+            });
+
+            const cached = mathCache[q.id] || {};
+            const feedback = card.querySelector('.feedback');
+            feedback.className = `feedback show ${isCorrect ? 'correct' : 'incorrect'}`;
+            feedback.innerHTML = (isCorrect ? '&#10004; ' : `&#10008; Answer: ${q.correct}. `) +
+                `<span class="feedback-text">${cached.explanation || q.explanation}</span>`;
+
+            if (quizData.math && !cached.explanation) {
+                const text = feedback.querySelector('.feedback-text');
+                renderMath(text).then(ok => {
+                    if (ok) mathCache[q.id] = Object.assign(mathCache[q.id] || {}, {explanation: text.innerHTML});
+                });
+            }
+        }
+
+        // One delegated listener for every option button, present and future
+        questionsRow.addEventListener('click', event => {
+            const btn = event.target.closest('.option-btn');
+            if (!btn || btn.disabled) return;
+            const card = btn.closest('.question-card');
+            handleAnswer(Number(card.dataset.slot), btn.dataset.letter);
+        });
+
+        function handleAnswer(slot, letter) {
+            const q = quizData.questions[state.displayedQuestions[slot]];
+            if (state.answers[q.id] !== undefined) return;
             state.answers[q.id] = letter;
 
             if (letter === q.correct) state.score++;
 
             // Track this slot as pending replacement
-            if (!state.pendingSlots.includes(slot)) {{
+            if (!state.pendingSlots.includes(slot)) {
                 state.pendingSlots.push(slot);
-            }}
+            }
 
+            markAnswered(slot);
             updateStats();
-            renderQuestions();
 
             // Check if all questions answered
             const answered = Object.keys(state.answers).length;
-            if (answered >= quizData.questions.length) {{
+            if (answered >= quizData.total) {
                 // Short delay then show results
                 setTimeout(showResults, 800);
-            }} else if (state.currentIndex < quizData.questions.length && state.pendingSlots.length > 0) {{
+            } else if (state.currentIndex < quizData.total && state.pendingSlots.length > 0) {
                 // Show Next button if there are more questions and pending slots
                 nextBtn.classList.add('show');
-            }}
-        }}
-
-        function loadNextQuestions() {{
-            // Replace pending slots with new questions
-            while (state.pendingSlots.length > 0 && state.currentIndex < quizData.questions.length) {{
-                const slot = state.pendingSlots.shift();
-                state.displayedQuestions[slot] = state.currentIndex;
-                state.currentIndex++;
-            }}
+            }
+        }
 
+        function loadNextQuestions() {
             // Hide Next button
             nextBtn.classList.remove('show');
 
-            renderQuestions();
-
-            // Check if quiz is complete (all displayed questions answered)
-            const answered = Object.keys(state.answers).length;
-            if (answered >= quizData.questions.length) {{
-                setTimeout(showResults, 500);
-            }}
-        }}
-
-        function updateStats() {{
+            const needed = state.currentIndex + state.pendingSlots.length;
+            ensureQuestions(needed).then(() => {
+                // Replace only the pending slots with new questions
+                while (state.pendingSlots.length > 0 && state.currentIndex < quizData.questions.length) {
+                    const slot = state.pendingSlots.shift();
+                    state.displayedQuestions[slot] = state.currentIndex;
+                    state.currentIndex++;
+                    mountCard(slot);
+                }
+                prefetchShard();
+
+                // Check if quiz is complete (all displayed questions answered)
+                const answered = Object.keys(state.answers).length;
+                if (answered >= quizData.total) {
+                    setTimeout(showResults, 500);
+                }
+            }, () => {
+                // Shard failed to load; let the user retry
+                nextBtn.classList.add('show');
+            });
+        }
+
+        // Large banks inline only their first shard; the rest are fetched in
+        // order and appended to quizData.questions as the user advances
+        let shardsLoaded = 0;
+        let shardRequest = null;
+
+        function loadNextShard() {
+            if (!shardRequest) {
+                shardRequest = fetch(quizData.shards[shardsLoaded])
+                    .then(response => {
+                        if (!response.ok) throw new Error(response.statusText);
+                        return response.json();
+                    })
+                    .then(questions => {
+                        quizData.questions.push(...questions);
+                        shardsLoaded++;
+                    })
+                    .finally(() => { shardRequest = null; });
+            }
+            return shardRequest;
+        }
+
+        function ensureQuestions(count) {
+            if (quizData.questions.length >= Math.min(count, quizData.total) ||
+                shardsLoaded >= quizData.shards.length) {
+                return Promise.resolve();
+            }
+            return loadNextShard().then(() => ensureQuestions(count));
+        }
+
+        function prefetchShard() {
+            // Fetch the next shard once fewer than half a shard is left unseen
+            const shardSize = quizData.shards.length ? quizData.questions.length / (shardsLoaded + 1) : 0;
+            if (shardsLoaded < quizData.shards.length &&
+                quizData.questions.length - state.currentIndex < shardSize / 2) {
+                loadNextShard().catch(() => {});
+            }
+        }
+
+        function updateStats() {
             const answered = Object.keys(state.answers).length;
-            const total = quizData.questions.length;
+            const total = quizData.total;
 
-            progressBar.style.width = `${{(answered / total) * 100}}%`;
-            progressBadge.textContent = `${{answered}}/${{total}}`;
-            scoreBadge.textContent = `Score: ${{state.score}}`;
-        }}
+            progressBar.style.width = `${(answered / total) * 100}%`;
+            progressBadge.textContent = `${answered}/${total}`;
+            scoreBadge.textContent = `Score: ${state.score}`;
+        }
 
-        function showResults() {{
+        function showResults() {
             questionsRow.style.display = 'none';
             nextBtn.classList.remove('show');
             resultsCard.classList.add('show');
 
-            const total = quizData.questions.length;
+            const total = quizData.total;
             const percentage = Math.round((state.score / total) * 100);
 
-            document.getElementById('resultsScore').textContent = `${{state.score}}/${{total}}`;
+            document.getElementById('resultsScore').textContent = `${state.score}/${total}`;
 
             let grade, gradeClass, icon;
-            if (percentage >= 90) {{ grade = 'Excellent! A'; gradeClass = 'grade-a'; icon = '&#127942;'; }}
-            else if (percentage >= 80) {{ grade = 'Great! B'; gradeClass = 'grade-b'; icon = '&#11088;'; }}
-            else if (percentage >= 70) {{ grade = 'Good! C'; gradeClass = 'grade-c'; icon = '&#128077;'; }}
-            else if (percentage >= 60) {{ grade = 'Pass - D'; gradeClass = 'grade-d'; icon = '&#128221;'; }}
-            else {{ grade = 'Keep practicing'; gradeClass = 'grade-f'; icon = '&#128218;'; }}
+            if (percentage >= 90) { grade = 'Excellent! A'; gradeClass = 'grade-a'; icon = '&#127942;'; }
+            else if (percentage >= 80) { grade = 'Great! B'; gradeClass = 'grade-b'; icon = '&#11088;'; }
+            else if (percentage >= 70) { grade = 'Good! C'; gradeClass = 'grade-c'; icon = '&#128077;'; }
+            else if (percentage >= 60) { grade = 'Pass - D'; gradeClass = 'grade-d'; icon = '&#128221;'; }
+            else { grade = 'Keep practicing'; gradeClass = 'grade-f'; icon = '&#128218;'; }
 
             document.getElementById('resultsIcon').innerHTML = icon;
             const gradeEl = document.getElementById('resultsGrade');
-            gradeEl.textContent = `${{grade}} (${{percentage}}%)`;
-            gradeEl.className = `results-grade ${{gradeClass}}`;
-        }}
+            gradeEl.textContent = `${grade} (${percentage}%)`;
+            gradeEl.className = `results-grade ${gradeClass}`;
+        }
 
-        function restartQuiz() {{
+        function restartQuiz() {
             initQuiz();
-        }}
+        }
+
+        // KaTeX is only configured for quizzes that contain math, and is
+        // loaded on first use rather than blocking the page
+        let katexReady = null;
+
+        function loadScript(src) {
+            return new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = src;
+                script.onload = resolve;
+                script.onerror = reject;
+                document.head.appendChild(script);
+            });
+        }
+
+        function loadKatex() {
+            if (!katexReady) {
+                const link = document.createElement('link');
+                link.rel = 'stylesheet';
+                link.href = quizData.math.css;
+                document.head.appendChild(link);
+                katexReady = loadScript(quizData.math.js)
+                    .then(() => loadScript(quizData.math.autoRender))
+                    .then(() => true, () => false);
+            }
+            return katexReady;
+        }
+
+        function renderMath(element) {
+            return loadKatex().then(ok => {
+                if (ok) {
+                    renderMathInElement(element, {
+                        delimiters: [
+                            {left: '$$', right: '$$', display: true},
+                            {left: '$', right: '$', display: false}
+                        ],
+                        throwOnError: false
+                    });
+                }
+                return ok;
+            });
+        }
+
+        document.addEventListener('DOMContentLoaded', () => {
+            initQuiz();
+        });
+'''
 
-        function renderMath() {{
-            if (typeof renderMathInElement !== 'undefined') {{
-                renderMathInElement(document.body, {{
-                    delimiters: [
-                        {{left: '$$', right: '$$', display: true}},
-                        {{left: '$', right: '$', display: false}}
-                    ],
-                    throwOnError: false
-                }});
-            }}
-        }}
+QUIZ_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} | {course_name}</title>
+    <style>
+{theme_css}    </style>
+{styles}
+</head>
+<body>
+    <nav class="nav">
+        <div class="nav-title">{nav_title}</div>
+        <div class="nav-links">
+            <a href="{dashboard_url}">Dashboard</a>
+            {pdf_link}
+            <a href="{github_url}" target="_blank">GitHub</a>
+        </div>
+    </nav>
 
-        document.addEventListener('DOMContentLoaded', () => {{
-            initQuiz();
-            setTimeout(renderMath, 100);
-        }});
+    <main class="quiz-container">
+        <div class="quiz-header">
+            <div class="quiz-title">{quiz_subtitle}</div>
+            <div class="quiz-stats">
+                <span class="stat-badge stat-progress" id="progressBadge">0/{total_questions}</span>
+                <span class="stat-badge stat-score" id="scoreBadge">Score: 0</span>
+            </div>
+        </div>
+
+        <div class="progress-bar-container">
+            <div class="progress-bar" id="progressBar" style="width: 0%"></div>
+        </div>
+
+        <div class="questions-row" id="questionsRow"></div>
+
+        <div class="next-btn-container">
+            <button class="btn-next" id="nextBtn" onclick="loadNextQuestions()">Next</button>
+        </div>
+
+        <div class="results-card" id="resultsCard">
+            <div class="results-icon" id="resultsIcon"></div>
+            <div class="results-score" id="resultsScore"></div>
+            <div class="results-label">Correct Answers</div>
+            <div class="results-grade" id="resultsGrade"></div>
+            <div class="results-buttons">
+                <button class="btn btn-primary" onclick="restartQuiz()">Try Again</button>
+                <a href="{dashboard_url}" class="btn btn-secondary">Dashboard</a>
+            </div>
+        </div>
+    </main>
+
+    <script>
+        const quizData = {{
+            questions: {questions_json},
+            total: {total},
+            shards: {shards_json},
+            math: {math_json}
+        }};
     </script>
+{scripts}
+</body>
+</html>
+'''
+
+
+# Quiz hub: list of all quizzes plus search over the prebuilt index
+HUB_CSS = '''        .hub-search {
+            width: 100%;
+            padding: 10px 14px;
+            font-size: 14px;
+            border: 2px solid var(--border);
+            border-radius: 8px;
+            margin-bottom: 12px;
+            outline: none;
+        }
+        .hub-search:focus { border-color: var(--quiz-accent); }
+        .hub-results { margin-bottom: 16px; }
+        .hub-result {
+            display: block;
+            background: var(--card-bg);
+            border: 1px solid var(--border);
+            border-left: 3px solid var(--quiz-accent);
+            border-radius: 6px;
+            padding: 8px 12px;
+            margin-bottom: 6px;
+            color: var(--text);
+            text-decoration: none;
+            font-size: 13px;
+        }
+        .hub-result:hover { box-shadow: 0 2px 6px rgba(0,0,0,0.1); }
+        .hub-result small { display: block; color: var(--text-secondary); font-size: 11px; margin-bottom: 2px; }
+        .hub-status { color: var(--text-secondary); font-size: 12px; margin-bottom: 8px; }
+        .hub-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(260px, 1fr));
+            gap: 8px;
+        }
+        .hub-quiz {
+            background: var(--card-bg);
+            border: 1px solid var(--border);
+            border-radius: 6px;
+            padding: 10px 12px;
+            color: var(--mlpurple);
+            text-decoration: none;
+            font-size: 13px;
+            font-weight: 600;
+        }
+        .hub-quiz:hover { border-color: var(--quiz-accent); }
+        .hub-quiz small { display: block; color: var(--text-secondary); font-weight: 400; font-size: 11px; }
+'''
+
+HUB_JS = '''        const searchBox = document.getElementById('searchBox');
+        const searchResults = document.getElementById('searchResults');
+        const searchStatus = document.getElementById('searchStatus');
+        const MAX_RESULTS = 50;
+
+        // The index is only fetched once the user starts searching
+        let indexReady = null;
+        let terms = null;
+
+        function loadIndex() {
+            if (!indexReady) {
+                indexReady = fetch(SEARCH_INDEX_URL)
+                    .then(response => response.json())
+                    .then(index => {
+                        // Postings are delta-encoded document numbers
+                        for (const term in index.terms) {
+                            let doc = 0;
+                            index.terms[term] = index.terms[term].map(delta => doc += delta);
+                        }
+                        index.stop = new Set(index.stop);
+                        terms = Object.keys(index.terms).sort();
+                        return index;
+                    });
+            }
+            return indexReady;
+        }
+
+        function tokenize(text) {
+            return text.toLowerCase().match(/[\\p{L}\\p{N}]+/gu) || [];
+        }
+
+        // Documents containing any indexed term that starts with prefix
+        function prefixMatches(index, prefix) {
+            let lo = 0, hi = terms.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (terms[mid] < prefix) lo = mid + 1; else hi = mid;
+            }
+            const docs = new Set();
+            for (let i = lo; i < terms.length && terms[i].startsWith(prefix); i++) {
+                index.terms[terms[i]].forEach(doc => docs.add(doc));
+            }
+            return docs;
+        }
+
+        function search(index, query) {
+            const tokens = tokenize(query).filter(t => !index.stop.has(t));
+            if (!tokens.length) return null;
+            let result = null;
+            for (const token of tokens) {
+                const docs = prefixMatches(index, token);
+                result = result ? new Set([...result].filter(doc => docs.has(doc))) : docs;
+                if (!result.size) break;
+            }
+            return [...result];
+        }
+
+        function showResults(index, docs) {
+            searchResults.innerHTML = '';
+            if (docs === null) {
+                searchStatus.textContent = '';
+                return;
+            }
+            searchStatus.textContent = `${docs.length} matching question${docs.length === 1 ? '' : 's'}`;
+            const fragment = document.createDocumentFragment();
+            for (const doc of docs.slice(0, MAX_RESULTS)) {
+                const [quizIdx, qid, text] = index.docs[doc];
+                const [page, title] = index.quizzes[quizIdx];
+                const link = document.createElement('a');
+                link.className = 'hub-result';
+                link.href = page;
+                link.innerHTML = `<small>${title} &middot; Q${qid}</small>`;
+                link.appendChild(document.createTextNode(text));
+                fragment.appendChild(link);
+            }
+            searchResults.appendChild(fragment);
+        }
+
+        searchBox.addEventListener('focus', loadIndex, { once: true });
+        searchBox.addEventListener('input', () => {
+            const query = searchBox.value;
+            loadIndex().then(index => {
+                // Ignore responses for queries the user has already changed
+                if (query === searchBox.value) showResults(index, search(index, query));
+            });
+        });
+'''
+
+HUB_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Quizzes | {course_name}</title>
+    <style>
+{theme_css}    </style>
+{styles}
+    <style>
+{hub_css}    </style>
+</head>
+<body>
+    <nav class="nav">
+        <div class="nav-title">{course_name} Quizzes</div>
+        <div class="nav-links">
+            <a href="{dashboard_url}">Dashboard</a>
+            <a href="{github_url}" target="_blank">GitHub</a>
+        </div>
+    </nav>
+
+    <main class="quiz-container">
+        <div class="quiz-header">
+            <div class="quiz-title">{quiz_count} Quizzes, {question_count} Questions</div>
+        </div>
+
+        <input class="hub-search" id="searchBox" type="search" placeholder="Search all questions and explanations" autocomplete="off">
+        <div class="hub-status" id="searchStatus"></div>
+        <div class="hub-results" id="searchResults"></div>
+
+        <div class="hub-grid">
+{quiz_links}
+        </div>
+    </main>
+
+    <script>
+        const SEARCH_INDEX_URL = '{search_index_url}';
+{hub_js}    </script>
 </body>
 </html>
 '''
@@ -606,7 +994,12 @@ class QuizGenerator:
         color_accent: str = "#8b5cf6",
         color_accent_light: str = "#ede9fe",
         dashboard_url: str = "../index.html",
-        github_url: str = "https://github.com/Digital-AI-Finance/Digital-Finance-Introduction"
+        github_url: str = "https://github.com/Digital-AI-Finance/Digital-Finance-Introduction",
+        shared_assets: bool = False,
+        production: bool = False,
+        use_brotli: bool = False,
+        katex_dir: Optional[Path] = None,
+        shard_size: Optional[int] = None
     ):
         self.course_name = course_name
         self.color_primary = color_primary
@@ -615,6 +1008,100 @@ class QuizGenerator:
         self.color_accent_light = color_accent_light
         self.dashboard_url = dashboard_url
         self.github_url = github_url
+        self.shared_assets = shared_assets
+        self.production = production
+        self.use_brotli = use_brotli
+        self.katex_dir = katex_dir
+        self.shard_size = shard_size
+
+    def _player_css(self) -> str:
+        return minify_source(QUIZ_CSS) if self.production else QUIZ_CSS
+
+    def _player_js(self) -> str:
+        return minify_source(QUIZ_JS) if self.production else QUIZ_JS
+
+    def _theme_css(self) -> str:
+        return QUIZ_THEME_CSS.format(
+            color_primary=self.color_primary,
+            color_secondary=self.color_secondary,
+            color_accent=self.color_accent,
+            color_accent_light=self.color_accent_light
+        )
+
+    def _styles_html(self) -> str:
+        """Player stylesheet: inline, or a link to the shared hashed asset."""
+        if self.shared_assets:
+            css_name = list(self.asset_files())[0]
+            return f'    <link rel="stylesheet" href="{css_name}">'
+        return f'    <style>\n{self._player_css()}    </style>'
+
+    def asset_files(self) -> dict:
+        """Shared asset file names mapped to their content."""
+        css, js = self._player_css(), self._player_js()
+        return {
+            _hashed_name('quiz', 'css', css): css,
+            _hashed_name('quiz', 'js', js): js,
+        }
+
+    def write_output(self, path: Path, content: Union[str, bytes]) -> bool:
+        """Write a generated file, plus compressed siblings in production mode."""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        changed = write_if_changed(path, data)
+        if self.production:
+            write_compressed_siblings(path, data, use_brotli=self.use_brotli)
+        return changed
+
+    def math_config(self, questions: list) -> Optional[dict]:
+        """KaTeX URLs for a quiz that uses math, or None if it has no math."""
+        if not questions_use_math(questions):
+            return None
+        base = KATEX_VENDOR_DIR if self.katex_dir else KATEX_CDN
+        css, js, auto_render = (f'{base}/{name}' for name in KATEX_FILES)
+        return {'css': css, 'js': js, 'autoRender': auto_render}
+
+    def vendor_math(self, questions: list, output_dir: Path) -> None:
+        """Copy the local KaTeX build next to a quiz that needs it."""
+        if not self.katex_dir or not questions_use_math(questions):
+            return
+        target = output_dir / KATEX_VENDOR_DIR
+        for name in KATEX_FILES:
+            write_if_changed(target / name, (self.katex_dir / name).read_bytes())
+        fonts = self.katex_dir / 'fonts'
+        if fonts.is_dir():
+            for font in fonts.iterdir():
+                write_if_changed(target / 'fonts' / font.name, font.read_bytes())
+
+    def write_shared_assets(self, output_dir: Path) -> list:
+        """Write the shared CSS/JS into output_dir; returns the asset paths."""
+        paths = []
+        for name, content in self.asset_files().items():
+            self.write_output(output_dir / name, content)
+            paths.append(output_dir / name)
+        return paths
+
+    def question_shards(self, questions: list, stem: str) -> dict:
+        """Shard files for the questions after the inline first shard.
+
+        Returns file names mapped to compact JSON, in bank order. Names are
+        content-hashed (quiz1.1.part2.<hash>.json), so a changed shard never
+        reuses a cached URL. Empty unless shard_size is set and exceeded.
+        """
+        if not self.shard_size or len(questions) <= self.shard_size:
+            return {}
+        shards = {}
+        for part, start in enumerate(range(self.shard_size, len(questions), self.shard_size), start=2):
+            content = json.dumps(questions[start:start + self.shard_size],
+                                 ensure_ascii=False, separators=(',', ':'))
+            shards[_hashed_name(f'{stem}.part{part}', 'json', content)] = content
+        return shards
+
+    def write_shards(self, questions: list, output_path: Path) -> list:
+        """Write the question shards for a page and drop ones it no longer uses."""
+        shards = self.question_shards(questions, output_path.stem)
+        for name, content in shards.items():
+            self.write_output(output_path.parent / name, content)
+        remove_stale_shards(output_path, list(shards))
+        return [output_path.parent / name for name in shards]
 
     def load_questions(self, json_path: Path) -> list:
         """Load questions from JSON file.
@@ -639,56 +1126,94 @@ class QuizGenerator:
 
         return questions
 
-    def generate_quiz(
+    def render_quiz(
         self,
         questions: list,
         title: str,
         subtitle: str,
-        output_path: Path,
         pdf_url: Optional[str] = None,
-        nav_title: Optional[str] = None
-    ) -> Path:
-        """Generate an interactive quiz HTML file."""
+        nav_title: Optional[str] = None,
+        shard_stem: str = 'quiz',
+        course_name: Optional[str] = None
+    ) -> str:
+        """Render an interactive quiz page to an HTML string.
+
+        With shard_size set, only the first shard_size questions are inlined;
+        the rest are listed as shard URLs named after shard_stem (the stem of
+        the output file) and fetched by the player as it advances.
+        course_name replaces the generator's in the page <title>, e.g. to keep
+        the course of a page extracted into the question bank.
+        """
+        shards = list(self.question_shards(questions, shard_stem))
+        inline = questions[:self.shard_size] if shards else questions
 
         # Format questions as JSON string
-        questions_json = json.dumps(questions, ensure_ascii=False, indent=16)
+        if self.production:
+            questions_json = json.dumps(inline, ensure_ascii=False, separators=(',', ':'))
+        else:
+            questions_json = json.dumps(inline, ensure_ascii=False, indent=16)
 
         # PDF link HTML
         pdf_link = f'<a href="{pdf_url}">PDF</a>' if pdf_url else ''
 
+        math_json = json.dumps(self.math_config(questions))
+
+        # Player CSS/JS: inline, or links to the shared hashed assets
+        if self.shared_assets:
+            js_name = list(self.asset_files())[1]
+            scripts = f'    <script src="{js_name}"></script>'
+        else:
+            scripts = f'    <script>\n{self._player_js()}    </script>'
+        styles = self._styles_html()
+        theme_css = self._theme_css()
+
         # Generate HTML
         html = QUIZ_TEMPLATE.format(
             title=title,
-            course_name=self.course_name,
-            color_primary=self.color_primary,
-            color_secondary=self.color_secondary,
-            color_accent=self.color_accent,
-            color_accent_light=self.color_accent_light,
+            course_name=course_name or self.course_name,
+            theme_css=theme_css,
+            styles=styles,
+            scripts=scripts,
             nav_title=nav_title or title,
             dashboard_url=self.dashboard_url,
             pdf_link=pdf_link,
             github_url=self.github_url,
             quiz_subtitle=subtitle,
             total_questions=len(questions),
-            questions_json=questions_json
+            questions_json=questions_json,
+            total=len(questions),
+            shards_json=json.dumps(shards),
+            math_json=math_json
         )
+        return minify_source(html) if self.production else html
 
-        # Write output
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html)
-
+    def generate_quiz(
+        self,
+        questions: list,
+        title: str,
+        subtitle: str,
+        output_path: Path,
+        pdf_url: Optional[str] = None,
+        nav_title: Optional[str] = None,
+        course_name: Optional[str] = None
+    ) -> Path:
+        """Generate an interactive quiz HTML file."""
+        html = self.render_quiz(questions, title, subtitle, pdf_url=pdf_url, nav_title=nav_title,
+                                shard_stem=output_path.stem, course_name=course_name)
+        if self.shared_assets:
+            self.write_shared_assets(output_path.parent)
+        self.vendor_math(questions, output_path.parent)
+        self.write_shards(questions, output_path)
+        self.write_output(output_path, html)
         return output_path
 
-    def generate_from_json(
+    def load_titled_questions(
         self,
         json_path: Path,
-        output_path: Path,
         title: Optional[str] = None,
-        subtitle: Optional[str] = None,
-        pdf_url: Optional[str] = None
-    ) -> Path:
-        """Generate quiz from a questions.json file."""
+        subtitle: Optional[str] = None
+    ) -> tuple:
+        """Load questions and derive (questions, title, subtitle) for a file."""
 
         questions = self.load_questions(json_path)
 
@@ -706,6 +1231,35 @@ class QuizGenerator:
         if not subtitle:
             subtitle = title
 
+        return questions, title, subtitle
+
+    def render_from_json(
+        self,
+        json_path: Path,
+        title: Optional[str] = None,
+        subtitle: Optional[str] = None,
+        pdf_url: Optional[str] = None
+    ) -> str:
+        """Render the quiz for a questions.json file to an HTML string."""
+        questions, title, subtitle = self.load_titled_questions(json_path, title, subtitle)
+        return self.render_quiz(
+            questions=questions,
+            title=title,
+            subtitle=subtitle,
+            pdf_url=pdf_url,
+            nav_title=title
+        )
+
+    def generate_from_json(
+        self,
+        json_path: Path,
+        output_path: Path,
+        title: Optional[str] = None,
+        subtitle: Optional[str] = None,
+        pdf_url: Optional[str] = None
+    ) -> Path:
+        """Generate quiz from a questions.json file."""
+        questions, title, subtitle = self.load_titled_questions(json_path, title, subtitle)
         return self.generate_quiz(
             questions=questions,
             title=title,
@@ -715,6 +1269,277 @@ class QuizGenerator:
             nav_title=title
         )
 
+    def render_hub(self, quizzes: list) -> str:
+        """Render the quiz hub page for (page name, quiz dict) pairs."""
+        links = []
+        for page, quiz in quizzes:
+            links.append(f'            <a class="hub-quiz" href="{page}">{quiz["title"]}'
+                         f'<small>{len(quiz["questions"])} questions</small></a>')
+        hub_css = minify_source(HUB_CSS) if self.production else HUB_CSS
+        hub_js = minify_source(HUB_JS) if self.production else HUB_JS
+
+        html = HUB_TEMPLATE.format(
+            course_name=self.course_name,
+            theme_css=self._theme_css(),
+            styles=self._styles_html(),
+            hub_css=hub_css,
+            hub_js=hub_js,
+            dashboard_url=self.dashboard_url,
+            github_url=self.github_url,
+            quiz_count=len(quizzes),
+            question_count=sum(len(quiz['questions']) for _, quiz in quizzes),
+            quiz_links='\n'.join(links),
+            search_index_url=SEARCH_INDEX_NAME
+        )
+        return minify_source(html) if self.production else html
+
+    def write_hub(self, output_dir: Path, quizzes: list) -> dict:
+        """Write the search index and hub page for (page name, quiz dict) pairs.
+
+        Returns the search index.
+        """
+        index = build_search_index(quizzes)
+        self.write_output(output_dir / SEARCH_INDEX_NAME,
+                          json.dumps(index, ensure_ascii=False, separators=(',', ':')))
+        if self.shared_assets:
+            self.write_shared_assets(output_dir)
+        self.write_output(output_dir / HUB_NAME, self.render_hub(quizzes))
+        return index
+
+    def generate_from_bank(
+        self,
+        bank_path: Path,
+        topic: str,
+        output_path: Path
+    ) -> Path:
+        """Generate a quiz from a topic in the question bank (see quiz_bank.py)."""
+        conn = quiz_bank.connect(bank_path)
+        try:
+            quiz = quiz_bank.load_quiz(conn, topic)
+        finally:
+            conn.close()
+        return self.generate_quiz(
+            questions=quiz['questions'],
+            title=quiz['title'],
+            subtitle=quiz['subtitle'],
+            output_path=output_path,
+            pdf_url=quiz['pdf_url'],
+            nav_title=quiz['nav_title'],
+            course_name=quiz['course_name']
+        )
+
+    def fingerprint(self) -> str:
+        """Hash of the generator code, template and settings.
+
+        Any change here invalidates every quiz in the batch manifest.
+        """
+        h = hashlib.sha256(Path(__file__).read_bytes())
+        for template in (QUIZ_TEMPLATE, QUIZ_THEME_CSS, QUIZ_CSS, QUIZ_JS):
+            h.update(template.encode('utf-8'))
+        h.update(json.dumps(vars(self), sort_keys=True, default=str).encode('utf-8'))
+        return h.hexdigest()
+
+
+# =============================================================================
+# MATH DETECTION
+# =============================================================================
+
+# Pandoc's rule: an opening $ is followed by a non-space, a closing $ is
+# preceded by a non-space and not followed by a digit, so "$5 or $10" is
+# currency rather than math
+MATH_PATTERN = re.compile(
+    r'\$\$.+?\$\$'
+    r'|(?<![\\$])\$(?![\s$])(?:[^$\\]|\\.)+?(?<![\s\\])\$(?!\d)',
+    re.DOTALL
+)
+
+
+def _iter_text(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_text(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_text(item)
+
+
+def questions_use_math(questions: list) -> bool:
+    """True if any question text contains $...$ or $$...$$ math."""
+    for q in questions:
+        for key in ('question', 'options', 'explanation'):
+            for text in _iter_text(q.get(key)):
+                if MATH_PATTERN.search(text):
+                    return True
+    return False
+
+
+# =============================================================================
+# SEARCH INDEX
+# =============================================================================
+
+# Words too common to be worth a posting list; shipped with the index so the
+# hub ignores them in queries as well
+STOP_WORDS = frozenset('''
+    a an and are as at be but by can for from has have if in into is it its
+    not of on or such than that the their them then there these they this to
+    was were what when which while who will with would
+'''.split())
+TAG_PATTERN = re.compile(r'<[^>]+>')
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+def plain_text(text: str) -> str:
+    """Question text without HTML tags or entities, whitespace collapsed."""
+    return ' '.join(html_lib.unescape(TAG_PATTERN.sub(' ', text)).split())
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens, matching the hub's client-side tokenizer."""
+    return TOKEN_PATTERN.findall(plain_text(text).lower())
+
+
+def build_search_index(quizzes: list) -> dict:
+    """Inverted index over the questions, options and explanations of quizzes.
+
+    quizzes is a list of (page name, quiz dict) pairs. The result is compact
+    JSON-ready data: quizzes as [page, title, question count], documents as
+    [quiz number, question id, question text], and for each term the sorted
+    document numbers it occurs in, delta-encoded.
+    """
+    index = {'quizzes': [], 'docs': [], 'terms': {}, 'stop': sorted(STOP_WORDS)}
+    postings = {}
+
+    for quiz_number, (page, quiz) in enumerate(quizzes):
+        index['quizzes'].append([page, quiz['title'], len(quiz['questions'])])
+        for q in quiz['questions']:
+            doc = len(index['docs'])
+            index['docs'].append([quiz_number, q['id'], plain_text(q['question'])])
+            text = ' '.join(_iter_text([q.get('question'), q.get('options'), q.get('explanation')]))
+            for term in set(tokenize(text)):
+                if len(term) > 1 and term not in STOP_WORDS:
+                    postings.setdefault(term, []).append(doc)
+
+    for term in sorted(postings):
+        docs = postings[term]
+        index['terms'][term] = [docs[0]] + [b - a for a, b in zip(docs, docs[1:])]
+    return index
+
+
+# =============================================================================
+# FILE OUTPUT
+# =============================================================================
+
+def _hashed_name(stem: str, ext: str, content: str) -> str:
+    """Content-addressed file name, e.g. quiz.1a2b3c4d5e.css."""
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+    return f'{stem}.{digest}.{ext}'
+
+
+def minify_source(text: str) -> str:
+    """Line-based minifier for the generated HTML, CSS and JavaScript.
+
+    Strips indentation, blank lines and whole-line // and /* */ comments.
+    Line breaks are kept so JavaScript automatic semicolon insertion still
+    sees the statements it expects.
+    """
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('//') or (line.startswith('/*') and line.endswith('*/')):
+            continue
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def write_compressed_siblings(path: Path, data: bytes, use_brotli: bool = False) -> None:
+    """Write path.gz (and path.br) next to path, skipping unchanged content."""
+    # mtime=0 keeps the gzip bytes reproducible, so unchanged files stay unchanged
+    write_if_changed(path.with_name(path.name + '.gz'), gzip.compress(data, compresslevel=9, mtime=0))
+    if use_brotli and brotli is not None:
+        write_if_changed(path.with_name(path.name + '.br'), brotli.compress(data))
+
+
+def compression_report(directory: Path) -> dict:
+    """Bytes of the generated files in directory and of their compressed siblings."""
+    report = {'files': 0, 'bytes': 0, 'gzip': 0, 'brotli': 0}
+    for path in directory.iterdir():
+        if not path.is_file() or path.suffix not in ('.html', '.css', '.js', '.json'):
+            continue
+        if path.name == MANIFEST_NAME:
+            continue
+        report['files'] += 1
+        report['bytes'] += path.stat().st_size
+        for ext, key in (('.gz', 'gzip'), ('.br', 'brotli')):
+            sibling = path.with_name(path.name + ext)
+            if sibling.exists():
+                report[key] += sibling.stat().st_size
+    return report
+
+
+def remove_stale_assets(output_dir: Path, keep: list) -> list:
+    """Delete hashed quiz assets in output_dir that are not in keep."""
+    keep_names = {Path(p).name for p in keep}
+    removed = []
+    for path in output_dir.glob('quiz.*'):
+        if ASSET_PATTERN.match(path.name) and path.name not in keep_names:
+            path.unlink()
+            removed.append(path)
+    return removed
+
+
+def remove_stale_shards(output_path: Path, keep: list) -> list:
+    """Delete question shards of output_path's page that are not in keep."""
+    pattern = re.compile(rf'^({re.escape(output_path.stem)}\.part\d+\.[0-9a-f]{{10}}\.json)(\.gz|\.br)?$')
+    keep_names = set(keep)
+    removed = []
+    for path in output_path.parent.glob(f'{output_path.stem}.part*'):
+        match = pattern.match(path.name)
+        if match and match.group(1) not in keep_names:
+            path.unlink()
+            removed.append(path)
+    return removed
+
+
+def site_size(directory: Path) -> int:
+    """Total bytes of the HTML/CSS/JS and question shard files in directory."""
+    return sum(p.stat().st_size for p in directory.iterdir()
+               if p.is_file() and p.suffix in ('.html', '.css', '.js', '.json')
+               and p.name != MANIFEST_NAME)
+
+
+def write_if_changed(path: Path, content: Union[str, bytes]) -> bool:
+    """Atomically write content to path unless the file already holds it.
+
+    Returns True if the file was written. Identical files are left untouched
+    so their mtime (and any CDN cache entry) survives.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+
+    try:
+        mode = path.stat().st_mode & 0o777
+    except OSError:
+        mode = 0o644
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return True
+
 
 # =============================================================================
 # BATCH GENERATION
@@ -734,46 +1559,176 @@ def find_question_files(course_dir: Path) -> list:
     return question_files
 
 
+def _quiz_output_path(json_path: Path, output_dir: Path) -> Path:
+    """Output path for a question file: quiz/quiz1.1.html, quiz/quiz2.3.html, etc."""
+    folder_name = json_path.parent.name
+    topic_match = re.match(r'T(\d+\.\d+)_', folder_name)
+    if topic_match:
+        topic_num = topic_match.group(1)  # e.g., "1.1", "2.3"
+        return output_dir / f'quiz{topic_num}.html'
+    return output_dir / f'{folder_name}_quiz.html'
+
+
+def _load_manifest(path: Path) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _find_pdf_url(json_path: Path, course_dir: Path) -> Optional[str]:
+    """Link to the quiz PDF next to a questions.json, relative to the quiz pages."""
+    pdf_candidates = list(json_path.parent.glob('*_quiz.pdf'))
+    return f"../{pdf_candidates[0].relative_to(course_dir)}" if pdf_candidates else None
+
+
+def _load_file_quiz(generator: QuizGenerator, json_path: Path, pdf_url: Optional[str],
+                    title: Optional[str] = None, subtitle: Optional[str] = None) -> dict:
+    questions, title, subtitle = generator.load_titled_questions(json_path, title, subtitle)
+    return {'questions': questions, 'title': title, 'subtitle': subtitle,
+            'nav_title': title, 'pdf_url': pdf_url}
+
+
+def _generate_job(generator: QuizGenerator, quiz: dict, output_path: Path) -> bool:
+    """Worker for batch generation; returns True if the file was rewritten."""
+    questions = quiz['questions']
+    html = generator.render_quiz(questions, quiz['title'], quiz['subtitle'], pdf_url=quiz['pdf_url'],
+                                 nav_title=quiz['nav_title'], shard_stem=output_path.stem,
+                                 course_name=quiz.get('course_name'))
+    generator.vendor_math(questions, output_path.parent)
+    generator.write_shards(questions, output_path)
+    return generator.write_output(output_path, html)
+
+
+def _generate_batch(
+    entries: list,
+    output_dir: Path,
+    generator: QuizGenerator,
+    jobs: Optional[int] = None,
+    force: bool = False
+) -> list:
+    """Regenerate the stale quizzes among entries; returns the paths rewritten.
+
+    Each entry is (output_path, source_digest, load), where source_digest
+    identifies the quiz content and load() returns the quiz dict (questions,
+    title, subtitle, nav_title, pdf_url). Only entries whose digest or the
+    generator changed since the last run are rendered; every quiz is loaded
+    for the search index and hub page.
+    """
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = {} if force else _load_manifest(manifest_path)
+    fingerprint = generator.fingerprint()
+
+    pending = []
+    quizzes = []
+    new_manifest = {}
+    for output_path, source_digest, load in entries:
+        quiz = load()
+        quizzes.append((output_path.name, quiz))
+        key = output_path.name
+        new_manifest[key] = hashlib.sha256(f'{source_digest}:{fingerprint}'.encode('utf-8')).hexdigest()
+        if manifest.get(key) != new_manifest[key] or not output_path.exists():
+            pending.append((quiz, output_path))
+
+    generated = []
+    if generator.shared_assets:
+        assets = generator.write_shared_assets(output_dir)
+        remove_stale_assets(output_dir, assets)
+
+    if len(pending) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_generate_job, generator, *job) for job in pending]
+            changed = [f.result() for f in futures]
+    else:
+        changed = [_generate_job(generator, *job) for job in pending]
+
+    for (_, output_path), was_written in zip(pending, changed):
+        if was_written:
+            generated.append(output_path)
+            print(f"Generated: {output_path}")
+
+    up_to_date = len(entries) - len(generated)
+    if up_to_date:
+        print(f"Unchanged: {up_to_date} quizzes")
+
+    if quizzes:
+        index = generator.write_hub(output_dir, quizzes)
+        print(f"Search index: {output_dir / SEARCH_INDEX_NAME} "
+              f"({len(index['terms'])} terms, {len(index['docs'])} questions)")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    write_if_changed(manifest_path, json.dumps(new_manifest, indent=2, sort_keys=True) + '\n')
+    return generated
+
+
 def generate_all_quizzes(
     course_dir: Path,
     output_dir: Path,
-    generator: QuizGenerator
+    generator: QuizGenerator,
+    jobs: Optional[int] = None,
+    force: bool = False
 ) -> list:
-    """Generate all quizzes for a course."""
+    """Generate all quizzes for a course.
 
-    question_files = find_question_files(course_dir)
-    generated = []
+    Only quizzes whose questions.json, PDF link or generator changed since the
+    last run are regenerated. Returns the paths of files actually rewritten.
+    """
+    entries = []
+    for json_path in find_question_files(course_dir):
+        output_path = _quiz_output_path(json_path, output_dir)
 
-    for json_path in question_files:
-        # Determine output path: quiz/quiz1.1.html, quiz/quiz2.3.html, etc.
-        folder_name = json_path.parent.name
-        topic_match = re.match(r'T(\d+\.\d+)_', folder_name)
-        if topic_match:
-            topic_num = topic_match.group(1)  # e.g., "1.1", "2.3"
-            output_path = output_dir / f'quiz{topic_num}.html'
-        else:
-            output_path = output_dir / f'{folder_name}_quiz.html'
+        pdf_url = _find_pdf_url(json_path, course_dir)
 
-        # Find PDF if exists
-        pdf_candidates = list(json_path.parent.glob('*_quiz.pdf'))
-        pdf_url = f"../{pdf_candidates[0].relative_to(course_dir)}" if pdf_candidates else None
+        h = hashlib.sha256(json_path.read_bytes())
+        h.update((pdf_url or '').encode('utf-8'))
+        entries.append((output_path, h.hexdigest(),
+                        functools.partial(_load_file_quiz, generator, json_path, pdf_url)))
 
-        generator.generate_from_json(
-            json_path=json_path,
-            output_path=output_path,
-            pdf_url=pdf_url
-        )
+    return _generate_batch(entries, output_dir, generator, jobs=jobs, force=force)
 
-        generated.append(output_path)
-        print(f"Generated: {output_path}")
 
-    return generated
+def generate_bank_quizzes(
+    bank_path: Path,
+    output_dir: Path,
+    generator: QuizGenerator,
+    jobs: Optional[int] = None,
+    force: bool = False
+) -> list:
+    """Generate every quiz in the question bank, under its original page name.
+
+    Incremental like generate_all_quizzes: a quiz is only regenerated when its
+    questions or metadata in the store, or the generator, changed.
+    """
+    conn = quiz_bank.connect(bank_path)
+    try:
+        quizzes = [quiz_bank.load_quiz(conn, row['topic']) for row in quiz_bank.list_topics(conn)]
+    finally:
+        conn.close()
+
+    entries = []
+    for quiz in quizzes:
+        digest = hashlib.sha256(json.dumps(quiz, sort_keys=True).encode('utf-8')).hexdigest()
+        entries.append((output_dir / quiz['page'], digest, functools.partial(dict, quiz)))
+
+    return _generate_batch(entries, output_dir, generator, jobs=jobs, force=force)
 
 
 # =============================================================================
 # CLI
 # =============================================================================
 
+def print_compression_report(report: dict) -> None:
+    """Print precompressed transfer sizes against the uncompressed output."""
+    total = report['bytes']
+    if not total:
+        return
+    for key, label in (('gzip', 'gzip'), ('brotli', 'brotli')):
+        if report[key]:
+            saved = 100 * (1 - report[key] / total)
+            print(f"  {label}: {report[key] / 1024:.1f} KB ({saved:.0f}% smaller than {total / 1024:.1f} KB)")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Generate interactive HTML quizzes from questions.json files',
@@ -786,6 +1741,13 @@ Examples:
   # Generate all quizzes
   python generate_quiz.py --all -d . -O quiz
 
+  # Regenerate the quizzes stored in a question bank (see quiz_bank.py)
+  python generate_quiz.py --all --bank quiz_bank.sqlite -O quiz
+  python generate_quiz.py --bank quiz_bank.sqlite --topic 1.1 -o quiz/quiz1.1.html
+
+  # Edit questions with live reload at http://127.0.0.1:8000/quiz1.1.html
+  python generate_quiz.py -i T1.1_intro/questions.json -o quiz/quiz1.1.html --serve
+
   # Custom styling
   python generate_quiz.py -i questions.json -o quiz.html --accent "#10b981"
         '''
@@ -797,6 +1759,12 @@ Examples:
     parser.add_argument('--all', action='store_true', help='Generate all quizzes in course')
     parser.add_argument('-d', '--course-dir', type=Path, default=Path('.'), help='Course directory (for --all)')
     parser.add_argument('-O', '--output-dir', type=Path, default=Path('quiz'), help='Output directory (for --all)')
+    parser.add_argument('-j', '--jobs', type=int, help='Worker processes for --all (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Ignore the build manifest and regenerate everything (for --all)')
+    parser.add_argument('--bank', type=Path, help='Question bank (quiz_bank.py) to generate from instead of questions.json')
+    parser.add_argument('--topic', type=str, help='Topic in --bank to generate (with -o)')
+    parser.add_argument('--serve', action='store_true', help='Serve the output with live reload while editing (see quiz_server.py)')
+    parser.add_argument('--port', type=int, default=8000, help='Port for --serve (default: 8000)')
 
     # Customization
     parser.add_argument('--title', type=str, help='Quiz title')
@@ -808,6 +1776,11 @@ Examples:
     parser.add_argument('--dashboard', type=str, default='../index.html', help='Dashboard URL')
     parser.add_argument('--github', type=str, default='https://github.com/Digital-AI-Finance/Digital-Finance-Introduction', help='GitHub URL')
     parser.add_argument('--pdf', type=str, help='PDF quiz URL')
+    parser.add_argument('--shared-assets', action='store_true', help='Emit shared quiz.<hash>.css/.js instead of inlining them')
+    parser.add_argument('--production', action='store_true', help='Compact JSON, minified output and .gz siblings')
+    parser.add_argument('--brotli', action='store_true', help='Also write .br siblings in production mode (needs brotli)')
+    parser.add_argument('--katex-dir', type=Path, help='Local KaTeX dist/ folder to vendor instead of using the CDN')
+    parser.add_argument('--shard-size', type=int, help='Inline only this many questions; fetch the rest as JSON shards')
 
     args = parser.parse_args()
 
@@ -818,17 +1791,74 @@ Examples:
         color_secondary=args.secondary,
         color_accent=args.accent,
         dashboard_url=args.dashboard,
-        github_url=args.github
+        github_url=args.github,
+        shared_assets=args.shared_assets,
+        production=args.production,
+        use_brotli=args.brotli,
+        katex_dir=args.katex_dir,
+        shard_size=args.shard_size
     )
 
-    if args.all:
+    if args.brotli and brotli is None:
+        print("Warning: 'brotli' not installed, skipping .br output. Install with: pip install brotli")
+
+    if args.bank and not args.bank.exists():
+        print(f"Error: {args.bank} not found; run 'quiz_bank.py extract' first")
+        return 1
+
+    if args.serve:
+        import quiz_server
+
+        if args.all:
+            sources = (quiz_server.bank_sources(args.bank) if args.bank
+                       else quiz_server.course_sources(args.course_dir))
+            output_dir = args.output_dir
+        elif args.bank and args.topic and args.output:
+            sources = [quiz_server.QuizSource(page=args.output.name, path=args.bank, topic=args.topic)]
+            output_dir = args.output.parent
+        elif args.input and args.output:
+            sources = [quiz_server.QuizSource(page=args.output.name, path=args.input, title=args.title,
+                                              subtitle=args.subtitle, pdf_url=args.pdf)]
+            output_dir = args.output.parent
+        else:
+            parser.print_help()
+            return 1
+        quiz_server.serve(generator, output_dir, sources, port=args.port, hub=args.all)
+
+    elif args.all:
         # Generate all quizzes
-        generated = generate_all_quizzes(
-            course_dir=args.course_dir,
-            output_dir=args.output_dir,
-            generator=generator
-        )
+        if args.bank:
+            generated = generate_bank_quizzes(
+                bank_path=args.bank,
+                output_dir=args.output_dir,
+                generator=generator,
+                jobs=args.jobs,
+                force=args.force
+            )
+        else:
+            generated = generate_all_quizzes(
+                course_dir=args.course_dir,
+                output_dir=args.output_dir,
+                generator=generator,
+                jobs=args.jobs,
+                force=args.force
+            )
         print(f"\nGenerated {len(generated)} quizzes")
+        if args.output_dir.is_dir():
+            print(f"Output size: {site_size(args.output_dir) / 1024:.1f} KB")
+            if args.production:
+                print_compression_report(compression_report(args.output_dir))
+
+    elif args.bank and args.topic and args.output:
+        # Generate single quiz from the question bank
+        try:
+            output = generator.generate_from_bank(args.bank, args.topic, args.output)
+        except KeyError as e:
+            print(f"Error: {e.args[0]}")
+            return 1
+        print(f"Generated: {output}")
+        if args.production:
+            print_compression_report(compression_report(args.output.parent))
 
     elif args.input and args.output:
         # Generate single quiz
@@ -840,6 +1870,8 @@ Examples:
             pdf_url=args.pdf
         )
         print(f"Generated: {output}")
+        if args.production:
+            print_compression_report(compression_report(args.output.parent))
 
     else:
         parser.print_help()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Quiz Question Bank
+==================
+
+Extracts the question arrays embedded in generated quiz pages (quiz/*.html)
+into a normalised SQLite store, so quizzes can be regenerated or restyled
+without hand-copying JSON out of the HTML.
+
+Each page becomes one topic (quiz1.1.html -> "1.1", quiz_pe_part1.html ->
+"pe_part1") with its title, course name, subtitle, navigation title and PDF
+link; each
+question becomes one row keyed on (topic, id). Questions are also indexed by
+a hash of their normalised text, which is used to find the same question
+appearing in several quizzes.
+
+Titles are stored as the HTML fragments found in the page, and the course
+name after " | " in <title> is kept with them, so a quiz regenerated from the
+store has the same titles as the original page. The rest of the page comes
+from the current generator and its settings (colors, template).
+
+Usage:
+------
+# Build the store from the generated pages
+python quiz_bank.py extract ../quiz
+
+# Questions that appear more than once
+python quiz_bank.py duplicates
+
+# List topics and question counts
+python quiz_bank.py topics
+
+# Regenerate pages from the store (see generate_quiz.py --bank)
+python generate_quiz.py --all --bank quiz_bank.sqlite --output-dir ../quiz
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+
+
+DEFAULT_DB = Path('quiz_bank.sqlite')
+
+# Columns of the questions table; any other keys are kept in `extra`
+QUESTION_FIELDS = ['id', 'difficulty', 'question', 'options', 'correct', 'explanation']
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS quizzes (
+    topic TEXT PRIMARY KEY,
+    page TEXT NOT NULL,
+    title TEXT NOT NULL,
+    course TEXT,
+    subtitle TEXT,
+    nav_title TEXT,
+    pdf_url TEXT
+);
+CREATE TABLE IF NOT EXISTS questions (
+    topic TEXT NOT NULL REFERENCES quizzes(topic),
+    id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    difficulty TEXT,
+    question TEXT NOT NULL,
+    options TEXT NOT NULL,
+    correct TEXT NOT NULL,
+    explanation TEXT,
+    extra TEXT NOT NULL DEFAULT '{}',
+    text_hash TEXT NOT NULL,
+    PRIMARY KEY (topic, id)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_position ON questions(topic, position);
+CREATE INDEX IF NOT EXISTS idx_questions_hash ON questions(text_hash);
+'''
+
+QUIZ_DATA_PATTERN = re.compile(r'const quizData = \{\s*questions:\s*')
+SHARDS_PATTERN = re.compile(r'\s*,\s*total:\s*\d+\s*,\s*shards:\s*')
+TITLE_PATTERN = re.compile(r'<title>(.*?)(?: \| [^|<]*)?</title>', re.DOTALL)
+COURSE_PATTERN = re.compile(r'<title>[^<]*? \| ([^|<]*)</title>', re.DOTALL)
+NAV_TITLE_PATTERN = re.compile(r'<div class="nav-title">(.*?)</div>', re.DOTALL)
+SUBTITLE_PATTERN = re.compile(r'<div class="quiz-title">(.*?)</div>', re.DOTALL)
+PDF_PATTERN = re.compile(r'<a href="([^"]+\.pdf)"')
+
+
+# =============================================================================
+# EXTRACTION
+# =============================================================================
+
+def page_topic(page: str) -> str:
+    """Topic key for a quiz page: quiz1.1.html -> 1.1, quiz_pe_part1.html -> pe_part1."""
+    stem = Path(page).stem
+    if stem.startswith('quiz'):
+        stem = stem[len('quiz'):].lstrip('_')
+    return stem or Path(page).stem
+
+
+def text_hash(text: str) -> str:
+    """Hash of question text, ignoring case, whitespace and HTML entities."""
+    normalised = ' '.join(html.unescape(text).casefold().split())
+    return hashlib.sha256(normalised.encode('utf-8')).hexdigest()[:16]
+
+
+def _match(pattern: re.Pattern, text: str) -> Optional[str]:
+    m = pattern.search(text)
+    return m.group(1).strip() if m else None
+
+
+def extract_quiz(html_path: Path) -> dict:
+    """Parse the embedded quizData (and any question shards) out of a quiz page.
+
+    Works for pretty-printed, production (minified) and sharded pages.
+    Raises ValueError if the page has no embedded question array.
+    """
+    text = html_path.read_text(encoding='utf-8')
+    m = QUIZ_DATA_PATTERN.search(text)
+    if not m:
+        raise ValueError(f"{html_path}: no embedded quizData")
+
+    decoder = json.JSONDecoder()
+    questions, end = decoder.raw_decode(text, m.end())
+
+    # Sharded pages inline only the first shard and list the rest
+    shards = SHARDS_PATTERN.match(text, end)
+    if shards:
+        urls, _ = decoder.raw_decode(text, shards.end())
+        for url in urls:
+            with open(html_path.parent / url, 'r', encoding='utf-8') as f:
+                questions.extend(json.load(f))
+
+    return {
+        'topic': page_topic(html_path.name),
+        'page': html_path.name,
+        'title': _match(TITLE_PATTERN, text) or html_path.stem,
+        'course_name': _match(COURSE_PATTERN, text),
+        'subtitle': _match(SUBTITLE_PATTERN, text),
+        'nav_title': _match(NAV_TITLE_PATTERN, text),
+        'pdf_url': _match(PDF_PATTERN, text),
+        'questions': questions,
+    }
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    # Stores made before the course column existed
+    if 'course' not in {row['name'] for row in conn.execute('PRAGMA table_info(quizzes)')}:
+        conn.execute('ALTER TABLE quizzes ADD COLUMN course TEXT')
+    return conn
+
+
+def store_quiz(conn: sqlite3.Connection, quiz: dict) -> int:
+    """Insert or replace a quiz and all its questions; returns the question count."""
+    rows = []
+    for position, q in enumerate(quiz['questions']):
+        extra = {k: v for k, v in q.items() if k not in QUESTION_FIELDS}
+        rows.append((
+            quiz['topic'], q.get('id', position + 1), position, q.get('difficulty'),
+            q['question'], json.dumps(q['options'], ensure_ascii=False), q['correct'],
+            q.get('explanation'), json.dumps(extra, ensure_ascii=False), text_hash(q['question'])
+        ))
+
+    with conn:
+        conn.execute('DELETE FROM questions WHERE topic = ?', (quiz['topic'],))
+        conn.execute(
+            'INSERT OR REPLACE INTO quizzes (topic, page, title, course, subtitle, nav_title, pdf_url) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (quiz['topic'], quiz['page'], quiz['title'], quiz.get('course_name'), quiz['subtitle'],
+             quiz['nav_title'], quiz['pdf_url'])
+        )
+        conn.executemany('INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    return len(rows)
+
+
+def list_topics(conn: sqlite3.Connection) -> List[sqlite3.Row]:
+    """All quizzes in the store with their question counts."""
+    return conn.execute(
+        'SELECT z.topic, z.page, z.title, COUNT(q.id) AS questions '
+        'FROM quizzes z LEFT JOIN questions q ON q.topic = z.topic '
+        'GROUP BY z.topic ORDER BY z.page'
+    ).fetchall()
+
+
+def load_quiz(conn: sqlite3.Connection, topic: str) -> dict:
+    """Rebuild a quiz (metadata and question list) from the store."""
+    row = conn.execute('SELECT * FROM quizzes WHERE topic = ?', (topic,)).fetchone()
+    if row is None:
+        raise KeyError(f"No quiz '{topic}' in the question bank")
+
+    questions = []
+    for q in conn.execute('SELECT * FROM questions WHERE topic = ? ORDER BY position', (topic,)):
+        question = {'id': q['id']}
+        if q['difficulty'] is not None:
+            question['difficulty'] = q['difficulty']
+        question['question'] = q['question']
+        question['options'] = json.loads(q['options'])
+        question['correct'] = q['correct']
+        if q['explanation'] is not None:
+            question['explanation'] = q['explanation']
+        question.update(json.loads(q['extra']))
+        questions.append(question)
+
+    return {
+        'topic': row['topic'],
+        'page': row['page'],
+        'title': row['title'],
+        'course_name': row['course'],
+        'subtitle': row['subtitle'] or row['title'],
+        'nav_title': row['nav_title'] or row['title'],
+        'pdf_url': row['pdf_url'],
+        'questions': questions,
+    }
+
+
+def find_duplicates(conn: sqlite3.Connection) -> List[List[sqlite3.Row]]:
+    """Groups of questions sharing the same normalised text, across all quizzes."""
+    groups = []
+    hashes = conn.execute(
+        'SELECT text_hash FROM questions GROUP BY text_hash HAVING COUNT(*) > 1 ORDER BY MIN(topic)'
+    ).fetchall()
+    for (h,) in hashes:
+        groups.append(conn.execute(
+            'SELECT topic, id, question FROM questions WHERE text_hash = ? ORDER BY topic, position',
+            (h,)
+        ).fetchall())
+    return groups
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Extract quiz questions from generated HTML into an indexed SQLite store'
+    )
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB,
+                        help=f'SQLite question bank (default: {DEFAULT_DB})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    extract = sub.add_parser('extract', help='Load quiz pages into the store')
+    extract.add_argument('paths', type=Path, nargs='*', default=[Path('quiz')],
+                         help='Quiz HTML files or directories of them (default: quiz)')
+
+    sub.add_parser('duplicates', help='List questions that appear more than once')
+    sub.add_parser('topics', help='List topics in the store')
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+
+    if args.command == 'extract':
+        pages = []
+        for path in args.paths:
+            pages.extend(sorted(path.glob('*.html')) if path.is_dir() else [path])
+
+        total = 0
+        for page in pages:
+            try:
+                quiz = extract_quiz(page)
+            except (OSError, ValueError) as e:
+                print(f"Skipped: {e}")
+                continue
+            total += store_quiz(conn, quiz)
+            print(f"Extracted: {page} ({len(quiz['questions'])} questions, topic {quiz['topic']})")
+        print(f"\n{total} questions in {args.db}")
+
+        duplicates = find_duplicates(conn)
+        if duplicates:
+            print(f"{len(duplicates)} duplicated question(s); see 'quiz_bank.py duplicates'")
+
+    elif args.command == 'duplicates':
+        duplicates = find_duplicates(conn)
+        for group in duplicates:
+            places = ', '.join(f"{row['topic']}#{row['id']}" for row in group)
+            print(f"  [{places}] {html.unescape(group[0]['question'])[:90]}")
+        print(f"\n{len(duplicates)} duplicated question(s)")
+
+    else:
+        for row in list_topics(conn):
+            print(f"  {row['topic']:<12} {row['page']:<22} {row['questions']:>4}  {row['title']}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
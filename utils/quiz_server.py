@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Quiz Dev Server
+===============
+
+Live-reload server for quiz authoring, started with generate_quiz.py --serve.
+
+Quizzes are rendered in memory and served over HTTP from the output
+directory. A background thread polls the question sources and
+generate_quiz.py itself:
+- when a questions.json (or the question bank) changes, only the quizzes
+  it feeds are re-rendered;
+- when generate_quiz.py changes, the module is reloaded so template and
+  player edits apply, and every quiz is re-rendered.
+
+Changed files are written through to the output directory (unchanged ones
+are never touched), and open pages reload through a small Server-Sent
+Events script that is injected into the served HTML only.
+
+Usage:
+------
+python generate_quiz.py -i T1.1_intro/questions.json -o quiz/quiz1.1.html --serve
+python generate_quiz.py --all -d . -O quiz --serve --port 8001
+"""
+
+import importlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import generate_quiz
+
+
+RELOAD_PATH = '/__reload'
+POLL_INTERVAL = 0.2
+
+RELOAD_SCRIPT = '''<script>
+    new EventSource('%s').onmessage = (event) => {
+        const page = location.pathname.split('/').pop() || 'index.html';
+        if (event.data.split(' ').includes(page)) location.reload();
+    };
+</script>
+''' % RELOAD_PATH
+
+
+@dataclass
+class QuizSource:
+    """Where one served quiz page comes from."""
+    page: str
+    path: Path
+    topic: Optional[str] = None
+    title: Optional[str] = None
+    subtitle: Optional[str] = None
+    pdf_url: Optional[str] = None
+
+    def load(self, generator) -> dict:
+        """Quiz dict (questions, title, subtitle, nav_title, pdf_url) for this page."""
+        if self.topic is not None:
+            conn = generate_quiz.quiz_bank.connect(self.path)
+            try:
+                return generate_quiz.quiz_bank.load_quiz(conn, self.topic)
+            finally:
+                conn.close()
+        return generate_quiz._load_file_quiz(generator, self.path, self.pdf_url,
+                                             self.title, self.subtitle)
+
+
+def course_sources(course_dir: Path) -> List[QuizSource]:
+    """One source per questions.json folder, named like generate_all_quizzes."""
+    return [
+        QuizSource(page=generate_quiz._quiz_output_path(json_path, Path('.')).name, path=json_path,
+                   pdf_url=generate_quiz._find_pdf_url(json_path, course_dir))
+        for json_path in generate_quiz.find_question_files(course_dir)
+    ]
+
+
+def bank_sources(bank_path: Path) -> List[QuizSource]:
+    """One source per topic in the question bank."""
+    conn = generate_quiz.quiz_bank.connect(bank_path)
+    try:
+        return [QuizSource(page=row['page'], path=bank_path, topic=row['topic'])
+                for row in generate_quiz.quiz_bank.list_topics(conn)]
+    finally:
+        conn.close()
+
+
+class QuizSite:
+    """In-memory rendering of a set of quizzes, rebuilt as their sources change."""
+
+    def __init__(self, generator, output_dir: Path, sources: List[QuizSource], hub: bool = False):
+        self.generator = generator
+        self.output_dir = output_dir
+        self.sources = sources
+        self.hub = hub
+        self.files: Dict[str, bytes] = {}
+        self.quizzes: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+        # Reload notifications: version counter plus the pages changed at each version
+        self.changed = threading.Condition()
+        self.version = 0
+        self.history: Dict[int, List[str]] = {}
+
+    def _quiz_files(self, page: str, quiz: dict) -> Dict[str, str]:
+        gen = self.generator
+        questions = quiz['questions']
+        files = {page: gen.render_quiz(questions, quiz['title'], quiz['subtitle'], pdf_url=quiz['pdf_url'],
+                                       nav_title=quiz['nav_title'], shard_stem=Path(page).stem,
+                                       course_name=quiz.get('course_name'))}
+        files.update(gen.question_shards(questions, Path(page).stem))
+        return files
+
+    def _site_files(self) -> Dict[str, str]:
+        gen = self.generator
+        files = dict(gen.asset_files()) if gen.shared_assets else {}
+        if self.hub:
+            pairs = [(s.page, self.quizzes[s.page]) for s in self.sources if s.page in self.quizzes]
+            files[generate_quiz.SEARCH_INDEX_NAME] = json.dumps(
+                generate_quiz.build_search_index(pairs), ensure_ascii=False, separators=(',', ':'))
+            files[generate_quiz.HUB_NAME] = gen.render_hub(pairs)
+        return files
+
+    def _store(self, files: Dict[str, str]) -> List[str]:
+        """Keep files in memory, write the changed ones through; returns their names."""
+        changed = []
+        for name, content in files.items():
+            data = content.encode('utf-8')
+            if self.files.get(name) == data:
+                continue
+            self.files[name] = data
+            self.generator.write_output(self.output_dir / name, data)
+            changed.append(name)
+        return changed
+
+    def _load(self, source: QuizSource) -> Optional[dict]:
+        try:
+            return source.load(self.generator)
+        except (OSError, ValueError, KeyError) as e:
+            # Half-saved or invalid JSON: keep serving the last good version
+            print(f"Error loading {source.path}: {e}")
+            return None
+
+    def rebuild(self, sources: Optional[List[QuizSource]] = None) -> List[str]:
+        """Re-render the given sources (default: all); returns the changed file names."""
+        start = time.perf_counter()
+        changed = []
+        with self.lock:
+            for source in self.sources if sources is None else sources:
+                quiz = self._load(source)
+                if quiz is None or (sources is not None and self.quizzes.get(source.page) == quiz):
+                    continue
+                self.quizzes[source.page] = quiz
+                changed += self._store(self._quiz_files(source.page, quiz))
+            if changed or sources is None:
+                changed += self._store(self._site_files())
+
+        if changed:
+            pages = [name for name in changed if name.endswith('.html')]
+            print(f"Rebuilt {', '.join(pages) or ', '.join(changed)} "
+                  f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+            self.notify(pages)
+        return changed
+
+    def reload_generator(self) -> None:
+        """Reload generate_quiz (templates and player code) and rebuild everything."""
+        settings = vars(self.generator)
+        try:
+            module = importlib.reload(generate_quiz)
+            generator = module.QuizGenerator(**settings)
+        except Exception as e:
+            print(f"Error reloading generate_quiz.py: {e}")
+            return
+        with self.lock:
+            self.generator = generator
+        self.rebuild()
+
+    def notify(self, pages: List[str]) -> None:
+        with self.changed:
+            self.version += 1
+            self.history[self.version] = pages
+            self.changed.notify_all()
+
+    def changes_since(self, version: int) -> List[str]:
+        return sorted({page for v, pages in self.history.items() if v > version for page in pages})
+
+
+def watch(site: QuizSite, stop: threading.Event) -> None:
+    """Poll source and template mtimes and rebuild what changed."""
+    def mtime(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    template = Path(generate_quiz.__file__)
+    paths = {source.path for source in site.sources} | {template}
+    seen = {path: mtime(path) for path in paths}
+
+    while not stop.wait(POLL_INTERVAL):
+        touched = [path for path in paths if mtime(path) != seen[path]]
+        for path in touched:
+            seen[path] = mtime(path)
+        if template in touched:
+            site.reload_generator()
+        elif touched:
+            site.rebuild([s for s in site.sources if s.path in touched])
+
+
+class QuizRequestHandler(SimpleHTTPRequestHandler):
+    """Serve rendered quizzes from memory, anything else from the output directory."""
+
+    def __init__(self, *args, site: QuizSite, **kwargs):
+        self.site = site
+        super().__init__(*args, directory=str(site.output_dir), **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == RELOAD_PATH:
+            return self._event_stream()
+
+        name = path.lstrip('/') or generate_quiz.HUB_NAME
+        data = self.site.files.get(name)
+        if data is None:
+            return super().do_GET()
+
+        content_type = self.guess_type(name)
+        if name.endswith('.html'):
+            data = data.replace(b'</body>', RELOAD_SCRIPT.encode('utf-8') + b'</body>', 1)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _event_stream(self):
+        site = self.site
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+
+        version = site.version
+        try:
+            while True:
+                with site.changed:
+                    site.changed.wait(timeout=15)
+                    pages = site.changes_since(version)
+                    version = site.version
+                # Comment lines keep the connection alive between changes
+                message = f"data: {' '.join(pages)}\n\n" if pages else ": ping\n\n"
+                self.wfile.write(message.encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(generator, output_dir: Path, sources: List[QuizSource], port: int = 8000,
+          hub: bool = False) -> None:
+    """Render sources, serve output_dir on port and rebuild on changes until Ctrl+C."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    site = QuizSite(generator, output_dir, sources, hub=hub)
+    site.rebuild()
+
+    stop = threading.Event()
+    watcher = threading.Thread(target=watch, args=(site, stop), daemon=True)
+    watcher.start()
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), partial(QuizRequestHandler, site=site))
+    server.daemon_threads = True
+    first = generate_quiz.HUB_NAME if hub else (sources[0].page if sources else '')
+    print(f"Serving {output_dir} at http://127.0.0.1:{port}/{first} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        stop.set()
+        server.server_close()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Recompile individual beamer frames to verify overflow fixes.
+
+Instead of rebuilding a whole 60-frame deck, each selected frame is written
+into its own minimal document: the deck's preamble, the frame itself, and
+blank lines everywhere else. Blanking (rather than deleting) the other lines
+keeps line numbers identical to the original .tex file, so the overflow
+warnings in the small documents map straight back onto
+detect_overflows.Frame boundaries. The documents are compiled in parallel
+with the compilers from build_slides.
+
+By default the frames that overflow in the deck's existing .log are checked.
+
+Usage:
+    # Re-check every frame that overflowed in the last full build
+    python verify_frames.py day_01/slides/Day_01.tex
+
+    # Check specific frames (1-based, in order of appearance) or lines
+    python verify_frames.py day_01/slides/Day_01.tex --frames 3 7
+    python verify_frames.py day_01/slides/Day_01.tex --lines 412
+"""
+
+import argparse
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import build_slides
+from detect_overflows import (
+    Frame, Overflow, assign_overflows_to_frames, parse_log_file, parse_tex_frames
+)
+
+
+# \begin{document} at the start of a line, once comments are stripped
+BEGIN_DOCUMENT_PATTERN = re.compile(r'^\s*\\begin\{document\}')
+
+TEMP_PREFIX = '_verify_'
+TEMP_SUFFIXES = ['.tex', '.pdf', '.log', '.aux', '.nav', '.out', '.snm', '.toc', '.vrb']
+
+
+@dataclass
+class FrameCheck:
+    """Overflow state of one frame before and after recompiling it alone."""
+    frame: Frame
+    before: List[Overflow]
+    after: List[Overflow] = field(default_factory=list)
+    compiled: bool = False
+
+    @property
+    def status(self) -> str:
+        if not self.compiled:
+            return "FAILED"
+        if self.after:
+            return "OVERFLOW"
+        return "FIXED" if self.before else "OK"
+
+
+def _frames_with_overflows(tex_path: Path) -> List[Frame]:
+    """Parse frames and attach overflows from the deck's existing .log, if any."""
+    frames = parse_tex_frames(tex_path)
+    log_path = tex_path.with_suffix('.log')
+    if log_path.exists():
+        assign_overflows_to_frames(parse_log_file(log_path), frames)
+    return frames
+
+
+def select_frames(frames: List[Frame], numbers: Optional[List[int]] = None,
+                  lines: Optional[List[int]] = None) -> List[Frame]:
+    """Pick frames by 1-based position or contained line; default to overflowing ones."""
+    if not numbers and not lines:
+        return [f for f in frames if f.overflows]
+
+    selected = []
+    for number in numbers or []:
+        if 1 <= number <= len(frames):
+            selected.append(frames[number - 1])
+        else:
+            print(f"Warning: No frame {number} (deck has {len(frames)} frames)")
+    for line in lines or []:
+        match = next((f for f in frames if f.contains_line(line)), None)
+        if match is None:
+            print(f"Warning: Line {line} is not inside a frame")
+        elif match not in selected:
+            selected.append(match)
+    return selected
+
+
+def write_frame_document(tex_path: Path, frame: Frame, output_path: Path) -> Path:
+    """Write a document with the deck preamble and a single frame.
+
+    All other lines are replaced by empty lines so that line numbers in the
+    resulting .log match the original deck.
+    """
+    with open(tex_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.readlines()
+
+    begin_doc = next((i for i, line in enumerate(lines)
+                      if BEGIN_DOCUMENT_PATTERN.match(build_slides.COMMENT_PATTERN.sub('', line))), None)
+    if begin_doc is None:
+        raise ValueError(f"{tex_path} has no \\begin{{document}}")
+
+    keep = set(range(begin_doc + 1))
+    keep.update(range(frame.start_line - 1, frame.end_line))
+
+    out = [line if i in keep else '\n' for i, line in enumerate(lines)]
+    out.append('\\end{document}\n')
+    output_path.write_text(''.join(out), encoding='utf-8')
+    return output_path
+
+
+def cleanup(tex_path: Path) -> None:
+    """Remove temporary frame documents and their build outputs."""
+    for path in tex_path.parent.glob(f'{TEMP_PREFIX}{tex_path.stem}_f*'):
+        if path.suffix in TEMP_SUFFIXES:
+            path.unlink()
+
+
+def verify_frames(tex_path: Path, frames: List[Frame], compiler: build_slides.Compiler,
+                  jobs: int = 4, keep: bool = False) -> List[FrameCheck]:
+    """Recompile each frame on its own and re-run overflow detection."""
+    all_frames = parse_tex_frames(tex_path)
+    checks = [FrameCheck(frame=f, before=list(f.overflows)) for f in frames]
+
+    docs = {}
+    for check in checks:
+        index = next(i for i, f in enumerate(all_frames, start=1)
+                     if f.start_line == check.frame.start_line)
+        doc = tex_path.parent / f'{TEMP_PREFIX}{tex_path.stem}_f{index:03d}.tex'
+        docs[write_frame_document(tex_path, check.frame, doc).resolve()] = check
+
+    try:
+        results = build_slides.compile_all(list(docs), compiler, jobs=jobs)
+        for result in results:
+            check = docs[result.tex_path]
+            check.compiled = result.success
+            if not result.success:
+                continue
+            # Line numbers are preserved, so the deck's own frames apply directly
+            fresh = [Frame(f.title, f.start_line, f.end_line, []) for f in all_frames]
+            assign_overflows_to_frames(parse_log_file(result.log_path), fresh)
+            match = next(f for f in fresh if f.start_line == check.frame.start_line)
+            check.after = match.overflows
+    finally:
+        if not keep:
+            cleanup(tex_path)
+
+    return checks
+
+
+def print_checks(checks: List[FrameCheck]) -> None:
+    """Print a one-line verdict per frame, with remaining overflows."""
+    for check in checks:
+        frame = check.frame
+        print(f"  [{check.status}] Frame \"{frame.title}\" (lines {frame.start_line}-{frame.end_line})")
+        for overflow in sorted(check.after, key=lambda o: o.amount_pt, reverse=True):
+            print(f"    {overflow.overflow_type} overflow: {overflow.amount_pt:.2f}pt ({overflow.severity})")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Recompile individual beamer frames and re-check them for overflows."
+    )
+    parser.add_argument('tex_file', type=Path, help='Deck .tex file')
+    parser.add_argument('--frames', type=int, nargs='+', help='Frame numbers to check (1-based)')
+    parser.add_argument('--lines', type=int, nargs='+', help='Check the frames containing these lines')
+    parser.add_argument('--compiler', '-c', choices=sorted(build_slides.COMPILERS), default='pdflatex',
+                        help='LaTeX compiler to use (default: pdflatex)')
+    parser.add_argument('--jobs', '-j', type=int, default=4,
+                        help='Number of frames to compile in parallel (default: 4)')
+    parser.add_argument('--keep', action='store_true',
+                        help='Keep the temporary frame documents and their output')
+
+    args = parser.parse_args()
+
+    if not args.tex_file.is_file():
+        print(f"Error: {args.tex_file} does not exist")
+        return 1
+
+    tex_path = args.tex_file.resolve()
+    frames = select_frames(_frames_with_overflows(tex_path), args.frames, args.lines)
+    if not frames:
+        print(f"No frames to verify in {args.tex_file.name}")
+        return 0
+
+    print(f"=== Verifying {len(frames)} frame(s) of {args.tex_file.name} ===\n")
+    compiler = build_slides.COMPILERS[args.compiler]()
+    checks = verify_frames(tex_path, frames, compiler, jobs=args.jobs, keep=args.keep)
+    print()
+    print_checks(checks)
+
+    remaining = [c for c in checks if c.status in ("OVERFLOW", "FAILED")]
+    print(f"\n{len(checks) - len(remaining)} of {len(checks)} frame(s) clean")
+    return 1 if remaining else 0
+
+
+if __name__ == '__main__':
+    exit(main())